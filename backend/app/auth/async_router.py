@@ -0,0 +1,141 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from slowapi.util import get_remote_address
+
+from app.db.session import get_async_db
+from app.users import models, schemas
+from app.core import security
+from app.core.config import settings
+from app.core.hashing import hasher
+from app.core import metrics
+from app.core.eventlog import auth_log
+from app.core.responses import trusted_response
+from app.users.cache import UserAuthRecord, user_cache, invalidate_user
+from app.users import repository as user_repository
+from app.sessions import repository as session_repository
+from app.sessions.revocation import ais_session_revoked
+from app.auth.router import (
+    limiter,
+    oauth2_scheme,
+    get_token_claims,
+    verify_2fa_code,
+    log_login_failure,
+    create_login_tokens,
+    invalid_refresh_token_error,
+)
+
+# Performans: app/auth/router.py'nin async DB versiyonu (USE_ASYNC_DB=True iken main.py bunu yükler).
+# DB round trip'leri await edilir, bcrypt ayrı hash havuzunda çalışır; event loop hiç bloklanmaz.
+router = APIRouter(prefix="/auth", tags=["Auth"])
+
+# --- 1. REGISTER (Kayıt Ol) ---
+@router.post("/register", response_model=schemas.UserOut)
+async def register(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    hashed_pw = await hasher.arun(security.get_password_hash, user.password)
+    new_user = await user_repository.acreate_user(db, user.email, hashed_pw)
+    if new_user is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    await db.commit()
+    return trusted_response(new_user)
+
+# --- 2. LOGIN ---
+@router.post("/login", response_model=schemas.Token)
+@limiter.limit(settings.LOGIN_RATE_LIMIT)
+async def login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    totp_code: str = Form(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # 1. Kullanıcı Doğrulama (aşama süreleri /metrics'te)
+    with metrics.LOGIN_DB_LOOKUP.time():
+        user = await user_repository.aget_login_record(db, form_data.username)
+
+    if user:
+        with metrics.LOGIN_PASSWORD_VERIFY.time():
+            valid, new_hash = await hasher.arun(security.verify_and_update_password, form_data.password, user.hashed_password)
+    else:
+        valid, new_hash = False, None
+
+    if not valid:
+        log_login_failure(request, user)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # 2. 2FA Kontrolü: doğrulayıcı cache'te yoksa Fernet çözme loop dışında
+    if user.is_2fa_enabled:
+        await run_in_threadpool(verify_2fa_code, user, totp_code)
+
+    # 3. Rehash (maliyet değiştiyse): UPDATE, session INSERT'i ile aynı commit'te gider
+    if new_hash:
+        await user_repository.aupdate_password_hash(db, user.id, new_hash)
+
+    # 4. Session + Token Üretme
+    session_id, refresh_token = await session_repository.acreate_session(db, user.id, user.email)
+    auth_log.info("login.succeeded", user_id=user.id, ip=get_remote_address(request), rehashed=bool(new_hash))
+    return trusted_response(create_login_tokens(user.email, session_id, refresh_token))
+
+# --- 2b. REFRESH (Refresh Token Rotation) ---
+@router.post("/refresh", response_model=schemas.Token)
+async def refresh(body: schemas.RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    try:
+        email, session_id, refresh_token = await session_repository.arotate_session(db, body.refresh_token)
+    except session_repository.InvalidRefreshToken:
+        raise invalid_refresh_token_error()
+    return trusted_response(create_login_tokens(email, session_id, refresh_token))
+
+# --- 2c. LOGOUT (Session İptali) ---
+@router.post("/logout", status_code=204)
+async def logout(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    claims = get_token_claims(token)
+    if claims.get("sid"):
+        await session_repository.arevoke_session(db, claims["sid"])
+    return Response(status_code=204)
+
+# --- 2d. ME (Korunan okuma endpoint'i) ---
+@router.get("/me", response_model=schemas.UserOut)
+async def read_me(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    # Yaygın durumda DB'ye gitmez: Bloom filter + kullanıcı cache'i
+    return trusted_response(await get_current_user_logic(token, db))
+
+# --- 3. ENABLE 2FA (2FA Aktifleştir) ---
+@router.post("/enable-2fa", response_model=schemas.Enable2FAResponse)
+async def enable_2fa(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    current_user = await get_current_user_logic(token, db)
+    # Yazma işlemi için güncel ORM nesnesi (cache'teki kayıt salt okunur)
+    user = await db.get(models.User, current_user.id)
+    if user is None: raise HTTPException(status_code=401, detail="User not found")
+
+    if user.is_2fa_enabled:
+        raise HTTPException(status_code=400, detail="2FA already enabled")
+
+    # Secret oluştur ve VERİTABANINA ŞİFRELEYEREK kaydet (Encryption at Rest)
+    secret = security.generate_totp_secret()
+    user.totp_secret = security.encrypt_data(secret)
+    user.is_2fa_enabled = True
+    await db.commit()
+    invalidate_user(user.email)
+    security.invalidate_totp_verifier(user.id)
+
+    otpauth_url = security.get_totp_uri(secret, user.email)
+    return trusted_response({"secret": secret, "otpauth_url": otpauth_url})
+
+# --- YARDIMCI FONKSİYON ---
+async def get_current_user_logic(token: str, db: AsyncSession) -> UserAuthRecord:
+    claims = get_token_claims(token)
+    # İptal kontrolü: yaygın durumda (iptal yok) sadece Bloom filter probe'u
+    if claims.get("sid") and await ais_session_revoked(db, claims["sid"]):
+        raise HTTPException(status_code=401, detail="Session revoked")
+
+    email = claims["sub"]
+    record = user_cache.get(email)
+    if record is None:
+        record = await user_repository.aget_auth_record(db, email)
+        if record is None: raise HTTPException(status_code=401, detail="User not found")
+        user_cache.set(email, record)
+    return record
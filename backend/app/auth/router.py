@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from datetime import timedelta
@@ -7,83 +8,117 @@ from slowapi.util import get_remote_address
 
 from app.db.session import get_db
 from app.users import models, schemas
+from app.users.cache import UserAuthRecord, user_cache, invalidate_user
+from app.users import repository as user_repository
+from app.sessions import repository as session_repository
+from app.sessions.revocation import is_session_revoked
 from app.core import security
 from app.core.config import settings
+from app.core.hashing import hasher
+from app.core import metrics
+from app.core.eventlog import auth_log
+from app.core.responses import trusted_response
+from app.core import ratelimit  # noqa: F401 -> "sqlite://" rate limit deposunu kaydeder
 from fastapi import Form
-import pyotp
-# Rate Limiter Tanımlaması
-limiter = Limiter(key_func=get_remote_address)
+# Rate Limiter Tanımlaması (sayaçlar worker'lar arası paylaşımlı depoda)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+)
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Not: Başarılı yanıtlar trusted_response ile döner (response_model doğrulaması atlanır,
+# bkz. app/core/responses.py); response_model'ler OpenAPI şeması için durur.
+
+# register/login async: hash kuyruğunda bekleme + hash süresince Starlette threadpool
+# token'ı tutulmaz (hasher.arun). Sync DB adımları kısa run_in_threadpool çağrılarıdır.
+# Aksi halde HASH_WORKERS + HASH_MAX_QUEUE kadar istek threadpool'u (varsayılan 40)
+# doldurup diğer sync route'ları aç bırakırdı.
+
 # --- 1. REGISTER (Kayıt Ol) ---
 @router.post("/register", response_model=schemas.UserOut)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
-    if db_user:
+async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    # Performans: Ön SELECT yok, tek INSERT ... ON CONFLICT DO NOTHING RETURNING.
+    # Hash önce hesaplanır; tekrar kayıt denemeleri nadirdir ve yanıt süresi email'in
+    # kayıtlı olup olmadığını belli etmez.
+    hashed_pw = await hasher.arun(security.get_password_hash, user.password)
+    new_user = await run_in_threadpool(insert_user, db, user.email, hashed_pw)
+    if new_user is None:
         raise HTTPException(status_code=400, detail="Email already registered")
-    
-    hashed_pw = security.get_password_hash(user.password)
-    new_user = models.User(email=user.email, hashed_password=hashed_pw)
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    return trusted_response(new_user)
 
 # --- 2. LOGIN (DÜZELTİLMİŞ & GÜVENLİ VERSİYON) ---
 @router.post("/login", response_model=schemas.Token)
-@limiter.limit("5/minute")
-def login(
+@limiter.limit(settings.LOGIN_RATE_LIMIT)
+async def login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     totp_code: str = Form(None), # <--- DÜZELTME 1: Form verisi olarak alıyoruz
     db: Session = Depends(get_db)
 ):
-    # 1. Kullanıcı Doğrulama
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
+    # 1. Kullanıcı Doğrulama (aşama süreleri /metrics'te)
+    with metrics.LOGIN_DB_LOOKUP.time():
+        user = await run_in_threadpool(user_repository.get_login_record, db, form_data.username)
     
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    if user:
+        # Hash kuyruğunda bekleme dahil (kuyruk ayrıca /health/hashing'de)
+        with metrics.LOGIN_PASSWORD_VERIFY.time():
+            valid, new_hash = await hasher.arun(security.verify_and_update_password, form_data.password, user.hashed_password)
+    else:
+        valid, new_hash = False, None
+
+    if not valid:
+        log_login_failure(request, user)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # 2. 2FA Kontrolü (GERÇEK DOĞRULAMA)
+    # 2. 2FA Kontrolü (GERÇEK DOĞRULAMA): doğrulayıcı cache'te yoksa Fernet çözme loop dışında
     if user.is_2fa_enabled:
-        if not totp_code:
-            raise HTTPException(status_code=403, detail="2FA code required") # Kod gelmediyse reddet
+        await run_in_threadpool(verify_2fa_code, user, totp_code)
 
-        try:
-            # DÜZELTME 2: Önce veritabanındaki şifreli secret'ı ÇÖZÜYORUZ
-            decrypted_secret = security.decrypt_data(user.totp_secret)
-            
-            # Çözülmüş (saf) secret ile doğrulayıcı oluşturuyoruz
-            totp = pyotp.TOTP(decrypted_secret)
-
-            # Debug için (İsteğe bağlı - çalışınca silersin)
-            print(f"Sunucu Beklenen Kod: {totp.now()} | Gelen Kod: {totp_code}")
-
-            # valid_window=1: Saat farkı toleransı (+-30 saniye)
-            if not totp.verify(totp_code, valid_window=1):
-                raise HTTPException(status_code=401, detail="Invalid 2FA code")
-                
-        except Exception as e:
-            print(f"2FA Hatası: {str(e)}")
-            # Şifre çözme hatası veya başka bir sorun olursa güvenli şekilde reddet
-            raise HTTPException(status_code=401, detail="Invalid 2FA code")
+    # 3. Rehash (maliyet değiştiyse) + session: tek commit
+    session_id, refresh_token = await run_in_threadpool(start_session, db, user, new_hash)
+
+    # 4. Token Üretme
+    auth_log.info("login.succeeded", user_id=user.id, ip=get_remote_address(request), rehashed=bool(new_hash))
+    return trusted_response(create_login_tokens(user.email, session_id, refresh_token))
+
+# --- 2b. REFRESH (Refresh Token Rotation) ---
+@router.post("/refresh", response_model=schemas.Token)
+def refresh(body: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    try:
+        email, session_id, refresh_token = session_repository.rotate_session(db, body.refresh_token)
+    except session_repository.InvalidRefreshToken:
+        raise invalid_refresh_token_error()
+    return trusted_response(create_login_tokens(email, session_id, refresh_token))
+
+# --- 2c. LOGOUT (Session İptali) ---
+@router.post("/logout", status_code=204)
+def logout(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    claims = get_token_claims(token)
+    if claims.get("sid"):
+        session_repository.revoke_session(db, claims["sid"])
+    return Response(status_code=204)
+
+# --- 2d. ME (Korunan okuma endpoint'i) ---
+@router.get("/me", response_model=schemas.UserOut)
+def read_me(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    # Yaygın durumda DB'ye gitmez: Bloom filter + kullanıcı cache'i
+    return trusted_response(get_current_user_logic(token, db))
 
-    # 3. Token Üretme
-    access_token = security.create_access_token(
-        data={"sub": user.email},
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
-    return {"access_token": access_token, "refresh_token": "not_implemented_yet", "token_type": "bearer"}
 # --- 3. ENABLE 2FA (2FA Aktifleştir) ---
 @router.post("/enable-2fa", response_model=schemas.Enable2FAResponse)
 def enable_2fa(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    user = get_current_user_logic(token, db)
+    current_user = get_current_user_logic(token, db)
+    # Yazma işlemi için güncel ORM nesnesi (cache'teki kayıt salt okunur)
+    user = db.get(models.User, current_user.id)
+    if user is None: raise HTTPException(status_code=401, detail="User not found")
     
     if user.is_2fa_enabled:
          raise HTTPException(status_code=400, detail="2FA already enabled")
@@ -95,20 +130,96 @@ def enable_2fa(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db
     user.totp_secret = encrypted_secret
     user.is_2fa_enabled = True
     db.commit()
+    invalidate_user(user.email)
+    security.invalidate_totp_verifier(user.id)
     
     otpauth_url = security.get_totp_uri(secret, user.email)
-    return {"secret": secret, "otpauth_url": otpauth_url}
+    return trusted_response({"secret": secret, "otpauth_url": otpauth_url})
+
+# --- YARDIMCI FONKSİYONLAR ---
+def insert_user(db: Session, email: str, hashed_password: str):
+    # None -> email zaten kayıtlı
+    new_user = user_repository.create_user(db, email, hashed_password)
+    if new_user is not None:
+        db.commit()
+    return new_user
+
+def start_session(db: Session, user, new_hash: str | None):
+    # Rehash UPDATE'i session INSERT'i ile aynı commit'te gider
+    if new_hash:
+        user_repository.update_password_hash(db, user.id, new_hash)
+    return session_repository.create_session(db, user.id, user.email)
 
-# --- YARDIMCI FONKSİYON ---
-def get_current_user_logic(token: str, db: Session):
-    from jose import jwt, JWTError
+# (Aşağıdakileri sync ve async router ortak kullanır, bkz. app/auth/async_router.py)
+def get_current_user_logic(token: str, db: Session) -> UserAuthRecord:
+    claims = get_token_claims(token)
+    # İptal kontrolü: yaygın durumda (iptal yok) sadece Bloom filter probe'u
+    if claims.get("sid") and is_session_revoked(db, claims["sid"]):
+        raise HTTPException(status_code=401, detail="Session revoked")
+
+    email = claims["sub"]
+    record = user_cache.get(email)
+    if record is None:
+        record = user_repository.get_auth_record(db, email)
+        if record is None: raise HTTPException(status_code=401, detail="User not found")
+        user_cache.set(email, record)
+    return record
+
+def get_token_claims(token: str):
+    from jose import JWTError
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = security.decode_token(token)
         email: str = payload.get("sub")
         if email is None: raise HTTPException(status_code=401, detail="Invalid credentials")
+        # Refresh token, access token yerine kullanılamaz
+        if payload.get("type") != "access": raise HTTPException(status_code=401, detail="Invalid credentials")
     except JWTError:
         raise HTTPException(status_code=401, detail="Could not validate credentials")
-    
-    user = db.query(models.User).filter(models.User.email == email).first()
-    if user is None: raise HTTPException(status_code=401, detail="User not found")
-    return user
+    return payload
+
+def verify_2fa_code(user, totp_code: str | None):
+    if user.is_2fa_enabled:
+        if not totp_code:
+            auth_log.info("2fa.required", user_id=user.id)
+            raise HTTPException(status_code=403, detail="2FA code required") # Kod gelmediyse reddet
+
+        try:
+            # Şifreli secret'tan hazırlanmış doğrulayıcı (cache'te yoksa bir kez çözülür)
+            totp = security.get_totp_verifier(user.id, user.totp_secret)
+        except Exception as e:
+            # Sadece hata tipi: mesaj secret/ciphertext parçası içerebilir
+            auth_log.error("2fa.verifier_error", user_id=user.id, error=type(e).__name__)
+            # Şifre çözme hatası veya başka bir sorun olursa güvenli şekilde reddet
+            raise HTTPException(status_code=401, detail="Invalid 2FA code")
+
+        # valid_window=1: Saat farkı toleransı (+-30 saniye)
+        with metrics.LOGIN_TOTP_VERIFY.time():
+            valid = totp.verify(totp_code, valid_window=1)
+        if not valid:
+            auth_log.info("2fa.failed", user_id=user.id)
+            raise HTTPException(status_code=401, detail="Invalid 2FA code")
+
+def log_login_failure(request: Request, user):
+    # Email log'a yazılmaz; bilinmeyen kullanıcı sadece reason ile ayırt edilir
+    auth_log.info(
+        "login.failed",
+        reason="unknown_user" if user is None else "bad_password",
+        user_id=getattr(user, "id", None),
+        ip=get_remote_address(request),
+    )
+
+def create_login_tokens(email: str, session_id: str, refresh_token: str):
+    # "sid": Access token'ı sunucu tarafındaki session'a bağlar
+    with metrics.LOGIN_JWT_ENCODE.time():
+        access_token = security.create_access_token(
+            data={"sub": email, "sid": session_id},
+            expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+def invalid_refresh_token_error():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
@@ -6,6 +6,19 @@ class Settings(BaseSettings):
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
     SECRET_KEY: str = Field(..., env="SECRET_KEY")
     ALGORITHM: str = "HS256"
+
+    # Performans: Async DB yolu (asyncpg / aiosqlite). False ise klasik sync yol kullanılır.
+    # ASYNC_DATABASE_URL verilmezse DATABASE_URL'den türetilir.
+    USE_ASYNC_DB: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Performans: Bağlantı havuzu ayarları (login spike'larında "QueuePool limit" hatasına karşı).
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 10  # Havuzdan bağlantı bekleme süresi (saniye)
+    DB_POOL_RECYCLE: int = 1800  # Bu süreden eski bağlantılar yenilenir (saniye)
+    DB_POOL_PRE_PING: bool = True  # Kopmuş bağlantıları checkout sırasında yakala
+    DB_CONNECT_TIMEOUT: int = 5  # Postgres'e bağlanma zaman aşımı (saniye)
     
     # Security Analysis (Kişi 3): Token süreleri ayrıştırıldı.
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # Kısa ömürlü (Güvenlik)
@@ -14,7 +27,69 @@ class Settings(BaseSettings):
     # Security Analysis (Kişi 3): Encryption at Rest için anahtar (Fernet key)
     # Bu anahtar hassas verileri (TOTP secret vb.) veritabanında şifreli saklamak için kullanılır.
     # Üretmek için: cryptography.fernet.Fernet.generate_key()
-    ENCRYPTION_KEY: str = Field(..., env="ENCRYPTION_KEY") 
+    ENCRYPTION_KEY: str = Field(..., env="ENCRYPTION_KEY")
+
+    # Performans: Parola hash'leme için ayrı havuz ve kabul kontrolü (admission control).
+    # Kuyruk HASH_MAX_QUEUE'yu veya tahmini bekleme HASH_LATENCY_BUDGET_MS'i aşarsa 503 döner.
+    HASH_WORKERS: int = 4
+    HASH_MAX_QUEUE: int = 32
+    HASH_LATENCY_BUDGET_MS: int = 1000
+
+    # Güvenlik + Performans: bcrypt maliyeti (log2 tur sayısı). Deploy host'unda
+    # "python -m calibrate_hashing --target-p99-ms 250" ile ölçülüp seçilmeli.
+    # Farklı maliyetle üretilmiş hash'ler başarılı login'de sessizce yeniden hash'lenir.
+    BCRYPT_ROUNDS: int = 12
+
+    # Güvenlik: Parola hash şeması ("bcrypt" veya "argon2" -> Argon2id, argon2-cffi gerekir).
+    # Seçilen şema yeni hash'ler için kullanılır, diğeri deprecated sayılır ve login'de taşınır.
+    # Argon2 maliyeti bellek bazlıdır: her eşzamanlı hash ~ARGON2_MEMORY_COST KiB RSS kullanır,
+    # HASH_WORKERS buna göre boyutlandırılmalı (bkz. benchmarks/bench_password_hash.py).
+    # Paralellik 1: istek seviyesinde zaten HASH_WORKERS kadar paralellik var.
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    ARGON2_MEMORY_COST: int = 19456  # KiB (19 MiB, OWASP minimumu)
+    ARGON2_TIME_COST: int = 2
+    ARGON2_PARALLELISM: int = 1
+
+    # Performans: Token doğrulanan isteklerde kullanıcı kaydı cache'i (TTL + LRU).
+    # Çoklu worker'da başka process'in yazdığı değişiklik en geç TTL sonunda görülür.
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+
+    # Performans: Doğrulanmış JWT claim cache'i (token exp anına kadar tutulur)
+    TOKEN_CACHE_MAX_SIZE: int = 50000
+
+    # Performans: Hazır TOTP doğrulayıcı cache'i (çözülmüş anahtar bellekte kısa süre tutulur)
+    TOTP_CACHE_MAX_SIZE: int = 10000
+    TOTP_CACHE_TTL_SECONDS: int = 300
+
+    # Performans + Güvenlik: İptal edilmiş session'lar için process içi Bloom filter (app/sessions/revocation.py)
+    REVOCATION_FILTER_CAPACITY: int = 100000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_REBUILD_SECONDS: int = 30
+
+    # Performans + Güvenlik: Rate limit sayaçları tüm worker'lar arasında paylaşılır (app/core/ratelimit.py).
+    # Tek process'li geliştirme için "memory://" da kullanılabilir.
+    RATE_LIMIT_STORAGE_URI: str = "sqlite:////tmp/authguard-ratelimit.db"
+    RATE_LIMIT_STRATEGY: str = "sliding-window-counter"
+    # Login limiti (IP başına). Yük testinde (benchmarks/loadgen.py --url) hedef sunucuda yükseltilir.
+    LOGIN_RATE_LIMIT: str = "5/minute"
+
+    # Performans: /metrics (app/core/metrics.py). Her worker sayaçlarını bu dizindeki kendi
+    # dosyasına METRICS_FLUSH_SECONDS aralıkla yazar, scrape tüm worker'ları birleştirir.
+    # Boş bırakılırsa sadece scrape edilen process'in sayaçları döner (tek worker).
+    # Ayarlanırsa dizin her sunucu başlangıcında (worker'lar açılmadan önce) temizlenmeli,
+    # aksi halde önceki çalıştırmanın sayaçları eklenir:
+    #   python -m app.core.metrics wipe && uvicorn main:app --workers 4
+    METRICS_MULTIPROC_DIR: str | None = None
+    METRICS_FLUSH_SECONDS: float = 5
+
+    # Performans: Auth olay log'u (app/core/eventlog.py), arka plan thread'inden JSON yazılır.
+    # LOG_SAMPLE_RATES: olay başına örnekleme oranı, ör. '{"login.succeeded": 0.1}'
+    # LOG_EVENT_RATE_CAP: olay başına saniyede en fazla kayıt (0 = sınırsız)
+    LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+    LOG_EVENT_RATE_CAP: float = 100
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,174 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+from app.core.config import settings
+
+# Performans + Güvenlik: Auth olayları için yapılandırılmış (JSON) log.
+# İstek thread'indeki maliyet: seviye kontrolü + örnekleme/limit filtresi + put_nowait.
+# JSON formatlama ve stdout'a yazma arka plandaki QueueListener thread'inde yapılır.
+# Kuyruk sınırlıdır: doluysa kayıt beklemeden düşürülür ve sayılır (istek asla log için
+# beklemez). Olay başına örnekleme (LOG_SAMPLE_RATES) ve saniye başına üst sınır
+# (LOG_EVENT_RATE_CAP) sayesinde saldırı altında bile log hacmi sınırlı kalır.
+#
+# Kullanım:
+#   auth_log = EventLogger("authguard.auth")
+#   auth_log.info("login.failed", reason="bad_password", user_id=42)
+# Log'a asla parola, TOTP kodu/secret veya token yazılmaz.
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None) or record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+class EventSampler(logging.Filter):
+    # Olay başına deterministik örnekleme ve saniye başına üst sınır. Kesirli biriktirici:
+    # her kayıtta rate eklenir, 1'i geçince kayıt yazılır (rate=0.75 -> 4 kayıttan 3'ü,
+    # ilk kayıt her zaman yazılır). WARNING ve üstü örneklenmez ama üst sınıra tabidir.
+    def __init__(self, sample_rates: dict[str, float], rate_cap_per_second: float):
+        super().__init__()
+        self.sample_rates = dict(sample_rates)
+        self.rate_cap = rate_cap_per_second
+        self._lock = threading.Lock()
+        self._credit = {}  # event -> örnekleme biriktiricisi
+        self._windows = {}  # event -> [saniye, o saniyedeki kayıt sayısı]
+        self.sampled_out = {}
+        self.rate_limited = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None) or record.name
+        rate = self.sample_rates.get(event, 1.0)
+        second = int(time.monotonic())
+        with self._lock:
+            if rate < 1.0 and record.levelno < logging.WARNING:
+                credit = self._credit.get(event, 1.0 - rate) + rate
+                # rate <= 0: olay tamamen kapalı
+                if rate <= 0 or credit < 1.0:
+                    self._credit[event] = credit
+                    self.sampled_out[event] = self.sampled_out.get(event, 0) + 1
+                    return False
+                self._credit[event] = credit - 1.0
+            if self.rate_cap > 0:
+                window = self._windows.get(event)
+                if window is None or window[0] != second:
+                    window = self._windows[event] = [second, 0]
+                if window[1] >= self.rate_cap:
+                    self.rate_limited[event] = self.rate_limited.get(event, 0) + 1
+                    return False
+                window[1] += 1
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sampled_out": dict(self.sampled_out), "rate_limited": dict(self.rate_limited)}
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Varsayılan prepare() mesajı istek thread'inde formatlar; formatlama listener'a kalır.
+        # Mesaj argümanları burada çözülür ki kayıt kuyruktayken değişmesinler.
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            # Sayaçlar yaklaşık (lock yok), sadece gözlem için
+            self.dropped += 1
+
+
+class EventLogger:
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(name)
+
+    def log(self, level: int, event: str, exc_info=None, **fields):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, event, exc_info=exc_info, extra={"event": event, "fields": fields})
+
+    def info(self, event: str, **fields):
+        self.log(logging.INFO, event, **fields)
+
+    def warning(self, event: str, **fields):
+        self.log(logging.WARNING, event, **fields)
+
+    def error(self, event: str, **fields):
+        self.log(logging.ERROR, event, **fields)
+
+
+class LoggingPipeline:
+    def __init__(self, stream=None, level: str = "INFO", queue_size: int = 10000,
+                 sample_rates: dict[str, float] | None = None, rate_cap_per_second: float = 0):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.sampler = EventSampler(sample_rates or {}, rate_cap_per_second)
+        self.handler.addFilter(self.sampler)
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JSONFormatter())
+        self.listener = logging.handlers.QueueListener(self.queue, output, respect_handler_level=False)
+        self.level = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+        self._started = False
+
+    def install(self, logger_name: str = "authguard"):
+        logger = logging.getLogger(logger_name)
+        logger.setLevel(self.level)
+        logger.addHandler(self.handler)
+        logger.propagate = False  # root handler'ları (uvicorn vb.) senkron yazmasın
+        self.start()
+
+    def start(self):
+        if not self._started:
+            self.listener.start()
+            self._started = True
+
+    def stop(self):
+        # Kuyrukta kalanları yazar (process kapanırken)
+        if self._started:
+            self.listener.stop()
+            self._started = False
+
+    def stats(self) -> dict:
+        return {
+            "queue_size": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "enqueued": self.handler.enqueued,
+            "dropped_queue_full": self.handler.dropped,
+            **self.sampler.stats(),
+        }
+
+
+log_pipeline = LoggingPipeline(
+    level=settings.LOG_LEVEL,
+    queue_size=settings.LOG_QUEUE_SIZE,
+    sample_rates=settings.LOG_SAMPLE_RATES,
+    rate_cap_per_second=settings.LOG_EVENT_RATE_CAP,
+)
+log_pipeline.install("authguard")
+atexit.register(log_pipeline.stop)
+
+auth_log = EventLogger("authguard.auth")
@@ -0,0 +1,124 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+
+# Performans: bcrypt hash'leri Starlette'in ortak threadpool'unu kilitlemesin diye
+# ayrı ve sınırlı bir havuzda çalıştırılır. bcrypt GIL'i bıraktığı için thread havuzu yeterli.
+
+
+class HashingOverloaded(Exception):
+    # Kuyruk gecikme bütçesini aştığında fırlatılır -> 503 + Retry-After
+    def __init__(self, retry_after: int):
+        super().__init__(f"Password hashing backlog is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class HashingExecutor:
+    def __init__(self, max_workers: int, max_queue: int, latency_budget_ms: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.latency_budget = latency_budget_ms / 1000
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pwd-hash")
+        self._lock = threading.Lock()
+        self._pending = 0  # kuyrukta bekleyen + çalışan işler
+        self._avg_hash_time = 0.0  # EWMA (saniye)
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._hash_time_total = 0.0
+        self._hash_time_max = 0.0
+
+    def _estimated_wait(self) -> float:
+        # Boş worker varsa bekleme yok, yoksa önümüzdeki işlerin worker başına süresi
+        ahead = self._pending - self.max_workers + 1
+        if ahead <= 0:
+            return 0.0
+        return ahead / self.max_workers * self._avg_hash_time
+
+    def _admit(self):
+        with self._lock:
+            estimated_wait = self._estimated_wait()
+            queue_full = self._pending >= self.max_workers + self.max_queue
+            if queue_full or estimated_wait > self.latency_budget:
+                self._rejected += 1
+                raise HashingOverloaded(retry_after=max(1, math.ceil(estimated_wait)))
+            self._pending += 1
+            self._submitted += 1
+
+    def _run(self, submitted_at: float, fn, args):
+        started_at = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.perf_counter()
+            queue_wait = started_at - submitted_at
+            hash_time = finished_at - started_at
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+                self._queue_wait_total += queue_wait
+                self._queue_wait_max = max(self._queue_wait_max, queue_wait)
+                self._hash_time_total += hash_time
+                self._hash_time_max = max(self._hash_time_max, hash_time)
+                if self._avg_hash_time == 0.0:
+                    self._avg_hash_time = hash_time
+                else:
+                    self._avg_hash_time = 0.8 * self._avg_hash_time + 0.2 * hash_time
+
+    def submit(self, fn, *args) -> Future:
+        self._admit()
+        return self._pool.submit(self._run, time.perf_counter(), fn, args)
+
+    def run(self, fn, *args):
+        # Sync çağıranlar için (CLI, test): sonucu bekler. Request handler'larında
+        # kullanılmamalı; bekleme boyunca Starlette threadpool token'ını tutar (arun kullan)
+        return self.submit(fn, *args).result()
+
+    async def arun(self, fn, *args):
+        # Async endpoint'ler için: event loop'u bloklamadan bekler
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "latency_budget_ms": self.latency_budget * 1000,
+                "in_flight": self._pending,
+                "queued": max(0, self._pending - self.max_workers),
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "completed": self._completed,
+                "queue_wait_avg_ms": self._queue_wait_total / completed * 1000,
+                "queue_wait_max_ms": self._queue_wait_max * 1000,
+                "hash_time_avg_ms": self._hash_time_total / completed * 1000,
+                "hash_time_max_ms": self._hash_time_max * 1000,
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+def hashing_overloaded_handler(request: Request, exc: HashingOverloaded) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+hasher = HashingExecutor(
+    max_workers=settings.HASH_WORKERS,
+    max_queue=settings.HASH_MAX_QUEUE,
+    latency_budget_ms=settings.HASH_LATENCY_BUDGET_MS,
+)
@@ -0,0 +1,421 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+from app.core.config import settings
+
+# Performans: /metrics için Prometheus metin formatında sayaçlar ve histogramlar.
+# Sıcak yolda sadece process içi sayaç artırılır (kova başına tek lock + toplama), dosya veya
+# ağ I/O'su yoktur. Çoklu worker'da her process kendi anlık görüntüsünü METRICS_MULTIPROC_DIR
+# altındaki "metrics-<pid>.json" dosyasına periyodik olarak (ve scrape anında) yazar; /metrics
+# hangi worker'a düşerse düşsün tüm dosyaları birleştirir:
+#   - counter / histogram: tüm process'lerin toplamı (ölen worker'ın sayaçları kaybolmaz)
+#   - gauge: sadece yaşayan process'ler, multiprocess_mode'a göre "sum" veya "max"
+# prometheus_client'in multiprocess modu gibi dizin tek bir çalıştırmaya aittir: master
+# başlarken wipe_multiproc_dir() ile temizlenmeli (python -m app.core.metrics wipe). Dizindeki
+# her dosya bu çalıştırmanın bir worker'ıdır; ölmüş olanların sayaçları da toplanır.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Timer:
+    __slots__ = ("_value", "_started")
+
+    def __init__(self, value):
+        self._value = value
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._value.observe(time.perf_counter() - self._started)
+
+
+class _CounterValue:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class _GaugeValue:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def snapshot(self):
+        return self.value
+
+
+class _HistogramValue:
+    __slots__ = ("_lock", "_buckets", "_counts", "_sum")
+
+    def __init__(self, buckets):
+        self._lock = threading.Lock()
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)  # son kova: +Inf
+        self._sum = 0.0
+
+    def observe(self, seconds: float):
+        index = bisect.bisect_left(self._buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+
+    def time(self) -> _Timer:
+        # with histogram.labels(...).time(): ...
+        return _Timer(self)
+
+    def snapshot(self):
+        with self._lock:
+            return {"counts": list(self._counts), "sum": self._sum}
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _new_value(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_value())
+        return child
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            children = list(self._children.items())
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(values), child.snapshot()] for values, child in children],
+        }
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_value(self):
+        return _CounterValue()
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), multiprocess_mode: str = "sum"):
+        super().__init__(name, documentation, labelnames)
+        # "sum": worker başına değerler toplanır (ör. havuzdaki bağlantılar)
+        # "max": tüm worker'lar aynı değeri görür (ör. paylaşımlı rate limit deposu)
+        if multiprocess_mode not in ("sum", "max"):
+            raise ValueError(f"Unsupported multiprocess_mode: {multiprocess_mode}")
+        self.multiprocess_mode = multiprocess_mode
+
+    def _new_value(self):
+        return _GaugeValue()
+
+    def snapshot(self) -> dict:
+        snapshot = super().snapshot()
+        snapshot["multiprocess_mode"] = self.multiprocess_mode
+        return snapshot
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_value(self):
+        return _HistogramValue(self.buckets)
+
+    def snapshot(self) -> dict:
+        snapshot = super().snapshot()
+        snapshot["buckets"] = list(self.buckets)
+        return snapshot
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._collect_hooks = []
+        self.store = None
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=(), multiprocess_mode: str = "sum") -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, multiprocess_mode))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def on_collect(self, hook):
+        # Gauge'lar (havuz, rate limit) sıcak yolda değil, snapshot anında doldurulur
+        self._collect_hooks.append(hook)
+        return hook
+
+    def snapshot(self) -> dict:
+        for hook in self._collect_hooks:
+            hook()
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def render(self) -> str:
+        if self.store is None:
+            return render_text(self.snapshot())
+        self.store.flush()
+        return render_text(merge_snapshots(self.store.load()))
+
+
+# --- Çoklu worker ---
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiprocessStore:
+    def __init__(self, registry: MetricsRegistry, directory: str, flush_interval: float, pid: int | None = None):
+        self.registry = registry
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._pid = pid
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def pid(self) -> int:
+        # fork ile çoğaltılan worker'lar kendi dosyasına yazmalı
+        return self._pid or os.getpid()
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"metrics-{pid}.json")
+
+    def flush(self):
+        payload = {"pid": self.pid, "metrics": self.registry.snapshot()}
+        path = self._path(self.pid)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as handle:
+            json.dump(payload, handle)
+        os.replace(tmp_path, path)  # okuyan worker yarım dosya görmez
+
+    def load(self) -> list[tuple[bool, dict]]:
+        # -> [(process yaşıyor mu, metrikler)]
+        snapshots = []
+        for entry in os.scandir(self.directory):
+            if not (entry.name.startswith("metrics-") and entry.name.endswith(".json")):
+                continue
+            try:
+                with open(entry.path) as handle:
+                    payload = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            alive = payload["pid"] == self.pid or _pid_alive(payload["pid"])
+            snapshots.append((alive, payload["metrics"]))
+        return snapshots
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def start(self):
+        # Worker başladıktan sonra (fork sonrası) çağrılmalı, bkz. main.py startup
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+            self._thread.start()
+
+
+def wipe_multiproc_dir(directory: str) -> int:
+    # Master başlarken, worker'lar açılmadan önce çağrılır. Silinen dosya sayısını döner.
+    removed = 0
+    if not os.path.isdir(directory):
+        return removed
+    for entry in os.scandir(directory):
+        if entry.name.startswith("metrics-") and (entry.name.endswith(".json") or entry.name.endswith(".json.tmp")):
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+
+def merge_snapshots(snapshots: list[tuple[bool, dict]]) -> dict:
+    merged = {}
+    for alive, metrics in snapshots:
+        for name, metric in metrics.items():
+            if metric["type"] == "gauge" and not alive:
+                continue
+            target = merged.get(name)
+            if target is None:
+                target = merged[name] = {key: value for key, value in metric.items() if key != "samples"}
+                target["samples"] = {}
+            samples = target["samples"]
+            for labels, value in metric["samples"]:
+                key = tuple(labels)
+                current = samples.get(key)
+                if current is None:
+                    samples[key] = value
+                elif metric["type"] == "histogram":
+                    samples[key] = {
+                        "counts": [a + b for a, b in zip(current["counts"], value["counts"])],
+                        "sum": current["sum"] + value["sum"],
+                    }
+                elif metric["type"] == "gauge" and metric.get("multiprocess_mode") == "max":
+                    samples[key] = max(current, value)
+                else:
+                    samples[key] = current + value
+    for metric in merged.values():
+        metric["samples"] = [[list(labels), value] for labels, value in metric["samples"].items()]
+    return merged
+
+
+# --- Prometheus metin formatı (text/plain; version=0.0.4) ---
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra: tuple | None = None) -> str:
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render_text(metrics: dict) -> str:
+    lines = []
+    for name, metric in metrics.items():
+        if not metric["samples"]:
+            continue
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        labelnames = metric["labelnames"]
+        for labels, value in metric["samples"]:
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric["buckets"] + [float("inf")], value["counts"]):
+                cumulative += count
+                le = ("le", _format_value(bound))
+                lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(value['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labelnames, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+# --- HTTP istek süreleri (pure ASGI, bkz. SecurityHeadersMiddleware) ---
+class MetricsMiddleware:
+    def __init__(self, app, histogram: Histogram = None):
+        self.app = app
+        self.histogram = histogram or request_duration_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500  # response başlamadan exception -> 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Yol şablonu kullanılır (/auth/login), ham path değil: 404 taramaları
+            # label kardinalitesini şişirmesin
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            self.histogram.labels(scope["method"], path, status_code).observe(time.perf_counter() - started)
+
+
+registry = MetricsRegistry()
+
+request_duration_seconds = registry.histogram(
+    "authguard_http_request_duration_seconds",
+    "HTTP request latency by route and status.",
+    ["method", "route", "status"],
+)
+
+login_stage_seconds = registry.histogram(
+    "authguard_login_stage_seconds",
+    "Latency of individual login stages.",
+    ["stage"],
+)
+
+# Sıcak yolda label çözümlemesi yapılmasın diye önceden bağlanmış çocuklar
+LOGIN_DB_LOOKUP = login_stage_seconds.labels("db_lookup")
+LOGIN_PASSWORD_VERIFY = login_stage_seconds.labels("password_verify")
+LOGIN_FERNET_DECRYPT = login_stage_seconds.labels("fernet_decrypt")
+LOGIN_TOTP_VERIFY = login_stage_seconds.labels("totp_verify")
+LOGIN_JWT_ENCODE = login_stage_seconds.labels("jwt_encode")
+
+if settings.METRICS_MULTIPROC_DIR:
+    registry.store = MultiprocessStore(registry, settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Kullanım: python -m app.core.metrics wipe  (sunucu başlatılmadan önce)
+    if sys.argv[1:] != ["wipe"]:
+        sys.exit("usage: python -m app.core.metrics wipe")
+    if not settings.METRICS_MULTIPROC_DIR:
+        sys.exit("METRICS_MULTIPROC_DIR is not set")
+    print(f"removed {wipe_multiproc_dir(settings.METRICS_MULTIPROC_DIR)} metric files")
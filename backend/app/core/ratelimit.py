@@ -0,0 +1,205 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+
+# Performans + Güvenlik: Rate limit sayaçları için aynı host'taki tüm uvicorn worker'larının
+# paylaştığı SQLite (WAL) deposu. Varsayılan "memory://" deposu her process'te ayrı sayar,
+# N worker ile "5/minute" fiilen 5N/minute olur.
+#
+# Sliding window counter: anahtar başına TEK satır (önceki + şimdiki pencere sayacı), yani
+# anahtar başına O(1) bellek. İki pencere boyunca istek gelmeyen anahtarlar periyodik
+# olarak silinir (expiry sweep).
+#
+# Kullanım: RATE_LIMIT_STORAGE_URI=sqlite:////tmp/authguard-ratelimit.db
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sliding_windows (
+    key TEXT PRIMARY KEY,
+    window INTEGER NOT NULL,
+    previous_count INTEGER NOT NULL,
+    current_count INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fixed_windows (
+    key TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_sliding_windows_expires_at ON sliding_windows (expires_at);
+CREATE INDEX IF NOT EXISTS ix_fixed_windows_expires_at ON fixed_windows (expires_at);
+"""
+
+
+class SQLiteSharedStorage(Storage, SlidingWindowCounterSupport):
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, sweep_interval: float = 30, **options):
+        # sqlite:////abs/path.db -> /abs/path.db, sqlite:///rel.db -> rel.db
+        self.path = uri[len("sqlite:///"):]
+        self.sweep_interval = float(sweep_interval)
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self._open()
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    def _open(self):
+        self._pid = os.getpid()
+        self._db = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # fork ile çoğaltılan worker'lar (ör. gunicorn --preload) bağlantıyı paylaşmamalı
+        if self._pid != os.getpid():
+            self._open()
+        return self._db
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _transaction(self):
+        # BEGIN IMMEDIATE: yazma kilidini baştan alır, process'ler arası okuma-yazma yarışını önler
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def _maybe_sweep(self, now: float):
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        self._conn.execute("DELETE FROM sliding_windows WHERE expires_at <= ?", (now,))
+        self._conn.execute("DELETE FROM fixed_windows WHERE expires_at <= ?", (now,))
+
+    # --- Sliding Window Counter ---
+    @staticmethod
+    def _roll(row, window: int) -> tuple[int, int]:
+        # Satırdaki sayaçları şimdiki pencereye kaydır -> (önceki, şimdiki)
+        if row is None:
+            return 0, 0
+        stored_window, previous_count, current_count = row
+        if stored_window == window:
+            return previous_count, current_count
+        if stored_window == window - 1:
+            return current_count, 0
+        return 0, 0
+
+    def _read_window(self, key: str, expiry: int, now: float):
+        window = int(now // expiry)
+        row = self._conn.execute(
+            "SELECT window, previous_count, current_count FROM sliding_windows WHERE key = ?", (key,)
+        ).fetchone()
+        previous_count, current_count = self._roll(row, window)
+        # Önceki pencerenin ağırlığı = şimdiki pencerede kalan süre oranı
+        previous_ttl = (window + 1) * expiry - now if previous_count else 0.0
+        current_ttl = (window + 2) * expiry - now
+        return window, previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        with self._lock:
+            self._transaction()
+            try:
+                window, previous_count, previous_ttl, current_count, _ = self._read_window(key, expiry, now)
+                weighted_count = previous_count * previous_ttl / expiry + current_count
+                if math.floor(weighted_count) + amount > limit:
+                    self._conn.execute("COMMIT")
+                    return False
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sliding_windows (key, window, previous_count, current_count, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, window, previous_count, current_count + amount, (window + 2) * expiry),
+                )
+                self._maybe_sweep(now)
+                self._conn.execute("COMMIT")
+                return True
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        with self._lock:
+            _, previous_count, previous_ttl, current_count, current_ttl = self._read_window(key, expiry, time.time())
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sliding_windows WHERE key = ?", (key,))
+
+    # --- Fixed Window (limits Storage arayüzü) ---
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        with self._lock:
+            self._transaction()
+            try:
+                row = self._conn.execute(
+                    "SELECT count, expires_at FROM fixed_windows WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or row[1] <= now:
+                    count, expires_at = amount, now + expiry
+                else:
+                    count, expires_at = row[0] + amount, row[1]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO fixed_windows (key, count, expires_at) VALUES (?, ?, ?)",
+                    (key, count, expires_at),
+                )
+                self._maybe_sweep(now)
+                self._conn.execute("COMMIT")
+                return count
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT count FROM fixed_windows WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at FROM fixed_windows WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else time.time()
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM fixed_windows WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM sliding_windows WHERE key = ?", (key,))
+
+    def check(self) -> bool:
+        try:
+            with self._lock:
+                self._conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        with self._lock:
+            count = self._key_count()
+            self._conn.execute("DELETE FROM sliding_windows")
+            self._conn.execute("DELETE FROM fixed_windows")
+        return count
+
+    def sweep(self) -> None:
+        with self._lock:
+            self._last_sweep = 0.0
+            self._maybe_sweep(time.time())
+
+    def _key_count(self) -> int:
+        sliding = self._conn.execute("SELECT COUNT(*) FROM sliding_windows").fetchone()[0]
+        fixed = self._conn.execute("SELECT COUNT(*) FROM fixed_windows").fetchone()[0]
+        return sliding + fixed
+
+    def key_count(self) -> int:
+        with self._lock:
+            return self._key_count()
@@ -0,0 +1,17 @@
+from fastapi.responses import ORJSONResponse
+
+# Performans: Tüm API için orjson tabanlı response sınıfı (main.py'de default_response_class).
+# orjson, stdlib json'a göre dict/str/int ağırlıklı küçük gövdeleri birkaç kat hızlı yazar.
+#
+# Endpoint bir Response nesnesi döndürürse FastAPI response_model doğrulamasını ve
+# jsonable_encoder'ı tamamen atlar. Token ve kullanıcı kaydı gibi alanları zaten bizim
+# ürettiğimiz (güvenilir) nesneler için trusted_response kullanılır; response_model yine
+# OpenAPI dokümantasyonu için endpoint'te kalır. Dışarıdan gelen veri buradan GEÇMEMELİ.
+FastJSONResponse = ORJSONResponse
+
+
+def trusted_response(content, status_code: int = 200) -> ORJSONResponse:
+    # NamedTuple (ör. UserAuthRecord) orjson'da liste olarak yazılır, dict'e çevrilmeli
+    if hasattr(content, "_asdict"):
+        content = content._asdict()
+    return ORJSONResponse(content, status_code=status_code)
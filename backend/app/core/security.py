@@ -1,13 +1,46 @@
 from passlib.context import CryptContext
+from passlib.hash import argon2
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from jose import jwt, JWTError
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core import metrics
 from cryptography.fernet import Fernet
+import base64
+import hashlib
+import hmac
+import time
 import pyotp
 
 # Security Analysis (Kişi 3): Argon2 kullanımı modern güvenlik standartları için daha iyidir
-# ancak geçiş maliyeti olmaması için Bcrypt'i sıkılaştırılmış ayarlarla kullanıyoruz.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# ancak geçiş maliyeti olmaması için varsayılan Bcrypt'tir; PASSWORD_HASH_SCHEME=argon2 ile
+# Argon2id seçilebilir. Seçilen şema listede ilk sıradadır, diğeri deprecated olur.
+# Maliyetler sabitlenir (bcrypt: min=max=default tur, argon2: bellek + zaman maliyeti): farklı
+# parametreli her hash needs_update=True olur ve başarılı login'de yeni ayarlarla taşınır.
+PASSWORD_HASH_SCHEMES = ("bcrypt", "argon2")
+
+def build_password_context(scheme: str) -> CryptContext:
+    if scheme not in PASSWORD_HASH_SCHEMES:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+    return CryptContext(
+        schemes=[scheme] + [other for other in PASSWORD_HASH_SCHEMES if other != scheme],
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+        argon2__type="ID",
+        argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+        argon2__rounds=settings.ARGON2_TIME_COST,
+        argon2__min_rounds=settings.ARGON2_TIME_COST,
+        argon2__max_rounds=settings.ARGON2_TIME_COST,
+        argon2__parallelism=settings.ARGON2_PARALLELISM,
+    )
+
+# Backend yoksa ilk login'de değil, açılışta hata ver
+if settings.PASSWORD_HASH_SCHEME == "argon2" and not argon2.has_backend():
+    raise RuntimeError("PASSWORD_HASH_SCHEME=argon2 requires argon2-cffi")
+pwd_context = build_password_context(settings.PASSWORD_HASH_SCHEME)
 
 # Encryption Suite (Veritabanındaki hassas verileri şifrelemek için)
 cipher_suite = Fernet(settings.ENCRYPTION_KEY)
@@ -19,6 +52,11 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password, hashed_password) -> tuple[bool, str | None]:
+    # Rehash-on-login: hash güncel maliyette değilse (doğru parolayla) yeni hash de döner.
+    # Parola bu anda elimizde olduğu için toplu migrasyon işine gerek kalmaz.
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 # --- JWT Handling ---
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
@@ -39,6 +77,34 @@ def create_refresh_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# Performans: Aynı bearer token ömrü boyunca binlerce kez gelebilir. Doğrulanmış claim'ler
+# token'ın SHA-256 özetiyle anahtarlanıp exp anına kadar saklanır; tekrar gelen istekte
+# HMAC doğrulama ve base64/JSON çözümleme atlanır. Token'ın kendisi cache'te tutulmaz.
+token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+def decode_token(token: str):
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(digest)
+    if claims is not None:
+        return claims
+
+    # Geçersiz imza / süresi dolmuş token -> JWTError (cache'e hiç girmez)
+    claims = MappingProxyType(jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]))
+    exp = claims.get("exp")
+    if exp is not None:
+        token_cache.set(digest, claims, ttl_seconds=exp - time.time())
+    return claims
+
+def decode_refresh_token(token: str) -> dict:
+    # Refresh token'lar rotation ile tek kullanımlıktır, cache'lenmez
+    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    if claims.get("type") != "refresh":
+        raise JWTError("Not a refresh token")
+    return claims
+
 # --- Encryption at Rest (TOTP Secret) ---
 def encrypt_data(data: str) -> str:
     # Hassas veriyi şifreler
@@ -58,6 +124,60 @@ def verify_totp(secret: str, code: str):
     totp = pyotp.TOTP(secret)
     return totp.verify(code)
 
+# Performans: Login sırasında her denemede Fernet decrypt + pyotp.TOTP kurulumu yapmamak için
+# hazırlanmış doğrulayıcı. Anahtar bir kez çözülür, HMAC-SHA1 durumu hazır tutulur ve
+# her sayaç (counter) için sadece kopyalanır. pyotp.TOTP (6 hane, 30 sn) ile birebir uyumludur.
+class TOTPVerifier:
+    __slots__ = ("_mac", "digits", "interval")
+
+    def __init__(self, secret: str, digits: int = 6, interval: int = 30):
+        secret = secret.upper()
+        key = base64.b32decode(secret + "=" * (-len(secret) % 8))
+        self._mac = hmac.new(key, digestmod=hashlib.sha1)
+        self.digits = digits
+        self.interval = interval
+
+    def at(self, counter: int) -> str:
+        mac = self._mac.copy()
+        mac.update(counter.to_bytes(8, "big"))
+        digest = mac.digest()
+        offset = digest[-1] & 0x0F
+        code = int.from_bytes(digest[offset:offset + 4], "big") & 0x7FFFFFFF
+        return str(code % 10 ** self.digits).zfill(self.digits)
+
+    def verify(self, code: str, valid_window: int = 0, for_time: float | None = None) -> bool:
+        code = str(code) if code else ""
+        # compare_digest ASCII olmayan str'de TypeError fırlatır: önce biçim kontrolü
+        if len(code) != self.digits or not (code.isascii() and code.isdigit()):
+            return False
+        counter = int((time.time() if for_time is None else for_time) // self.interval)
+        expected = code.encode()
+        return any(
+            hmac.compare_digest(self.at(counter + i).encode(), expected)
+            for i in range(-valid_window, valid_window + 1)
+        )
+
+# Kullanıcı id'si ile anahtarlanır; şifreli secret de saklanır, böylece başka bir worker
+# secret'ı değiştirdiyse (ciphertext farklı) eski doğrulayıcı kullanılmaz.
+totp_cache = TTLCache(
+    max_size=settings.TOTP_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOTP_CACHE_TTL_SECONDS,
+)
+
+def get_totp_verifier(user_id: int, encrypted_secret: str) -> TOTPVerifier:
+    entry = totp_cache.get(user_id)
+    if entry is not None and entry[0] == encrypted_secret:
+        return entry[1]
+    with metrics.LOGIN_FERNET_DECRYPT.time():
+        secret = decrypt_data(encrypted_secret)
+    verifier = TOTPVerifier(secret)
+    totp_cache.set(user_id, (encrypted_secret, verifier))
+    return verifier
+
+def invalidate_totp_verifier(user_id: int):
+    # 2FA secret'ı değişen her işlemden (ör. enable_2fa) sonra çağrılmalı
+    totp_cache.pop(user_id)
+
 def get_totp_uri(secret: str, email: str):
     # QR kod üretimi için gerekli URI formatı
     return pyotp.TOTP(secret).provisioning_uri(name=email, issuer_name="AuthGuard")
\ No newline at end of file
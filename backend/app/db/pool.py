@@ -0,0 +1,119 @@
+import bisect
+import contextvars
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Performans: Bağlantı havuzundan bağlantı alma süresini ölçen QueuePool sürümleri.
+# "QueuePool limit" hatalarını önceden görebilmek için bekleme süreleri histogramda tutulur.
+# Sadece havuz kuyruğunda geçen süre ölçülür: yeni bağlantı açma (_create_connection) düşülür,
+# pool_pre_ping ve reset _do_get dışında kaldığı için zaten sayılmaz. Aksi halde düşük yükte
+# bağlantı kurulum gecikmesi havuz çekişmesi gibi görünür.
+
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolWaitHistogram:
+    def __init__(self, buckets_ms=WAIT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets_ms) + 1)  # son kova: +Inf
+        self._sum_ms = 0.0
+        self._timeouts = 0
+
+    def observe(self, seconds: float):
+        elapsed_ms = seconds * 1000
+        index = bisect.bisect_left(self.buckets_ms, elapsed_ms)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum_ms += elapsed_ms
+
+    def observe_timeout(self):
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            sum_ms = self._sum_ms
+            timeouts = self._timeouts
+        # Prometheus tarzı kümülatif kovalar (le = "less or equal")
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.buckets_ms, counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = cumulative + counts[-1]
+        return {
+            "buckets_ms": buckets,
+            "count": buckets["+Inf"],
+            "sum_ms": sum_ms,
+            "timeouts": timeouts,
+        }
+
+
+# Süren checkout'ta bağlantı açmaya harcanan saniye; QueuePool._do_get kendini özyinelemeli
+# çağırır, sadece en dıştaki çağrı ölçer. ContextVar: async'te her greenlet/task kendi değerini görür.
+_connect_seconds = contextvars.ContextVar("pool_connect_seconds", default=None)
+
+
+class _WaitTimingMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = PoolWaitHistogram()
+
+    def _do_get(self):
+        if _connect_seconds.get() is not None:
+            return super()._do_get()
+        connect_seconds = [0.0]
+        token = _connect_seconds.set(connect_seconds)
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_histogram.observe_timeout()
+            raise
+        finally:
+            _connect_seconds.reset(token)
+        self.wait_histogram.observe(time.perf_counter() - started - connect_seconds[0])
+        return entry
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            connect_seconds = _connect_seconds.get()
+            if connect_seconds is not None:
+                connect_seconds[0] += time.perf_counter() - started
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        # SQLite :memory: vb. havuzsuz kurulumlar
+        return {"pool": type(pool).__name__, "status": pool.status()}
+
+    stats = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),  # SQLAlchemy boşta iken negatif raporlar
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+    }
+    histogram = getattr(pool, "wait_histogram", None)
+    if histogram is not None:
+        stats["checkout_wait"] = histogram.snapshot()
+    return stats
@@ -1,9 +1,32 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
-engine = create_engine(settings.DATABASE_URL)
+# --- Connection Pool Ayarları ---
+def get_engine_options(url: str, is_async: bool = False) -> dict:
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite tek bağlantıya bağlıdır, havuz ayarı uygulanmaz
+        return {}
+
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.get_backend_name() == "postgresql":
+        # asyncpg "timeout", psycopg2 "connect_timeout" parametresini kullanır
+        timeout_arg = "timeout" if is_async else "connect_timeout"
+        options["connect_args"] = {timeout_arg: settings.DB_CONNECT_TIMEOUT}
+    return options
+
+engine = create_engine(settings.DATABASE_URL, **get_engine_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -13,4 +36,36 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# --- Async DB (USE_ASYNC_DB=True) ---
+# Tek worker, Postgres round trip'leri sırasında thread tutmadan yüzlerce isteği işleyebilsin diye.
+def get_async_database_url(url: str) -> str:
+    # postgresql:// -> postgresql+asyncpg://, sqlite:// -> sqlite+aiosqlite://
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme:
+        scheme = scheme.split("+", 1)[0]
+    if scheme in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if scheme == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.USE_ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_database_url = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(
+        async_database_url, **get_engine_options(async_database_url, is_async=True)
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Async Dependency
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async DB path is disabled, set USE_ASYNC_DB=true")
+    async with AsyncSessionLocal() as db:
+        yield db
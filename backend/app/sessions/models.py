@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from app.db.session import Base
+
+class UserSession(Base):
+    __tablename__ = "user_sessions"
+
+    # Session id refresh/access token içindeki "sid" claim'idir -> PK ile tek indexli okuma
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+
+    # Security Analysis: Refresh token'ın kendisi ASLA saklanmaz, sadece SHA-256 özeti.
+    refresh_token_hash = Column(String(64), nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True, index=True)  # Revocation filtresi bu alandan kurulur
@@ -0,0 +1,152 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+
+from jose import JWTError
+from sqlalchemy import update
+
+from app.core import security
+from app.core.config import settings
+from app.sessions.models import UserSession
+from app.sessions.revocation import revocation_list
+
+# Session deposu (sync + async). Refresh işlemi = PK ile 1 indexli okuma + 1 koşullu UPDATE.
+# Rotation: her refresh'te yeni refresh token verilir, eskisi geçersiz olur. Eski bir token
+# tekrar kullanılırsa (token reuse -> çalınmış olabilir) session tamamen iptal edilir.
+
+
+class InvalidRefreshToken(Exception):
+    pass
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _new_refresh_token(email: str, session_id: str) -> str:
+    # jti: aynı saniyede yapılan rotation'larda bile token'lar farklı olsun
+    return security.create_refresh_token(
+        data={"sub": email, "sid": session_id, "jti": secrets.token_urlsafe(8)}
+    )
+
+
+def _build_session(user_id: int, email: str) -> tuple[UserSession, str]:
+    session_id = secrets.token_hex(16)
+    refresh_token = _new_refresh_token(email, session_id)
+    now = datetime.utcnow()
+    session = UserSession(
+        id=session_id,
+        user_id=user_id,
+        refresh_token_hash=hash_token(refresh_token),
+        created_at=now,
+        last_used_at=now,
+        expires_at=now + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+    )
+    return session, refresh_token
+
+
+def _parse_refresh_token(refresh_token: str) -> dict:
+    try:
+        claims = security.decode_refresh_token(refresh_token)
+    except JWTError:
+        raise InvalidRefreshToken("Invalid refresh token")
+    if not claims.get("sid") or not claims.get("sub"):
+        raise InvalidRefreshToken("Invalid refresh token")
+    return claims
+
+
+def _is_reused(session: UserSession | None, token_hash: str, now: datetime) -> bool:
+    # Geçersiz session -> InvalidRefreshToken, eski (rotate edilmiş) token -> True
+    if session is None or session.revoked_at is not None or session.expires_at <= now:
+        raise InvalidRefreshToken("Session expired or revoked")
+    return not secrets.compare_digest(session.refresh_token_hash, token_hash)
+
+
+def _rotate_statement(session_id: str, old_hash: str, new_hash: str, now: datetime):
+    # Compare-and-swap: eşzamanlı iki refresh'ten sadece biri kazanır
+    return (
+        update(UserSession)
+        .where(
+            UserSession.id == session_id,
+            UserSession.refresh_token_hash == old_hash,
+            UserSession.revoked_at.is_(None),
+        )
+        .values(refresh_token_hash=new_hash, last_used_at=now)
+    )
+
+
+def _revoke_statement(session_id: str, now: datetime):
+    return (
+        update(UserSession)
+        .where(UserSession.id == session_id, UserSession.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+
+
+# --- Sync ---
+def create_session(db, user_id: int, email: str) -> tuple[str, str]:
+    # Dönüş: (session_id, refresh token). id commit'ten önce alınır, commit sonrası
+    # expire olan nesneyi yeniden yüklemek için ek SELECT atılmaz.
+    session, refresh_token = _build_session(user_id, email)
+    session_id = session.id
+    db.add(session)
+    db.commit()
+    return session_id, refresh_token
+
+
+def rotate_session(db, refresh_token: str) -> tuple[str, str, str]:
+    # Dönüş: (email, session_id, yeni refresh token)
+    claims = _parse_refresh_token(refresh_token)
+    now = datetime.utcnow()
+    token_hash = hash_token(refresh_token)
+
+    session = db.get(UserSession, claims["sid"])
+    if _is_reused(session, token_hash, now):
+        revoke_session(db, session.id)
+        raise InvalidRefreshToken("Refresh token reuse detected, session revoked")
+
+    new_refresh_token = _new_refresh_token(claims["sub"], session.id)
+    result = db.execute(_rotate_statement(session.id, token_hash, hash_token(new_refresh_token), now))
+    db.commit()
+    if result.rowcount != 1:
+        raise InvalidRefreshToken("Refresh token already used")
+    return claims["sub"], session.id, new_refresh_token
+
+
+def revoke_session(db, session_id: str):
+    db.execute(_revoke_statement(session_id, datetime.utcnow()))
+    db.commit()
+    revocation_list.add(session_id)
+
+
+# --- Async ---
+async def acreate_session(db, user_id: int, email: str) -> tuple[str, str]:
+    session, refresh_token = _build_session(user_id, email)
+    session_id = session.id
+    db.add(session)
+    await db.commit()
+    return session_id, refresh_token
+
+
+async def arotate_session(db, refresh_token: str) -> tuple[str, str, str]:
+    claims = _parse_refresh_token(refresh_token)
+    now = datetime.utcnow()
+    token_hash = hash_token(refresh_token)
+
+    session = await db.get(UserSession, claims["sid"])
+    if _is_reused(session, token_hash, now):
+        await arevoke_session(db, session.id)
+        raise InvalidRefreshToken("Refresh token reuse detected, session revoked")
+
+    new_refresh_token = _new_refresh_token(claims["sub"], session.id)
+    result = await db.execute(_rotate_statement(session.id, token_hash, hash_token(new_refresh_token), now))
+    await db.commit()
+    if result.rowcount != 1:
+        raise InvalidRefreshToken("Refresh token already used")
+    return claims["sub"], session.id, new_refresh_token
+
+
+async def arevoke_session(db, session_id: str):
+    await db.execute(_revoke_statement(session_id, datetime.utcnow()))
+    await db.commit()
+    revocation_list.add(session_id)
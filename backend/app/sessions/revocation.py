@@ -0,0 +1,184 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.sessions.models import UserSession
+
+# Performans + Güvenlik: İptal edilmiş session kontrolü.
+# Kalıcı liste Postgres'tedir (user_sessions.revoked_at). Her istekte DB'ye gitmemek için
+# process içinde bir Bloom filter tutulur: "iptal edilmemiş" (en yaygın) durum birkaç hash
+# probe'una mal olur, sadece filtre "belki" derse DB'ye sorulur.
+#
+# Filtrede sadece son ACCESS_TOKEN_EXPIRE_MINUTES içinde iptal edilen session'lar tutulur:
+# daha önce iptal edilen session'a ait access token'ların süresi zaten dolmuştur ve iptal
+# edilmiş session için refresh yapılamaz. Filtre periyodik olarak DB'den yeniden kurulur
+# (diğer worker'lardaki iptaller en geç REVOCATION_REBUILD_SECONDS sonra görülür) ve bu
+# process'teki her iptalde anında güncellenir.
+#
+# Yeniden kurulum tek uçuşludur: süre dolduğunda SELECT'i sadece begin_rebuild()'i kazanan
+# istek çalıştırır, diğerleri bu sırada eski filtreyle devam eder. SELECT ile filtre değişimi
+# arasında gelen add()'ler kaydedilir ve yeni filtreye tekrar uygulanır, yoksa bu process'te
+# az önce iptal edilen session bir sonraki kuruluma kadar geçerli görünürdü.
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        # m = -n ln(p) / (ln 2)^2, k = (m / n) ln 2
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Double hashing (Kirsch-Mitzenmacher): tek blake2b özetinden k pozisyon
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def estimated_false_positive_rate(self) -> float:
+        # (1 - e^(-k n / m))^k
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+class RevocationList:
+    def __init__(self, capacity: int, error_rate: float, rebuild_interval: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._filter = BloomFilter(capacity, error_rate)
+        self._built_at = 0.0
+        self._rebuilding = False
+        self._pending: list[str] = []
+        self.rebuilds = 0
+        self.checks = 0
+        self.filter_positives = 0
+        self.confirmed_revoked = 0
+
+    def needs_rebuild(self) -> bool:
+        return time.monotonic() - self._built_at >= self.rebuild_interval
+
+    def begin_rebuild(self) -> bool:
+        # True dönerse çağıran SELECT + rebuild() yapar ve end_rebuild() ile bitirir
+        with self._lock:
+            if self._rebuilding or not self.needs_rebuild():
+                return False
+            self._rebuilding = True
+            self._pending = []
+            return True
+
+    def end_rebuild(self):
+        # SELECT hata verirse de çağrılır: _built_at değişmediği için sonraki istek tekrar dener
+        with self._lock:
+            self._rebuilding = False
+            self._pending = []
+
+    def rebuild(self, session_ids: list[str]):
+        # Kapasite aşılırsa yanlış pozitif oranı artmasın diye filtre büyütülür
+        bloom = BloomFilter(max(self.capacity, 2 * len(session_ids)), self.error_rate)
+        for session_id in session_ids:
+            bloom.add(session_id)
+        with self._lock:
+            # SELECT'ten sonra yapılan iptaller sorgu sonucunda olmayabilir
+            for session_id in self._pending:
+                bloom.add(session_id)
+            self._pending = []
+            self._filter = bloom
+            self._built_at = time.monotonic()
+            self.rebuilds += 1
+
+    def add(self, session_id: str):
+        with self._lock:
+            self._filter.add(session_id)
+            if self._rebuilding:
+                self._pending.append(session_id)
+
+    def might_be_revoked(self, session_id: str) -> bool:
+        maybe = session_id in self._filter
+        with self._lock:
+            self.checks += 1
+            if maybe:
+                self.filter_positives += 1
+        return maybe
+
+    def record_confirmed(self, revoked: bool):
+        if revoked:
+            with self._lock:
+                self.confirmed_revoked += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            false_positives = self.filter_positives - self.confirmed_revoked
+            return {
+                "entries": self._filter.count,
+                "size_bits": self._filter.size,
+                "hash_count": self._filter.hash_count,
+                "rebuilds": self.rebuilds,
+                "checks": self.checks,
+                "filter_positives": self.filter_positives,
+                "confirmed_revoked": self.confirmed_revoked,
+                "observed_false_positive_rate": false_positives / self.checks if self.checks else 0.0,
+                "estimated_false_positive_rate": self._filter.estimated_false_positive_rate(),
+            }
+
+
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.REVOCATION_FILTER_ERROR_RATE,
+    rebuild_interval=settings.REVOCATION_REBUILD_SECONDS,
+)
+
+
+def _recently_revoked_statement():
+    since = datetime.utcnow() - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return select(UserSession.id).where(UserSession.revoked_at >= since)
+
+
+def _revoked_at_statement(session_id: str):
+    return select(UserSession.revoked_at).where(UserSession.id == session_id)
+
+
+# --- Sync ---
+def is_session_revoked(db, session_id: str) -> bool:
+    if revocation_list.begin_rebuild():
+        try:
+            revocation_list.rebuild(list(db.execute(_recently_revoked_statement()).scalars()))
+        finally:
+            revocation_list.end_rebuild()
+    if not revocation_list.might_be_revoked(session_id):
+        return False
+    revoked = db.execute(_revoked_at_statement(session_id)).scalar() is not None
+    revocation_list.record_confirmed(revoked)
+    return revoked
+
+
+# --- Async ---
+async def ais_session_revoked(db, session_id: str) -> bool:
+    if revocation_list.begin_rebuild():
+        try:
+            result = await db.execute(_recently_revoked_statement())
+            revocation_list.rebuild(list(result.scalars()))
+        finally:
+            revocation_list.end_rebuild()
+    if not revocation_list.might_be_revoked(session_id):
+        return False
+    revoked = (await db.execute(_revoked_at_statement(session_id))).scalar() is not None
+    revocation_list.record_confirmed(revoked)
+    return revoked
@@ -0,0 +1,35 @@
+from typing import NamedTuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Performans: Token ile gelen her istekte kullanıcıyı DB'den tekrar yüklememek için
+# küçük ve değiştirilemez (immutable) kullanıcı kaydı cache'i. Email ile anahtarlanır.
+# Hassas alanlar (hashed_password, totp_secret) burada TUTULMAZ.
+
+
+class UserAuthRecord(NamedTuple):
+    id: int
+    email: str
+    is_active: bool
+    is_2fa_enabled: bool
+
+    @classmethod
+    def from_user(cls, user) -> "UserAuthRecord":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=bool(user.is_active),
+            is_2fa_enabled=bool(user.is_2fa_enabled),
+        )
+
+
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user(email: str):
+    # Kullanıcıya yazan her işlemden (ör. enable_2fa) sonra çağrılmalı
+    user_cache.pop(email)
@@ -0,0 +1,127 @@
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from app.users.cache import UserAuthRecord
+from app.users.models import User
+
+# Performans: Kimlik doğrulama hot path'i için ORM yerine Core sorguları.
+# db.query(User).first() her çağrıda identity map, attribute instrumentation ve unit-of-work
+# maliyeti öder; burada sadece gereken kolonlar seçilir ve satır düz bir kayda kopyalanır.
+# Statement'lar modül seviyesinde bir kez kurulur (bindparam ile), böylece SQLAlchemy'nin
+# compiled cache'inde her çağrı aynı derlenmiş SQL'i kullanır.
+
+_users = User.__table__
+
+
+class LoginRecord:
+    # Login için gereken alanlar (hassas alanlar dahil, cache'e KONULMAZ)
+    __slots__ = ("id", "email", "hashed_password", "is_active", "is_2fa_enabled", "totp_secret")
+
+    def __init__(self, id, email, hashed_password, is_active, is_2fa_enabled, totp_secret):
+        self.id = id
+        self.email = email
+        self.hashed_password = hashed_password
+        self.is_active = bool(is_active)
+        self.is_2fa_enabled = bool(is_2fa_enabled)
+        self.totp_secret = totp_secret
+
+
+_login_statement = select(
+    _users.c.id,
+    _users.c.email,
+    _users.c.hashed_password,
+    _users.c.is_active,
+    _users.c.is_2fa_enabled,
+    _users.c.totp_secret,
+).where(_users.c.email == bindparam("email"))
+
+_auth_statement = select(
+    _users.c.id,
+    _users.c.email,
+    _users.c.is_active,
+    _users.c.is_2fa_enabled,
+).where(_users.c.email == bindparam("email"))
+
+_update_password_statement = (
+    update(_users)
+    .where(_users.c.id == bindparam("user_id"))
+    .values(hashed_password=bindparam("new_hash"))
+)
+
+
+# Register: tek round trip. Email'in benzersizliğini unique index kontrol eder (SELECT + INSERT
+# arasındaki yarış penceresi yok); çakışmada satır dönmez. Varsayılan kolon değerleri
+# (is_active, is_2fa_enabled) RETURNING ile alınır, ayrıca db.refresh() gerekmez.
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_create_user_statements = {}
+
+
+def _create_user_statement(dialect_name: str):
+    statement = _create_user_statements.get(dialect_name)
+    if statement is None:
+        dialect_insert = _DIALECT_INSERTS.get(dialect_name)
+        if dialect_insert is None:
+            # Diğer dialect'ler: düz INSERT, çakışma IntegrityError olarak gelir
+            statement = insert(_users)
+        else:
+            statement = dialect_insert(_users).on_conflict_do_nothing(index_elements=[_users.c.email])
+        statement = statement.returning(_users.c.id, _users.c.email, _users.c.is_active, _users.c.is_2fa_enabled)
+        _create_user_statements[dialect_name] = statement
+    return statement
+
+
+def _to_auth_record(row) -> UserAuthRecord | None:
+    if row is None:
+        return None
+    return UserAuthRecord(id=row[0], email=row[1], is_active=bool(row[2]), is_2fa_enabled=bool(row[3]))
+
+
+# --- Sync ---
+def get_login_record(db, email: str) -> LoginRecord | None:
+    row = db.execute(_login_statement, {"email": email}).first()
+    return LoginRecord(*row) if row else None
+
+
+def get_auth_record(db, email: str) -> UserAuthRecord | None:
+    return _to_auth_record(db.execute(_auth_statement, {"email": email}).first())
+
+
+def create_user(db, email: str, hashed_password: str) -> UserAuthRecord | None:
+    # None -> email zaten kayıtlı. Commit çağıran tarafta.
+    statement = _create_user_statement(db.get_bind().dialect.name)
+    try:
+        row = db.execute(statement, {"email": email, "hashed_password": hashed_password}).first()
+    except IntegrityError:
+        db.rollback()
+        return None
+    return _to_auth_record(row)
+
+
+def update_password_hash(db, user_id: int, new_hash: str):
+    # Commit çağıran tarafta (login'de session INSERT'i ile aynı transaction)
+    db.execute(_update_password_statement, {"user_id": user_id, "new_hash": new_hash})
+
+
+# --- Async ---
+async def aget_login_record(db, email: str) -> LoginRecord | None:
+    row = (await db.execute(_login_statement, {"email": email})).first()
+    return LoginRecord(*row) if row else None
+
+
+async def aget_auth_record(db, email: str) -> UserAuthRecord | None:
+    return _to_auth_record((await db.execute(_auth_statement, {"email": email})).first())
+
+
+async def acreate_user(db, email: str, hashed_password: str) -> UserAuthRecord | None:
+    statement = _create_user_statement(db.get_bind().dialect.name)
+    try:
+        row = (await db.execute(statement, {"email": email, "hashed_password": hashed_password})).first()
+    except IntegrityError:
+        await db.rollback()
+        return None
+    return _to_auth_record(row)
+
+
+async def aupdate_password_hash(db, user_id: int, new_hash: str):
+    await db.execute(_update_password_statement, {"user_id": user_id, "new_hash": new_hash})
@@ -21,6 +21,9 @@ class Token(BaseModel):
     refresh_token: str
     token_type: str
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
 class TokenData(BaseModel):
     email: Optional[str] = None
 
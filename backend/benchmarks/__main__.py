@@ -0,0 +1,5 @@
+import sys
+
+from benchmarks.suite import main_cli
+
+sys.exit(main_cli())
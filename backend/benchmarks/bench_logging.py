@@ -0,0 +1,86 @@
+"""
+Auth olay log'u microbenchmark'ı: print() vs senkron JSON log vs kuyruklu JSON log
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.bench_logging --events 50000 --threads 8
+
+Her varyant aynı olayı (login.failed + 3 alan) birden fazla thread'den yazar ve istek
+thread'inde harcanan çağrı başına süreyi ölçer. Çıktı gerçek bir dosyaya gider (stdout'un
+terminal hızı ölçümü bozmasın diye). Kuyruklu varyantta yazma arka plan thread'indedir;
+kuyruk dolarsa kayıtlar düşürülür ve "dropped" sütununda görünür.
+"""
+import argparse
+import json
+import logging
+import tempfile
+import threading
+import time
+
+from app.core.eventlog import EventLogger, JSONFormatter, LoggingPipeline
+
+
+def run_threads(emit, events: int, threads: int) -> float:
+    per_thread = events // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for i in range(per_thread):
+            emit(i)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return elapsed / (per_thread * threads) * 1e6  # µs / çağrı
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'variant':<16} {'us/call':>10} {'dropped':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        # 1. Eski yol: her olay için senkron print()
+        with open(f"{directory}/print.log", "w") as handle:
+            def emit_print(i):
+                print(json.dumps({"event": "login.failed", "reason": "bad_password", "user_id": i}), file=handle)
+            per_call = run_threads(emit_print, args.events, args.threads)
+        print(f"{'print':<16} {per_call:>10.2f} {0:>10}")
+
+        # 2. Senkron JSON log: formatlama + yazma istek thread'inde
+        with open(f"{directory}/sync.log", "w") as handle:
+            handler = logging.StreamHandler(handle)
+            handler.setFormatter(JSONFormatter())
+            logger = logging.getLogger("bench.sync")
+            logger.setLevel(logging.INFO)
+            logger.addHandler(handler)
+            logger.propagate = False
+            log = EventLogger("bench.sync")
+            per_call = run_threads(
+                lambda i: log.info("login.failed", reason="bad_password", user_id=i), args.events, args.threads
+            )
+        print(f"{'sync json':<16} {per_call:>10.2f} {0:>10}")
+
+        # 3. Kuyruklu JSON log (app/core/eventlog.py)
+        with open(f"{directory}/queued.log", "w") as handle:
+            pipeline = LoggingPipeline(stream=handle, queue_size=args.queue_size)
+            pipeline.install("bench.queued")
+            log = EventLogger("bench.queued.auth")
+            per_call = run_threads(
+                lambda i: log.info("login.failed", reason="bad_password", user_id=i), args.events, args.threads
+            )
+            pipeline.stop()
+            stats = pipeline.stats()
+        print(f"{'queued json':<16} {per_call:>10.2f} {stats['dropped_queue_full']:>10}")
+
+
+if __name__ == "__main__":
+    main_cli()
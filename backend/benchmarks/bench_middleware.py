@@ -0,0 +1,93 @@
+"""
+SecurityHeadersMiddleware benchmark: BaseHTTPMiddleware (eski) vs pure ASGI (yeni)
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.bench_middleware --requests 2000 --concurrency 20
+
+/auth/login kayıtlı olmayan bir kullanıcı ile çağrılır: bcrypt çalışmadan 401 döner,
+böylece ölçülen fark hash maliyeti değil framework + middleware maliyeti olur.
+Rate limiter ölçüm süresince kapatılır.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+import main
+from app.auth.router import limiter
+
+
+# Ölçüm için eski (BaseHTTPMiddleware) sürümün birebir kopyası
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        del response.headers["server"]
+        return response
+
+
+def build_app(middleware_class) -> FastAPI:
+    # main.app'in route'ları ve exception handler'ları, sadece header middleware'i farklı
+    app = FastAPI()
+    app.router = main.app.router
+    app.state.limiter = limiter
+    app.exception_handlers.update(main.app.exception_handlers)
+    app.add_middleware(middleware_class)
+    return app
+
+
+async def measure(app, method: str, path: str, total: int, concurrency: int, **request_kwargs) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Isınma
+        for _ in range(20):
+            await client.request(method, path, **request_kwargs)
+
+        per_worker = total // concurrency
+
+        async def worker():
+            for _ in range(per_worker):
+                await client.request(method, path, **request_kwargs)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return per_worker * concurrency / elapsed
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    limiter.enabled = False
+    scenarios = [
+        ("GET /health", "GET", "/health", {}),
+        ("POST /auth/login", "POST", "/auth/login",
+         {"data": {"username": "bench-nobody@example.com", "password": "benchmark-password"}}),
+    ]
+    variants = [
+        ("BaseHTTPMiddleware", LegacySecurityHeadersMiddleware),
+        ("pure ASGI", main.SecurityHeadersMiddleware),
+    ]
+
+    print(f"{'endpoint':<20} {'middleware':<20} {'req/s':>10}")
+    for label, method, path, kwargs in scenarios:
+        results = {}
+        for name, middleware_class in variants:
+            app = build_app(middleware_class)
+            results[name] = asyncio.run(measure(app, method, path, args.requests, args.concurrency, **kwargs))
+            print(f"{label:<20} {name:<20} {results[name]:>10.0f}")
+        before, after = results["BaseHTTPMiddleware"], results["pure ASGI"]
+        print(f"{label:<20} {'speedup':<20} {after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,92 @@
+"""
+Parola hash benchmark'ı: bcrypt vs Argon2id (Settings'teki maliyetlerle)
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.bench_password_hash --hashes 64 --concurrency 1 4 8
+
+Her şema ve eşzamanlılık için:
+  - hashes/s/core : toplam throughput / kullanılan çekirdek sayısı (min(concurrency, CPU))
+  - RSS/hash      : ölçüm sırasındaki tepe RSS artışı / eşzamanlı hash sayısı
+
+Argon2 bellek-yoğun (memory-hard) olduğu için HASH_WORKERS, RSS/hash x HASH_WORKERS
+worker başına bellek bütçesine sığacak şekilde seçilmelidir. argon2-cffi kurulu değilse
+Argon2id ölçümü atlanır.
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.hash import argon2
+
+from app.core.security import build_password_context
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def current_rss() -> int:
+    # Linux: /proc/self/statm ikinci alanı = resident sayfa sayısı
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE
+
+
+class PeakRSSSampler:
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = current_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def measure(context, total: int, concurrency: int) -> tuple[float, int]:
+    # bcrypt ve argon2-cffi C tarafında GIL'i bırakır; thread havuzu HashingExecutor ile aynı modeldir
+    context.hash("warmup-password")
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        baseline = current_rss()
+        with PeakRSSSampler() as sampler:
+            started = time.perf_counter()
+            list(pool.map(context.hash, ["benchmark-password"] * total))
+            elapsed = time.perf_counter() - started
+    return total / elapsed, max(0, sampler.peak - baseline)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hashes", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    schemes = ["bcrypt"]
+    if argon2.has_backend():
+        schemes.append("argon2")
+    else:
+        print("argon2-cffi kurulu değil, Argon2id atlanıyor")
+
+    cpus = os.cpu_count() or 1
+    print(f"{'scheme':<8} {'concurrency':>11} {'hashes/s':>10} {'hashes/s/core':>14} {'RSS/hash (MiB)':>15}")
+    for scheme in schemes:
+        context = build_password_context(scheme)
+        for concurrency in args.concurrency:
+            throughput, rss_delta = measure(context, args.hashes, concurrency)
+            per_core = throughput / min(concurrency, cpus)
+            rss_per_hash = rss_delta / concurrency / (1024 * 1024)
+            print(f"{scheme:<8} {concurrency:>11} {throughput:>10.1f} {per_core:>14.1f} {rss_per_hash:>15.2f}")
+
+
+if __name__ == "__main__":
+    main_cli()
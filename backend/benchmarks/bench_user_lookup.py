@@ -0,0 +1,73 @@
+"""
+Kullanıcı lookup microbenchmark'ı: ORM (db.query(User).first()) vs Core repository
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.bench_user_lookup --users 10000 --lookups 20000
+
+Geçici bir SQLite veritabanı kurulur ve aynı rastgele email dizisi her iki yolla aranır.
+Ölçülen fark, DB'den bağımsız olarak Python tarafındaki ORM maliyetidir (identity map,
+instrumentation, unit-of-work); Postgres'te ağ gecikmesi ayrıca eklenir.
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.users import repository
+from app.users.models import User
+
+
+def orm_lookup(db, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def measure(session_factory, lookup, emails: list[str]) -> float:
+    with session_factory() as db:
+        for email in emails[:200]:
+            lookup(db, email)
+        started = time.perf_counter()
+        for email in emails:
+            lookup(db, email)
+            # Her istek kendi session'ını kullanır gibi identity map'i temizle
+            db.expunge_all()
+        elapsed = time.perf_counter() - started
+    return len(emails) / elapsed
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/bench.db")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(User.__table__), [
+                {"email": f"user{i}@example.com", "hashed_password": "x" * 60, "is_active": True, "is_2fa_enabled": False}
+                for i in range(args.users)
+            ])
+        session_factory = sessionmaker(bind=engine, autoflush=False)
+        emails = [f"user{random.randrange(args.users)}@example.com" for _ in range(args.lookups)]
+
+        variants = [
+            ("ORM query().first()", orm_lookup),
+            ("Core get_login_record", repository.get_login_record),
+            ("Core get_auth_record", repository.get_auth_record),
+        ]
+        results = {}
+        print(f"{'path':<24} {'lookups/s':>10}")
+        for name, lookup in variants:
+            results[name] = measure(session_factory, lookup, emails)
+            print(f"{name:<24} {results[name]:>10.0f}")
+        print(f"{'speedup (login)':<24} {results['Core get_login_record'] / results['ORM query().first()']:>9.2f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main_cli()
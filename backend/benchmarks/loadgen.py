@@ -0,0 +1,275 @@
+"""
+AuthGuard yük üreticisi (asyncio) - endpoint başına throughput ve gecikme yüzdelikleri
+
+Kullanım (backend/ dizininden):
+    # In-process (ASGI, ağ yok; rate limiter kapatılır):
+    python -m benchmarks.loadgen --users 200 --two-factor-ratio 0.3 --duration 30 --concurrency 32
+
+    # Çalışan bir sunucuya HTTP ile (sunucuda LOGIN_RATE_LIMIT yükseltilmeli, ör. "100000/minute"):
+    python -m benchmarks.loadgen --url http://127.0.0.1:8000 --mix login=40,login_2fa=20,me=35,register=5
+
+Akış:
+  1. N kullanıcı kaydedilir; --two-factor-ratio kadarı için /auth/enable-2fa çağrılır ve
+     secret istemcide saklanır (TOTP kodları istemci tarafında pyotp ile hesaplanır).
+  2. --concurrency kadar sanal istemci, --mix ağırlıklarına göre register / login /
+     login_2fa / me (korunan endpoint) isteklerini --duration saniye boyunca tekrarlar.
+  3. Endpoint başına istek sayısı, hata sayısı, req/s ve p50/p95/p99/p999 raporlanır.
+     Hash kuyruğu dolduğunda sunucunun döndürdüğü 503'ler hata değil "shed" olarak sayılır.
+     Hazırlık --provision-concurrency ile (varsayılan HASH_WORKERS kadar) sınırlıdır; yine de
+     gelen 503'ler Retry-After kadar beklenip en fazla PROVISION_ATTEMPTS kez denenir.
+     In-process modda process CPU süresi de ölçülür: "req/CPU-s" ~ çekirdek başına kapasite.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+import uuid
+
+import httpx
+import pyotp
+
+DEFAULT_MIX = "login=40,login_2fa=20,me=35,register=5"
+PASSWORD = "loadgen-password-123"
+# Hazırlıkta 503 (hash kuyruğu dolu) için deneme sayısı ve Retry-After üst sınırı
+PROVISION_ATTEMPTS = 10
+MAX_RETRY_AFTER_SECONDS = 5.0
+
+
+class LatencyHistogram:
+    # Log-lineer kovalar (~%1 hassasiyet): istek sayısından bağımsız sabit bellek
+    GROWTH = 1.01
+    MIN_SECONDS = 1e-6
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.errors = 0
+        self.shed = 0
+        self.max = 0.0
+
+    def record(self, seconds: float, ok: bool = True, shed: bool = False):
+        index = max(0, int(math.log(max(seconds, self.MIN_SECONDS) / self.MIN_SECONDS, self.GROWTH)))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.max = max(self.max, seconds)
+        if shed:
+            self.shed += 1
+        elif not ok:
+            self.errors += 1
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Kovanın üst sınırı (muhafazakâr tahmin)
+                return min(self.MIN_SECONDS * self.GROWTH ** (index + 1), self.max)
+        return self.max
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("register", "login", "login_2fa", "me"):
+            raise SystemExit(f"Bilinmeyen senaryo: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def make_client(url: str | None) -> httpx.AsyncClient:
+    if url:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        return httpx.AsyncClient(base_url=url, limits=limits, timeout=30)
+
+    import main
+    from app.auth.router import limiter
+
+    # In-process ölçüm tek IP'den gelir; login limiti ölçümü bozmasın
+    limiter.enabled = False
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://loadgen", timeout=30)
+
+
+# --- 1. Kullanıcı hazırlığı ---
+def retry_after_seconds(response: httpx.Response) -> float:
+    try:
+        seconds = float(response.headers.get("Retry-After", 1))
+    except ValueError:
+        seconds = 1.0
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+async def post_with_retry(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    # Sunucunun admission control'ü (hashing.py) yükte 503 + Retry-After döner: hazırlık
+    # bu yüzden durmamalı, sadece tekrar denenen istek sayısı sınırlı
+    for _ in range(PROVISION_ATTEMPTS - 1):
+        response = await client.post(url, **kwargs)
+        if response.status_code != 503:
+            break
+        # Aynı anda reddedilen istemciler aynı anda geri gelmesin
+        await asyncio.sleep(retry_after_seconds(response) * random.uniform(0.5, 1.0))
+    else:
+        response = await client.post(url, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+async def provision_user(client: httpx.AsyncClient, with_2fa: bool) -> dict:
+    email = f"loadgen-{uuid.uuid4().hex[:12]}@example.com"
+    await post_with_retry(client, "/auth/register", json={"email": email, "password": PASSWORD})
+    response = await post_with_retry(client, "/auth/login", data={"username": email, "password": PASSWORD})
+    user = {"email": email, "access_token": response.json()["access_token"], "totp": None}
+    if with_2fa:
+        response = await post_with_retry(
+            client, "/auth/enable-2fa", headers={"Authorization": f"Bearer {user['access_token']}"}
+        )
+        user["totp"] = pyotp.TOTP(response.json()["secret"])
+    return user
+
+
+async def provision(client: httpx.AsyncClient, count: int, two_factor_ratio: float, concurrency: int) -> list[dict]:
+    semaphore = asyncio.Semaphore(concurrency)
+    two_factor_count = round(count * two_factor_ratio)
+
+    async def one(i):
+        async with semaphore:
+            return await provision_user(client, with_2fa=i < two_factor_count)
+
+    return await asyncio.gather(*(one(i) for i in range(count)))
+
+
+# --- 2. Senaryolar ---
+def build_scenarios(client: httpx.AsyncClient, users: list[dict]) -> dict:
+    plain_users = [user for user in users if user["totp"] is None]
+    two_factor_users = [user for user in users if user["totp"] is not None]
+
+    async def register():
+        email = f"loadgen-{uuid.uuid4().hex[:12]}@example.com"
+        return await client.post("/auth/register", json={"email": email, "password": PASSWORD})
+
+    async def login():
+        user = random.choice(plain_users)
+        return await client.post("/auth/login", data={"username": user["email"], "password": PASSWORD})
+
+    async def login_2fa():
+        user = random.choice(two_factor_users)
+        return await client.post("/auth/login", data={
+            "username": user["email"], "password": PASSWORD, "totp_code": user["totp"].now(),
+        })
+
+    async def me():
+        user = random.choice(users)
+        return await client.get("/auth/me", headers={"Authorization": f"Bearer {user['access_token']}"})
+
+    scenarios = {"register": register, "login": login, "me": me}
+    if two_factor_users:
+        scenarios["login_2fa"] = login_2fa
+    if not plain_users:
+        scenarios.pop("login")
+    return scenarios
+
+
+async def run_load(client, scenarios: dict, mix: dict, duration: float, concurrency: int) -> tuple[dict, float]:
+    names = [name for name in mix if name in scenarios]
+    weights = [mix[name] for name in names]
+    histograms = {name: LatencyHistogram() for name in names}
+    deadline = time.perf_counter() + duration
+
+    async def virtual_client():
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights)[0]
+            started = time.perf_counter()
+            shed = False
+            try:
+                response = await scenarios[name]()
+                ok = response.status_code < 400
+                # 503: sunucu yükü bilerek reddetti (Retry-After), hata değil
+                shed = response.status_code == 503
+            except httpx.HTTPError:
+                ok = False
+            histograms[name].record(time.perf_counter() - started, ok, shed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_client() for _ in range(concurrency)))
+    return histograms, time.perf_counter() - started
+
+
+# --- 3. Rapor ---
+def build_report(histograms: dict, elapsed: float, cpu_seconds: float | None) -> dict:
+    report = {"elapsed_seconds": elapsed, "cpu_seconds": cpu_seconds, "endpoints": {}}
+    total = 0
+    for name, histogram in histograms.items():
+        total += histogram.count
+        report["endpoints"][name] = {
+            "requests": histogram.count,
+            "errors": histogram.errors,
+            "shed": histogram.shed,
+            "throughput": histogram.count / elapsed,
+            **{f"p{label}_ms": histogram.percentile(q) * 1000
+               for label, q in (("50", 0.50), ("95", 0.95), ("99", 0.99), ("999", 0.999))},
+            "max_ms": histogram.max * 1000,
+        }
+    report["total_requests"] = total
+    report["total_shed"] = sum(histogram.shed for histogram in histograms.values())
+    report["throughput"] = total / elapsed
+    report["requests_per_cpu_second"] = total / cpu_seconds if cpu_seconds else None
+    return report
+
+
+def print_report(report: dict):
+    print(f"{'endpoint':<10} {'requests':>9} {'errors':>7} {'shed':>7} {'req/s':>9} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'p999 ms':>9} {'max ms':>9}")
+    for name, row in report["endpoints"].items():
+        print(f"{name:<10} {row['requests']:>9} {row['errors']:>7} {row['shed']:>7} {row['throughput']:>9.1f} "
+              f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['p999_ms']:>9.2f} {row['max_ms']:>9.2f}")
+    print(f"toplam: {report['total_requests']} istek ({report['total_shed']} shed / 503), {report['throughput']:.1f} req/s")
+    if report["requests_per_cpu_second"]:
+        print(f"process CPU: {report['cpu_seconds']:.1f} s -> {report['requests_per_cpu_second']:.1f} req/CPU-s")
+
+
+async def main_async(args) -> dict:
+    mix = parse_mix(args.mix)
+    async with make_client(args.url) as client:
+        print(f"{args.users} kullanıcı hazırlanıyor ({args.two_factor_ratio:.0%} 2FA)...")
+        users = await provision(client, args.users, args.two_factor_ratio, args.provision_concurrency)
+        scenarios = build_scenarios(client, users)
+
+        print(f"{args.duration} s yük: concurrency={args.concurrency}, mix={args.mix}")
+        # In-process modda sunucu da bu process'te çalışır: CPU süresi = sunucu + istemci maliyeti
+        cpu_started = time.process_time()
+        histograms, elapsed = await run_load(client, scenarios, mix, args.duration, args.concurrency)
+        cpu_seconds = None if args.url else time.process_time() - cpu_started
+    return build_report(histograms, elapsed, cpu_seconds)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Hedef sunucu (verilmezse in-process ASGI)")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--two-factor-ratio", type=float, default=0.3)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=32)
+    # Hazırlık register + login hash'leri: sunucunun hash havuzunu (HASH_WORKERS) aşmasın
+    parser.add_argument("--provision-concurrency", type=int, default=4)
+    parser.add_argument("--json", dest="json_output", help="Raporu JSON olarak da yaz")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.json_output:
+        directory = os.path.dirname(args.json_output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.json_output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
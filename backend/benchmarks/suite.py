@@ -0,0 +1,259 @@
+"""
+Auth hot path benchmark suite
+
+Kullanım (backend/ dizininden, DATABASE_URL SQLite veya lokal Postgres olabilir):
+    python -m benchmarks run --output results/main.json
+    python -m benchmarks run --output results/branch.json --filter login
+    python -m benchmarks compare results/main.json results/branch.json --threshold 0.10
+
+"run" her benchmark için operasyon başına medyan süreyi ölçer ve JSON'a yazar.
+"compare" iki sonuç dosyasını karşılaştırır; medyan süresi eşikten fazla artanları
+REGRESSION olarak işaretler ve bu durumda 1 ile çıkar (CI'da kullanılabilir).
+
+Micro benchmark'lar: verify_password, create_access_token, JWT decode (cache'siz ve
+cache'li), encrypt_data/decrypt_data, TOTP doğrulama, response serileştirme (FastAPI'nin
+response_model doğrulaması + jsonable_encoder + stdlib json yolu vs trusted_response). ASGI round trip'leri (main.app,
+httpx ASGITransport): /auth/register, /auth/login (2FA'sız ve 2FA'lı). Rate limiter
+ölçüm süresince kapatılır.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pyotp
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from jose import jwt
+from pydantic import TypeAdapter
+
+import main
+from app.auth.router import limiter
+from app.core import security
+from app.core.config import settings
+from app.core.responses import trusted_response
+from app.db.session import engine
+from app.users import schemas
+from app.users.cache import UserAuthRecord
+
+
+def summarize(samples: list[float]) -> dict:
+    # samples: operasyon başına süre (saniye)
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    return {
+        "median_us": median * 1e6,
+        "min_us": ordered[0] * 1e6,
+        "p95_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6,
+        "ops_per_sec": 1 / median if median else 0.0,
+        "samples": len(ordered),
+    }
+
+
+def time_calls(func, number: int, repeat: int) -> dict:
+    func()  # Isınma
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number)
+    return summarize(samples)
+
+
+# --- Micro benchmark'lar ---
+def micro_benchmarks(scale: float) -> dict:
+    password_hash = security.get_password_hash("benchmark-password")
+    access_token = security.create_access_token({"sub": "bench@example.com"})
+    ciphertext = security.encrypt_data("JBSWY3DPEHPK3PXP")
+    verifier = security.TOTPVerifier("JBSWY3DPEHPK3PXP")
+    code = pyotp.TOTP("JBSWY3DPEHPK3PXP").now()
+    tokens = {"access_token": access_token, "refresh_token": uuid.uuid4().hex * 2, "token_type": "bearer"}
+    record = UserAuthRecord(id=42, email="bench@example.com", is_active=True, is_2fa_enabled=False)
+    token_adapter = TypeAdapter(schemas.Token)
+    user_adapter = TypeAdapter(schemas.UserOut)
+
+    def render_validated(adapter, content):
+        # FastAPI'nin response_model yolu: doğrula -> JSON uyumlu dict -> stdlib json
+        value = adapter.validate_python(content, from_attributes=True)
+        return JSONResponse(jsonable_encoder(adapter.dump_python(value, mode="json"))).body
+
+    def n(count):
+        return max(1, int(count * scale))
+
+    # (isim, fonksiyon, number, repeat)
+    return {
+        "verify_password": (lambda: security.verify_password("benchmark-password", password_hash), 1, n(20)),
+        "create_access_token": (
+            lambda: security.create_access_token({"sub": "bench@example.com"}, timedelta(minutes=30)), n(200), 15),
+        "jwt_decode": (
+            lambda: jwt.decode(access_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]), n(200), 15),
+        "decode_token_cached": (lambda: security.decode_token(access_token), n(2000), 15),
+        "encrypt_data": (lambda: security.encrypt_data("JBSWY3DPEHPK3PXP"), n(500), 15),
+        "decrypt_data": (lambda: security.decrypt_data(ciphertext), n(500), 15),
+        "totp_verify": (lambda: verifier.verify(code, valid_window=1), n(1000), 15),
+        "render_token_validated": (lambda: render_validated(token_adapter, tokens), n(1000), 15),
+        "render_token_trusted": (lambda: trusted_response(tokens).body, n(1000), 15),
+        "render_user_validated": (lambda: render_validated(user_adapter, record._asdict()), n(1000), 15),
+        "render_user_trusted": (lambda: trusted_response(record).body, n(1000), 15),
+    }
+
+
+# --- ASGI round trip'leri ---
+async def provision_user(client: httpx.AsyncClient, with_2fa: bool) -> dict:
+    credentials = {"username": f"bench-{uuid.uuid4().hex[:12]}@example.com", "password": "benchmark-password"}
+    await client.post("/auth/register", json={"email": credentials["username"], "password": credentials["password"]})
+    if with_2fa:
+        response = await client.post("/auth/login", data=credentials)
+        token = response.json()["access_token"]
+        response = await client.post("/auth/enable-2fa", headers={"Authorization": f"Bearer {token}"})
+        credentials["totp"] = pyotp.TOTP(response.json()["secret"])
+    return credentials
+
+
+async def time_requests(send, count: int) -> dict:
+    await send()  # Isınma
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = await send()
+        samples.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            raise RuntimeError(f"Benchmark isteği başarısız: {response.status_code} {response.text}")
+    return summarize(samples)
+
+
+async def asgi_benchmarks(scale: float, selected) -> dict:
+    count = max(1, int(20 * scale))
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        plain = await provision_user(client, with_2fa=False)
+        two_factor = await provision_user(client, with_2fa=True)
+
+        async def register():
+            email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+            return await client.post("/auth/register", json={"email": email, "password": "benchmark-password"})
+
+        async def login():
+            return await client.post("/auth/login", data={"username": plain["username"], "password": plain["password"]})
+
+        async def login_2fa():
+            return await client.post("/auth/login", data={
+                "username": two_factor["username"],
+                "password": two_factor["password"],
+                "totp_code": two_factor["totp"].now(),
+            })
+
+        for name, send in (("asgi_register", register), ("asgi_login", login), ("asgi_login_2fa", login_2fa)):
+            if selected(name):
+                results[name] = await time_requests(send, count)
+    return results
+
+
+def run(output: str, scale: float, name_filter: str | None):
+    limiter.enabled = False
+
+    def selected(name):
+        return name_filter is None or name_filter in name
+
+    results = {}
+    for name, (func, number, repeat) in micro_benchmarks(scale).items():
+        if selected(name):
+            results[name] = time_calls(func, number, repeat)
+            print(f"{name:<22} {results[name]['median_us']:>12.1f} us  {results[name]['ops_per_sec']:>10.0f} op/s")
+
+    for name, result in asyncio.run(asgi_benchmarks(scale, selected)).items():
+        results[name] = result
+        print(f"{name:<22} {result['median_us']:>12.1f} us  {result['ops_per_sec']:>10.0f} op/s")
+
+    document = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "database": engine.dialect.name,
+            "password_hash_scheme": settings.PASSWORD_HASH_SCHEME,
+            "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        },
+        "results": results,
+    }
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, "w") as output_file:
+        json.dump(document, output_file, indent=2)
+    print(f"Sonuçlar yazıldı: {output}")
+
+
+def compare_results(baseline: dict, candidate: dict, threshold: float) -> list[dict]:
+    rows = []
+    for name, base in baseline["results"].items():
+        new = candidate["results"].get(name)
+        if new is None:
+            rows.append({"name": name, "status": "MISSING"})
+            continue
+        change = new["median_us"] / base["median_us"] - 1
+        if change > threshold:
+            status = "REGRESSION"
+        elif change < -threshold:
+            status = "IMPROVED"
+        else:
+            status = "ok"
+        rows.append({"name": name, "base_us": base["median_us"], "new_us": new["median_us"],
+                     "change": change, "status": status})
+    return rows
+
+
+def compare(baseline_path: str, candidate_path: str, threshold: float) -> int:
+    with open(baseline_path) as baseline_file, open(candidate_path) as candidate_file:
+        baseline, candidate = json.load(baseline_file), json.load(candidate_file)
+
+    # Farklı hash maliyeti / veritabanı ile alınmış sonuçlar karşılaştırılabilir değildir
+    for key in ("database", "password_hash_scheme", "bcrypt_rounds"):
+        if baseline["meta"].get(key) != candidate["meta"].get(key):
+            print(f"UYARI: {key} farklı ({baseline['meta'].get(key)} -> {candidate['meta'].get(key)})")
+
+    rows = compare_results(baseline, candidate, threshold)
+    print(f"{'benchmark':<22} {'base (us)':>12} {'new (us)':>12} {'change':>9}  status")
+    for row in rows:
+        if row["status"] == "MISSING":
+            print(f"{row['name']:<22} {'':>12} {'':>12} {'':>9}  MISSING")
+            continue
+        print(f"{row['name']:<22} {row['base_us']:>12.1f} {row['new_us']:>12.1f} {row['change']:>+8.1%}  {row['status']}")
+    return 1 if any(row["status"] == "REGRESSION" for row in rows) else 0
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Benchmark'ları çalıştır ve JSON'a yaz")
+    run_parser.add_argument("--output", default="benchmark-results.json")
+    run_parser.add_argument("--scale", type=float, default=1.0, help="Tekrar sayısı çarpanı (hızlı deneme için < 1)")
+    run_parser.add_argument("--filter", dest="name_filter", help="Sadece adı bu metni içeren benchmark'lar")
+
+    compare_parser = commands.add_parser("compare", help="İki sonuç dosyasını karşılaştır")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Regresyon eşiği (0.10 = %%10)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(args.output, args.scale, args.name_filter)
+        return 0
+    return compare(args.baseline, args.candidate, args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,71 @@
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.hash import bcrypt
+
+# Performans + Güvenlik: bcrypt maliyet kalibrasyonu.
+# Deploy host'unda her maliyet için hash süresini ölçer ve p99'u hedef login bütçesine
+# sığan EN YÜKSEK maliyeti önerir. Ölçüm HASH_WORKERS kadar eşzamanlı hash ile yapılır,
+# çünkü yük altında çekirdekler paylaşıldığı için tek başına ölçüm iyimser kalır.
+#
+# Kullanım: python -m calibrate_hashing --target-p99-ms 250 --concurrency 4
+# Çıktıdaki BCRYPT_ROUNDS değeri .env'e yazılır; eski hash'ler login'de taşınır.
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(rounds: int, samples: int, concurrency: int) -> list[float]:
+    handler = bcrypt.using(rounds=rounds)
+
+    def timed_hash(_):
+        start = time.perf_counter()
+        handler.hash("calibration-password")
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(timed_hash, range(samples)))
+
+
+def calibrate(target_p99_ms: float, min_rounds: int, max_rounds: int, samples: int, concurrency: int):
+    results = []
+    for rounds in range(min_rounds, max_rounds + 1):
+        timings = measure(rounds, samples, concurrency)
+        p99 = percentile(timings, 0.99)
+        results.append({"rounds": rounds, "p50_ms": statistics.median(timings), "p99_ms": p99})
+        # Maliyet +1 -> süre ~2x; bütçe aşıldıysa üst maliyetleri ölçmeye gerek yok
+        if p99 > target_p99_ms:
+            break
+
+    fitting = [result["rounds"] for result in results if result["p99_ms"] <= target_p99_ms]
+    return (max(fitting) if fitting else None), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt maliyetini hedef p99 login bütçesine göre kalibre eder")
+    parser.add_argument("--target-p99-ms", type=float, default=250)
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4, help="Genelde HASH_WORKERS ile aynı")
+    args = parser.parse_args()
+
+    recommended, results = calibrate(
+        args.target_p99_ms, args.min_rounds, args.max_rounds, args.samples, args.concurrency
+    )
+    for result in results:
+        print(f"rounds={result['rounds']:>2}  p50={result['p50_ms']:8.1f} ms  p99={result['p99_ms']:8.1f} ms")
+
+    if recommended is None:
+        print(f"Hiçbir maliyet {args.target_p99_ms} ms p99 bütçesine sığmadı (min_rounds={args.min_rounds}).")
+        raise SystemExit(1)
+    print(f"BCRYPT_ROUNDS={recommended}")
+
+
+if __name__ == "__main__":
+    main()
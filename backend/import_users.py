@@ -0,0 +1,233 @@
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pydantic import ValidationError
+from sqlalchemy import create_engine, insert
+from sqlalchemy.dialects import sqlite
+
+from app.core import security
+from app.core.config import settings
+from app.users.models import User
+from app.users.schemas import UserCreate
+
+# Performans: Toplu kullanıcı aktarımı (tenant onboarding). POST /auth/register ile tek tek
+# kayıt yerine:
+#   - Dosya satır satır okunur (CSV veya JSONL), bellek kullanımı batch boyutuyla sınırlıdır.
+#   - Parolalar process havuzunda hash'lenir (bcrypt CPU-bound, GIL yok); bir sonraki batch
+#     hash'lenirken önceki batch veritabanına yazılır.
+#   - Opsiyonel TOTP secret'ları security.encrypt_data ile şifrelenir (Encryption at Rest).
+#   - Postgres'te COPY ile geçici tabloya, oradan INSERT ... ON CONFLICT DO NOTHING ile users'a;
+#     diğer veritabanlarında executemany. Zaten kayıtlı email'ler atlanır.
+#   - Her batch commit'inden sonra checkpoint yazılır; yarıda kalan iş kaldığı yerden devam eder.
+#     Aktarım idempotent olduğu için commit ile checkpoint arasında kesilmek satır çoğaltmaz.
+#
+# Girdi alanları: email, password, totp_secret (opsiyonel, base32 düz metin)
+# Kullanım: python -m import_users users.csv --batch-size 1000 --workers 8
+
+_users = User.__table__
+_COLUMNS = ("email", "hashed_password", "is_active", "is_2fa_enabled", "totp_secret")
+
+
+def read_rows(path: str, fmt: str):
+    # (satır no, dict) üretir; dosya bir kerede belleğe alınmaz
+    with open(path, newline="", encoding="utf-8") as source:
+        if fmt == "csv":
+            for line_number, row in enumerate(csv.DictReader(source), start=1):
+                yield line_number, row
+        else:
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as exc:
+                    # Bozuk satır tüm aktarımı durdurmaz; validate() geçersiz sayar
+                    yield line_number, f"geçersiz JSON: {exc.msg}"
+
+
+def validate(line_number: int, row):
+    # Register endpoint'iyle aynı kurallar (email formatı, min. parola uzunluğu)
+    if not isinstance(row, dict):
+        return _skip(line_number, row if isinstance(row, str) else "satır bir JSON nesnesi değil")
+    try:
+        user = UserCreate(email=row.get("email"), password=row.get("password") or "")
+    except ValidationError as exc:
+        return _skip(line_number, exc.errors()[0]["msg"])
+    totp_secret = str(row["totp_secret"]) if row.get("totp_secret") else None
+    if totp_secret is not None:
+        # Login'deki çözümlemeyle aynı: burada geçmeyen secret'la kullanıcı giriş yapamaz
+        try:
+            security.TOTPVerifier(totp_secret)
+        except ValueError:
+            return _skip(line_number, "totp_secret geçerli base32 değil")
+    return user.email, user.password, totp_secret
+
+
+def _skip(line_number: int, reason: str):
+    print(f"satır {line_number}: atlandı ({reason})", file=sys.stderr)
+    return None
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    # Process havuzunda çalışır
+    return [security.get_password_hash(password) for password in passwords]
+
+
+def submit_batch(pool: ProcessPoolExecutor, users: list[tuple], workers: int):
+    passwords = [password for _, password, _ in users]
+    chunk_size = max(1, -(-len(passwords) // workers))
+    return [pool.submit(hash_passwords, passwords[i:i + chunk_size]) for i in range(0, len(passwords), chunk_size)]
+
+
+def build_records(users: list[tuple], futures) -> list[dict]:
+    hashes = list(itertools.chain.from_iterable(future.result() for future in futures))
+    return [
+        {
+            "email": email,
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "is_2fa_enabled": totp_secret is not None,
+            "totp_secret": security.encrypt_data(totp_secret) if totp_secret else None,
+        }
+        for (email, _, totp_secret), hashed_password in zip(users, hashes)
+    ]
+
+
+class PostgresCopyLoader:
+    def __init__(self, engine):
+        self.connection = engine.raw_connection()
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TEMP TABLE import_users_staging "
+                "(email text, hashed_password text, is_active boolean, is_2fa_enabled boolean, totp_secret text) "
+                "ON COMMIT DELETE ROWS"
+            )
+        self.connection.commit()
+
+    def load(self, records: list[dict]) -> int:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            # CSV COPY'de tırnaksız boş alan NULL'dır
+            writer.writerow([record[column] if record[column] is not None else "" for column in _COLUMNS])
+        buffer.seek(0)
+
+        columns = ", ".join(_COLUMNS)
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY import_users_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            cursor.execute(
+                f"INSERT INTO users ({columns}) SELECT {columns} FROM import_users_staging "
+                "ON CONFLICT (email) DO NOTHING"
+            )
+            inserted = cursor.rowcount
+        self.connection.commit()
+        return inserted
+
+    def close(self):
+        self.connection.close()
+
+
+class ExecutemanyLoader:
+    def __init__(self, engine):
+        self.engine = engine
+        if engine.dialect.name == "sqlite":
+            self.statement = sqlite.insert(_users).on_conflict_do_nothing(index_elements=[_users.c.email])
+        else:
+            self.statement = insert(_users)
+
+    def load(self, records: list[dict]) -> int:
+        with self.engine.begin() as conn:
+            return conn.execute(self.statement, records).rowcount
+
+    def close(self):
+        pass
+
+
+def load_checkpoint(path: str, input_path: str) -> dict:
+    if not os.path.exists(path):
+        return {"input": os.path.abspath(input_path), "rows_done": 0, "inserted": 0, "invalid": 0}
+    with open(path) as checkpoint_file:
+        checkpoint = json.load(checkpoint_file)
+    if checkpoint["input"] != os.path.abspath(input_path):
+        raise SystemExit(f"Checkpoint {path} başka bir dosyaya ait: {checkpoint['input']}")
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    # Atomik yazım: yarım kalmış checkpoint dosyası oluşmaz
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+    os.replace(temporary, path)
+
+
+def run_import(input_path: str, fmt: str, database_url: str, batch_size: int, workers: int,
+               checkpoint_path: str, report=print) -> dict:
+    checkpoint = load_checkpoint(checkpoint_path, input_path)
+    rows = itertools.islice(read_rows(input_path, fmt), checkpoint["rows_done"], None)
+
+    engine = create_engine(database_url)
+    loader = PostgresCopyLoader(engine) if engine.dialect.name == "postgresql" else ExecutemanyLoader(engine)
+    started = time.perf_counter()
+    processed = 0
+
+    def next_batch():
+        batch = list(itertools.islice(rows, batch_size))
+        users = [user for user in (validate(*row) for row in batch) if user is not None]
+        return len(batch), users
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            row_count, users = next_batch()
+            futures = submit_batch(pool, users, workers)
+            while row_count:
+                records = build_records(users, futures)
+                # Pipeline: bu batch yazılırken bir sonraki hash'lenir
+                next_row_count, next_users = next_batch()
+                next_futures = submit_batch(pool, next_users, workers)
+
+                inserted = loader.load(records) if records else 0
+                processed += row_count
+                checkpoint["rows_done"] += row_count
+                checkpoint["inserted"] += max(inserted, 0)
+                checkpoint["invalid"] += row_count - len(users)
+                save_checkpoint(checkpoint_path, checkpoint)
+
+                elapsed = time.perf_counter() - started
+                report(f"{checkpoint['rows_done']} satır ({checkpoint['inserted']} eklendi, "
+                       f"{checkpoint['invalid']} geçersiz) - {processed / elapsed:.0f} satır/s")
+                row_count, users, futures = next_row_count, next_users, next_futures
+    finally:
+        loader.close()
+        engine.dispose()
+    return checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV/JSONL dosyasından toplu kullanıcı aktarımı")
+    parser.add_argument("input")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Varsayılan: dosya uzantısı")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", help="Varsayılan: <input>.checkpoint")
+    args = parser.parse_args()
+
+    fmt = args.format or ("jsonl" if args.input.endswith((".jsonl", ".ndjson")) else "csv")
+    checkpoint = run_import(
+        args.input, fmt, args.database_url, args.batch_size, args.workers,
+        args.checkpoint or f"{args.input}.checkpoint",
+    )
+    print(f"Tamamlandı: {checkpoint['rows_done']} satır, {checkpoint['inserted']} kullanıcı eklendi, "
+          f"{checkpoint['invalid']} geçersiz satır")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import asyncio
+
+import pyotp
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.auth import async_router
+from app.auth.router import limiter
+from app.db.session import Base, get_async_db, get_async_database_url
+from app.users.cache import user_cache
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_async_engine(get_async_database_url(f"sqlite:///{tmp_path}/async.db"))
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(async_router.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    limiter.reset()
+    user_cache.clear()
+
+    yield TestClient(app)
+
+    asyncio.run(engine.dispose())
+
+# 1. URL dönüşümü (sync -> async driver)
+def test_async_database_url():
+    assert get_async_database_url("postgresql://u:p@db/auth") == "postgresql+asyncpg://u:p@db/auth"
+    assert get_async_database_url("postgresql+psycopg2://u:p@db/auth") == "postgresql+asyncpg://u:p@db/auth"
+    assert get_async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+
+# 2. Register -> Login -> Enable 2FA -> 2FA Login (async yol)
+def test_async_register_login_and_2fa(client):
+    credentials = {"username": "async@example.com", "password": "securePassword123!"}
+
+    response = client.post("/auth/register", json={"email": credentials["username"], "password": credentials["password"]})
+    assert response.status_code == 200
+    assert response.json()["is_2fa_enabled"] is False
+
+    response = client.post("/auth/register", json={"email": credentials["username"], "password": credentials["password"]})
+    assert response.status_code == 400
+
+    response = client.post("/auth/login", data=credentials)
+    assert response.status_code == 200
+    token = response.json()["access_token"]
+
+    response = client.post("/auth/enable-2fa", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    secret = response.json()["secret"]
+
+    response = client.post("/auth/login", data=credentials)
+    assert response.status_code == 403
+
+    response = client.post("/auth/login", data={**credentials, "totp_code": pyotp.TOTP(secret).now()})
+    assert response.status_code == 200
+
+    response = client.post("/auth/refresh", json={"refresh_token": response.json()["refresh_token"]})
+    assert response.status_code == 200
@@ -0,0 +1,73 @@
+import asyncio
+
+import httpx
+
+from benchmarks import loadgen
+from benchmarks.loadgen import LatencyHistogram, parse_mix
+from benchmarks.suite import compare_results, summarize
+
+# 1. Regresyon karşılaştırması: eşik üstü yavaşlama işaretlenir
+def test_compare_results_flags_regressions():
+    baseline = {"results": {
+        "jwt_decode": {"median_us": 40.0},
+        "asgi_login": {"median_us": 8000.0},
+        "totp_verify": {"median_us": 6.0},
+        "encrypt_data": {"median_us": 35.0},
+    }}
+    candidate = {"results": {
+        "jwt_decode": {"median_us": 41.0},
+        "asgi_login": {"median_us": 9600.0},
+        "totp_verify": {"median_us": 3.0},
+    }}
+
+    statuses = {row["name"]: row["status"] for row in compare_results(baseline, candidate, threshold=0.10)}
+    assert statuses == {"jwt_decode": "ok", "asgi_login": "REGRESSION", "totp_verify": "IMPROVED", "encrypt_data": "MISSING"}
+
+# 2. Özet istatistikler mikro saniye cinsinden
+def test_summarize():
+    result = summarize([0.001, 0.002, 0.003])
+    assert result["median_us"] == 2000.0
+    assert result["min_us"] == 1000.0
+    assert result["ops_per_sec"] == 500.0
+
+# 3. Yük üreticisi histogramı: yüzdelikler ~%1 hassasiyetle
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000, ok=ms != 1000)
+
+    assert histogram.count == 1000 and histogram.errors == 1
+    assert abs(histogram.percentile(0.50) - 0.500) / 0.500 < 0.02
+    assert abs(histogram.percentile(0.99) - 0.990) / 0.990 < 0.02
+    assert histogram.percentile(0.999) <= histogram.max == 1.0
+    assert parse_mix("login=3,me=1") == {"login": 3.0, "me": 1.0}
+
+# 4. Yük üreticisi: 503 hata değil shed sayılır, hazırlık Retry-After ile tekrar dener
+def test_loadgen_retries_and_counts_shed_requests(monkeypatch):
+    histogram = LatencyHistogram()
+    histogram.record(0.01, ok=False, shed=True)
+    histogram.record(0.01, ok=False)
+    assert (histogram.shed, histogram.errors) == (1, 1)
+
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if len(calls) < 3:
+            return httpx.Response(503, headers={"Retry-After": "1"})
+        return httpx.Response(200, json={"ok": True})
+
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(loadgen.asyncio, "sleep", fake_sleep)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test") as client:
+            return await loadgen.post_with_retry(client, "/auth/register", json={})
+
+    assert asyncio.run(scenario()).status_code == 200
+    assert len(calls) == 3 and len(sleeps) == 2
+    assert all(0.5 <= seconds <= 1.0 for seconds in sleeps)
@@ -0,0 +1,34 @@
+import time
+
+import pytest
+from app.core.cache import TTLCache
+from app.users.cache import UserAuthRecord
+
+# 1. LRU: en eski kullanılan kayıt atılmalı
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+# 2. TTL: süresi dolan kayıt miss sayılmalı
+def test_cache_expires_entries():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("token", {"sub": "x"}, ttl_seconds=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("token") is None
+    assert cache.stats()["misses"] == 1
+    assert len(cache) == 0
+
+# 3. Kullanıcı kaydı immutable olmalı
+def test_user_auth_record_is_immutable():
+    record = UserAuthRecord(id=1, email="a@example.com", is_active=True, is_2fa_enabled=False)
+    with pytest.raises(AttributeError):
+        record.is_2fa_enabled = True
@@ -0,0 +1,59 @@
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.db.pool import InstrumentedQueuePool, PoolWaitHistogram, pool_stats
+
+# 1. Histogram kümülatif kovaları
+def test_wait_histogram_buckets():
+    histogram = PoolWaitHistogram(buckets_ms=(1, 10))
+    histogram.observe(0.0005)
+    histogram.observe(0.005)
+    histogram.observe(0.5)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets_ms"] == {"1": 1, "10": 2, "+Inf": 3}
+    assert snapshot["count"] == 3
+
+# 2. Havuz doluyken checkout zaman aşımı sayılmalı
+def test_pool_stats_track_checkout_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert pool_stats(engine)["checked_out"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["checkout_wait"]["count"] == 1
+    assert stats["checkout_wait"]["timeouts"] == 1
+    engine.dispose()
+
+# 3. Yeni bağlantı açma ve pre_ping kuyruk beklemesi sayılmaz
+def test_checkout_wait_excludes_connection_setup(tmp_path):
+    def slow_connect():
+        time.sleep(0.2)
+        return sqlite3.connect(tmp_path / "slow.db")
+
+    engine = create_engine(
+        "sqlite://", creator=slow_connect, poolclass=InstrumentedQueuePool,
+        pool_size=1, max_overflow=0, pool_pre_ping=True,
+    )
+    for _ in range(2):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    wait = pool_stats(engine)["checkout_wait"]
+    assert wait["count"] == 2
+    assert wait["sum_ms"] < 50
+    engine.dispose()
@@ -0,0 +1,67 @@
+import io
+import json
+import logging
+
+from app.core.eventlog import EventLogger, LoggingPipeline
+
+def make_pipeline(name: str, **options):
+    stream = io.StringIO()
+    pipeline = LoggingPipeline(stream=stream, **options)
+    pipeline.install(name)
+    return pipeline, stream, EventLogger(f"{name}.auth")
+
+def read_events(stream) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+# 1. Kayıtlar arka plan thread'inden JSON olarak yazılmalı
+def test_events_are_written_as_json():
+    pipeline, stream, log = make_pipeline("test-json")
+    log.info("login.failed", reason="bad_password", user_id=7)
+    pipeline.stop()
+
+    [event] = read_events(stream)
+    assert event["event"] == "login.failed"
+    assert event["reason"] == "bad_password"
+    assert event["user_id"] == 7
+    assert event["level"] == "INFO"
+
+# 2. Örnekleme ve saniye başına üst sınır
+def test_sampling_and_rate_cap():
+    pipeline, stream, log = make_pipeline(
+        "test-sampling", sample_rates={"login.succeeded": 0.25}, rate_cap_per_second=3
+    )
+    for _ in range(8):
+        log.info("login.succeeded")
+    for _ in range(10):
+        log.warning("2fa.failed")
+    pipeline.stop()
+
+    events = [event["event"] for event in read_events(stream)]
+    assert events.count("login.succeeded") == 2
+    assert events.count("2fa.failed") == 3
+    stats = pipeline.stats()
+    assert stats["sampled_out"]["login.succeeded"] == 6
+    assert stats["rate_limited"]["2fa.failed"] == 7
+
+# 2b. 1/rate tam sayı değilse de oran korunmalı (0.75 -> 4 kayıttan 3'ü)
+def test_sampling_keeps_fractional_rate():
+    pipeline, stream, log = make_pipeline("test-sampling-fraction", sample_rates={"login.succeeded": 0.75})
+    for _ in range(100):
+        log.info("login.succeeded")
+    pipeline.stop()
+
+    assert len(read_events(stream)) == 75
+    assert pipeline.stats()["sampled_out"]["login.succeeded"] == 25
+
+# 3. Kuyruk doluysa kayıt düşürülmeli, çağıran beklememeli
+def test_full_queue_drops_instead_of_blocking():
+    pipeline = LoggingPipeline(stream=io.StringIO(), queue_size=2)
+    logger = logging.getLogger("test-full-queue")
+    logger.addHandler(pipeline.handler)  # listener başlatılmadı, kuyruk boşalmaz
+    logger.propagate = False
+    log = EventLogger("test-full-queue")
+    for _ in range(5):
+        log.warning("login.failed")
+
+    assert pipeline.stats()["enqueued"] == 2
+    assert pipeline.stats()["dropped_queue_full"] == 3
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+from app.core.hashing import HashingExecutor, HashingOverloaded
+from calibrate_hashing import calibrate
+
+# 1. Kuyruk doluyken yeni iş reddedilmeli (Load shedding)
+def test_executor_sheds_load_when_queue_full():
+    executor = HashingExecutor(max_workers=1, max_queue=0, latency_budget_ms=1000)
+    release = threading.Event()
+    try:
+        blocked = executor.submit(release.wait)
+
+        with pytest.raises(HashingOverloaded) as exc_info:
+            executor.submit(lambda: None)
+        assert exc_info.value.retry_after >= 1
+
+        release.set()
+        blocked.result()
+        assert executor.run(lambda x: x * 2, 21) == 42
+    finally:
+        release.set()
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["in_flight"] == 0
+
+# 2. Async yol aynı havuzu kullanmalı
+def test_executor_async_run():
+    value = "securePassword123!"
+    executor = HashingExecutor(max_workers=2, max_queue=4, latency_budget_ms=1000)
+    try:
+        assert asyncio.run(executor.arun(str.upper, value)) == value.upper()
+    finally:
+        executor.shutdown()
+
+# 3. Kalibrasyon: bütçeye sığan en yüksek maliyet önerilir
+def test_calibrate_picks_highest_cost_within_budget():
+    recommended, results = calibrate(target_p99_ms=10_000, min_rounds=4, max_rounds=5, samples=4, concurrency=2)
+    assert recommended == 5
+    assert [result["rounds"] for result in results] == [4, 5]
+
+    recommended, _ = calibrate(target_p99_ms=0, min_rounds=4, max_rounds=5, samples=2, concurrency=1)
+    assert recommended is None
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.core.security import decrypt_data, verify_password
+from app.db.session import Base
+from app.users.models import User
+from import_users import run_import
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path}/import.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return url
+
+
+def imported_users(database_url):
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        rows = conn.execute(select(User.email, User.hashed_password, User.is_2fa_enabled, User.totp_secret)).all()
+    engine.dispose()
+    return {row.email: row for row in rows}
+
+# 1. CSV: parolalar hash'lenir, TOTP secret şifrelenir, geçersiz satır atlanır
+def test_import_csv(tmp_path, database_url):
+    source = tmp_path / "users.csv"
+    source.write_text(
+        "email,password,totp_secret\n"
+        "a@example.com,passwordA123,\n"
+        "b@example.com,passwordB123,JBSWY3DPEHPK3PXP\n"
+        "not-an-email,passwordC123,\n"
+    )
+
+    checkpoint = run_import(str(source), "csv", database_url, batch_size=2, workers=1,
+                            checkpoint_path=str(tmp_path / "ckpt"), report=lambda _: None)
+    assert (checkpoint["rows_done"], checkpoint["inserted"], checkpoint["invalid"]) == (3, 2, 1)
+
+    users = imported_users(database_url)
+    assert verify_password("passwordA123", users["a@example.com"].hashed_password)
+    assert users["a@example.com"].is_2fa_enabled is False
+    assert decrypt_data(users["b@example.com"].totp_secret) == "JBSWY3DPEHPK3PXP"
+    assert users["b@example.com"].is_2fa_enabled is True
+
+# 2. JSONL + checkpoint: tamamlanan satırlar tekrar işlenmez
+def test_import_jsonl_resumes_from_checkpoint(tmp_path, database_url):
+    source = tmp_path / "users.jsonl"
+    source.write_text("\n".join(json.dumps({"email": f"u{i}@example.com", "password": "password123"}) for i in range(3)))
+    checkpoint_path = tmp_path / "ckpt"
+    checkpoint_path.write_text(json.dumps({"input": str(source), "rows_done": 1, "inserted": 1, "invalid": 0}))
+
+    checkpoint = run_import(str(source), "jsonl", database_url, batch_size=10, workers=1,
+                            checkpoint_path=str(checkpoint_path), report=lambda _: None)
+    assert (checkpoint["rows_done"], checkpoint["inserted"]) == (3, 3)
+    assert set(imported_users(database_url)) == {"u1@example.com", "u2@example.com"}
+
+# 3. Bozuk JSON satırı ve base32 olmayan TOTP secret'ı geçersiz sayılır, aktarım sürer
+def test_import_skips_malformed_json_and_bad_totp_secret(tmp_path, database_url, capsys):
+    source = tmp_path / "users.jsonl"
+    source.write_text("\n".join([
+        json.dumps({"email": "a@example.com", "password": "password123"}),
+        '{"email": "b@example.com", "password": ',
+        json.dumps({"email": "c@example.com", "password": "password123", "totp_secret": "not base32!"}),
+        json.dumps(["d@example.com", "password123"]),
+        json.dumps({"email": "e@example.com", "password": "password123", "totp_secret": "JBSWY3DPEHPK3PXP"}),
+    ]))
+
+    checkpoint = run_import(str(source), "jsonl", database_url, batch_size=2, workers=1,
+                            checkpoint_path=str(tmp_path / "ckpt"), report=lambda _: None)
+    assert (checkpoint["rows_done"], checkpoint["inserted"], checkpoint["invalid"]) == (5, 2, 3)
+    assert set(imported_users(database_url)) == {"a@example.com", "e@example.com"}
+
+    errors = capsys.readouterr().err
+    assert "satır 2: atlandı (geçersiz JSON" in errors
+    assert "satır 3: atlandı (totp_secret geçerli base32 değil)" in errors
@@ -1,6 +1,10 @@
 import pytest
 from fastapi.testclient import TestClient
 from main import app
+from app.auth.router import limiter
+from app.core.security import encrypt_data, generate_totp_secret, pwd_context
+from app.db.session import SessionLocal
+from app.users.models import User
 
 client = TestClient(app)
 
@@ -17,3 +21,90 @@ def test_rate_limiting_trigger():
     # Not: Login endpoint'i olmadığı için mantığı simüle ediyoruz.
     # Gerçek entegrasyonda "/auth/login" adresine 6 kere istek atılır.
     pass
+
+def test_db_pool_stats():
+    response = client.get("/health/db-pool")
+    assert response.status_code == 200
+    assert "checked_out" in response.json()["sync"]
+
+def test_security_headers():
+    response = client.get("/health")
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert response.headers["Strict-Transport-Security"] == "max-age=31536000; includeSubDomains"
+    assert "server" not in response.headers
+
+def test_login_rehashes_outdated_password_hash():
+    limiter.reset()
+    credentials = {"username": "rehash@example.com", "password": "securePassword123!"}
+    client.post("/auth/register", json={"email": credentials["username"], "password": credentials["password"]})
+
+    # Eski (düşük) maliyetle üretilmiş hash'i simüle et
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.email == credentials["username"]).one()
+        user.hashed_password = pwd_context.handler().using(rounds=4).hash(credentials["password"])
+        db.commit()
+
+    response = client.post("/auth/login", data=credentials)
+    assert response.status_code == 200
+
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.email == credentials["username"]).one()
+        assert not pwd_context.needs_update(user.hashed_password)
+
+def test_login_rejects_non_ascii_totp_code():
+    limiter.reset()
+    credentials = {"username": "totp-unicode@example.com", "password": "securePassword123!"}
+    client.post("/auth/register", json={"email": credentials["username"], "password": credentials["password"]})
+
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.email == credentials["username"]).one()
+        user.totp_secret = encrypt_data(generate_totp_secret())
+        user.is_2fa_enabled = True
+        db.commit()
+
+    # compare_digest ASCII olmayan str'de TypeError verirdi (500)
+    response = client.post("/auth/login", data={**credentials, "totp_code": "12345é"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid 2FA code"
+
+def test_login_verifies_totp_off_the_event_loop(monkeypatch):
+    import asyncio
+    import pyotp
+    from app.core import security
+
+    limiter.reset()
+    secret = generate_totp_secret()
+    credentials = {"username": "totp-thread@example.com", "password": "securePassword123!"}
+    client.post("/auth/register", json={"email": credentials["username"], "password": credentials["password"]})
+
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.email == credentials["username"]).one()
+        user.totp_secret = encrypt_data(secret)
+        user.is_2fa_enabled = True
+        db.commit()
+
+    on_loop = []
+    get_verifier = security.get_totp_verifier
+
+    def recording_get_verifier(*args):
+        # Threadpool'da çalışan kodda running loop yoktur
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return get_verifier(*args)
+
+    monkeypatch.setattr(security, "get_totp_verifier", recording_get_verifier)
+    response = client.post("/auth/login", data={**credentials, "totp_code": pyotp.TOTP(secret).now()})
+    assert response.status_code == 200
+    assert on_loop == [False]
+
+def test_metrics_endpoint_exports_request_histogram():
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'authguard_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    assert "authguard_db_pool_connections" in response.text
@@ -0,0 +1,59 @@
+import os
+
+from app.core.metrics import MetricsRegistry, MultiprocessStore, merge_snapshots, render_text, wipe_multiproc_dir
+
+# 1. Histogram kümülatif kovalar + Prometheus metin formatı
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("login_seconds", "Login latency.", ["stage"], buckets=(0.01, 0.1))
+    stage = histogram.labels("db_lookup")
+    stage.observe(0.005)
+    stage.observe(0.05)
+    stage.observe(2)
+
+    text = render_text(registry.snapshot())
+    assert "# TYPE login_seconds histogram" in text
+    assert 'login_seconds_bucket{stage="db_lookup",le="0.01"} 1' in text
+    assert 'login_seconds_bucket{stage="db_lookup",le="0.1"} 2' in text
+    assert 'login_seconds_bucket{stage="db_lookup",le="+Inf"} 3' in text
+    assert 'login_seconds_count{stage="db_lookup"} 3' in text
+
+# 2. Worker dosyaları birleştirilmeli: sayaçlar toplanır, "max" gauge'lar toplanmaz
+def test_multiprocess_store_merges_workers(tmp_path):
+    workers = []
+    for pid in (os.getpid(), os.getppid()):
+        registry = MetricsRegistry()
+        registry.counter("logins_total", "Logins.").labels().inc(2)
+        registry.gauge("ratelimit_keys", "Keys.", multiprocess_mode="max").labels().set(7)
+        registry.gauge("pool_checked_out", "Checked out.").labels().set(3)
+        store = MultiprocessStore(registry, str(tmp_path), flush_interval=60, pid=pid)
+        store.flush()
+        workers.append(store)
+
+    merged = merge_snapshots(workers[0].load())
+    assert merged["logins_total"]["samples"] == [[[], 4.0]]
+    assert merged["ratelimit_keys"]["samples"] == [[[], 7.0]]
+    assert merged["pool_checked_out"]["samples"] == [[[], 6.0]]
+
+# 3. Ölen worker'ın gauge'ları düşülür, sayaçları korunur
+def test_dead_worker_keeps_counters_only(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("logins_total", "Logins.").labels().inc()
+    registry.gauge("pool_checked_out", "Checked out.").labels().set(3)
+    MultiprocessStore(registry, str(tmp_path), flush_interval=60, pid=2 ** 22 + 1).flush()
+
+    live = MultiprocessStore(MetricsRegistry(), str(tmp_path), flush_interval=60)
+    merged = merge_snapshots(live.load())
+    assert merged["logins_total"]["samples"] == [[[], 1.0]]
+    assert "pool_checked_out" not in merged
+
+# 3b. Yeni çalıştırma: wipe önceki çalıştırmanın dosyalarını siler, sayaçlar birikmez
+def test_wipe_drops_previous_run(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("logins_total", "Logins.").labels().inc(5)
+    MultiprocessStore(registry, str(tmp_path), flush_interval=60, pid=2 ** 22 + 1).flush()
+
+    assert wipe_multiproc_dir(str(tmp_path)) == 1
+    live = MultiprocessStore(MetricsRegistry(), str(tmp_path), flush_interval=60)
+    assert "logins_total" not in merge_snapshots(live.load())
+    assert wipe_multiproc_dir(str(tmp_path / "missing")) == 0
@@ -0,0 +1,33 @@
+import time
+
+from limits import parse
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+from app.core.ratelimit import SQLiteSharedStorage
+
+# 1. İki worker (iki ayrı storage nesnesi) aynı sayaçları görmeli
+def test_limit_is_shared_between_workers(tmp_path):
+    uri = f"sqlite:///{tmp_path}/ratelimit.db"
+    worker_1 = SlidingWindowCounterRateLimiter(SQLiteSharedStorage(uri))
+    worker_2 = SlidingWindowCounterRateLimiter(SQLiteSharedStorage(uri))
+    limit = parse("5/minute")
+
+    results = [(worker_1 if i % 2 else worker_2).hit(limit, "127.0.0.1") for i in range(7)]
+
+    assert results == [True] * 5 + [False] * 2
+    assert worker_1.test(limit, "127.0.0.2") is True
+
+# 2. Anahtar başına tek satır, süresi dolan anahtarlar temizlenmeli
+def test_idle_keys_are_swept(tmp_path):
+    storage = SQLiteSharedStorage(f"sqlite:///{tmp_path}/ratelimit.db")
+    limiter = SlidingWindowCounterRateLimiter(storage)
+    limit = parse("100/second")
+
+    for _ in range(10):
+        limiter.hit(limit, "10.0.0.1")
+    limiter.hit(limit, "10.0.0.2")
+    assert storage.key_count() == 2
+
+    time.sleep(2.1)  # 2 pencere (2 x 1 sn) boyunca istek yok
+    storage.sweep()
+    assert storage.key_count() == 0
@@ -0,0 +1,14 @@
+import json
+
+from app.core.responses import trusted_response
+from app.users.cache import UserAuthRecord
+
+# 1. NamedTuple kayıt JSON nesnesi olarak yazılmalı (orjson varsayılanı liste)
+def test_trusted_response_renders_records_as_objects():
+    record = UserAuthRecord(id=1, email="user@example.com", is_active=True, is_2fa_enabled=False)
+    response = trusted_response(record)
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {
+        "id": 1, "email": "user@example.com", "is_active": True, "is_2fa_enabled": False,
+    }
@@ -0,0 +1,57 @@
+import uuid
+
+from app.sessions.revocation import BloomFilter, RevocationList
+
+# 1. Bloom filter: eklenenler her zaman bulunur, yanlış pozitif oranı hedefe yakın olmalı
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    revoked = [uuid.uuid4().hex for _ in range(10000)]
+    for session_id in revoked:
+        bloom.add(session_id)
+
+    assert all(session_id in bloom for session_id in revoked)
+
+    probes = 20000
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(probes))
+    assert false_positives / probes < 0.02
+    assert 0.005 < bloom.estimated_false_positive_rate() < 0.02
+
+# 2. Yeniden kurulum ve anlık ekleme
+def test_revocation_list_rebuild_and_add():
+    revocation = RevocationList(capacity=100, error_rate=0.001, rebuild_interval=60)
+    assert revocation.needs_rebuild()
+
+    revocation.rebuild(["a" * 32])
+    assert not revocation.needs_rebuild()
+    assert revocation.might_be_revoked("a" * 32)
+
+    revocation.add("b" * 32)
+    assert revocation.might_be_revoked("b" * 32)
+    assert revocation.stats()["checks"] == 2
+
+# 3. Yeniden kurulum tek uçuşlu, kurulum sırasındaki iptaller yeni filtrede kalır
+def test_revocation_rebuild_is_single_flight_and_keeps_concurrent_adds():
+    revocation = RevocationList(capacity=100, error_rate=0.001, rebuild_interval=60)
+
+    assert revocation.begin_rebuild()
+    assert not revocation.begin_rebuild()
+
+    # SELECT çalışırken başka bir istek session iptal eder; sorgu sonucunda yok
+    revocation.add("c" * 32)
+    revocation.rebuild(["a" * 32])
+    revocation.end_rebuild()
+
+    assert revocation.might_be_revoked("a" * 32)
+    assert revocation.might_be_revoked("c" * 32)
+    assert not revocation.begin_rebuild()
+    assert revocation.stats()["rebuilds"] == 1
+
+# 4. SELECT hata verirse kilit bırakılır, sonraki istek tekrar dener
+def test_revocation_rebuild_released_on_failure():
+    revocation = RevocationList(capacity=100, error_rate=0.001, rebuild_interval=60)
+
+    assert revocation.begin_rebuild()
+    revocation.end_rebuild()
+
+    assert revocation.needs_rebuild()
+    assert revocation.begin_rebuild()
@@ -4,8 +4,18 @@ from app.core.security import (
     get_password_hash, 
     encrypt_data, 
     decrypt_data, 
-    generate_totp_secret
+    generate_totp_secret,
+    create_access_token,
+    decode_token,
+    token_cache,
+    TOTPVerifier,
+    get_totp_verifier,
+    verify_and_update_password,
+    pwd_context,
+    build_password_context,
 )
+import pyotp
+from jose import JWTError
 
 # 1. Password Hashing Testleri
 def test_password_hashing():
@@ -30,3 +40,64 @@ def test_totp_generation():
     secret = generate_totp_secret()
     assert len(secret) > 0
     assert isinstance(secret, str)
+
+# 4. JWT Decode Cache Testi
+def test_decode_token_uses_cache():
+    token = create_access_token({"sub": "cache@example.com"})
+    hits_before = token_cache.stats()["hits"]
+
+    assert decode_token(token)["sub"] == "cache@example.com"
+    assert decode_token(token)["sub"] == "cache@example.com"
+    assert token_cache.stats()["hits"] == hits_before + 1
+
+    # İmzası bozulmuş token cache'ten geçemez
+    with pytest.raises(JWTError):
+        decode_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+
+# 5. Hazır TOTP doğrulayıcı pyotp ile uyumlu olmalı
+def test_totp_verifier_matches_pyotp():
+    secret = generate_totp_secret()
+    verifier = TOTPVerifier(secret)
+    reference = pyotp.TOTP(secret)
+
+    for for_time in (0, 59, 1_700_000_000, 1_700_000_029):
+        code = reference.at(for_time)
+        assert verifier.verify(code, for_time=for_time) is True
+        assert verifier.verify(code, valid_window=1, for_time=for_time + 30) is True
+        assert verifier.verify(code, valid_window=0, for_time=for_time + 60) is False
+
+# 5b. Biçimi bozuk kodlar hata fırlatmadan reddedilir (ASCII olmayan rakam dahil)
+def test_totp_verifier_rejects_malformed_codes():
+    verifier = TOTPVerifier(generate_totp_secret())
+
+    for code in ("12345é", "١٢٣٤٥٦", "12345", "1234567", "12 345", ""):
+        assert verifier.verify(code, valid_window=1) is False
+
+# 6. Doğrulayıcı cache: aynı secret -> aynı nesne, değişen secret -> yeni nesne
+def test_totp_verifier_cache():
+    encrypted = encrypt_data(generate_totp_secret())
+    verifier = get_totp_verifier(424242, encrypted)
+    assert get_totp_verifier(424242, encrypted) is verifier
+
+    rotated = encrypt_data(generate_totp_secret())
+    assert get_totp_verifier(424242, rotated) is not verifier
+
+# 7. Rehash-on-login: eski maliyetteki hash doğru parolayla güncel maliyete taşınır
+def test_verify_and_update_rehashes_old_cost():
+    old_hash = pwd_context.handler().using(rounds=4).hash("mySecretPassword")
+
+    valid, new_hash = verify_and_update_password("mySecretPassword", old_hash)
+    assert valid is True
+    assert new_hash is not None and not pwd_context.needs_update(new_hash)
+
+    assert verify_and_update_password("wrongPassword", old_hash) == (False, None)
+    assert verify_and_update_password("mySecretPassword", new_hash) == (True, None)
+
+# 8. Argon2id seçilince bcrypt hash'leri deprecated olur (login'de taşınır)
+def test_argon2_context_deprecates_bcrypt():
+    context = build_password_context("argon2")
+    assert context.default_scheme() == "argon2"
+    assert context.needs_update(get_password_hash("mySecretPassword"))
+
+    with pytest.raises(ValueError):
+        build_password_context("md5")
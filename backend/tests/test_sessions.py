@@ -0,0 +1,75 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from app.auth.router import limiter
+from app.db.session import SessionLocal
+from app.sessions.models import UserSession
+from app.sessions.repository import hash_token
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def tokens():
+    limiter.reset()
+    credentials = {"username": f"session-{uuid.uuid4().hex[:8]}@example.com", "password": "securePassword123!"}
+    client.post("/auth/register", json={"email": credentials["username"], "password": credentials["password"]})
+    response = client.post("/auth/login", data=credentials)
+    assert response.status_code == 200
+    return response.json()
+
+# 1. Login gerçek bir refresh token verir, DB'de sadece özeti saklanır
+def test_login_creates_session_with_token_digest(tokens):
+    assert tokens["refresh_token"] != "not_implemented_yet"
+
+    with SessionLocal() as db:
+        session = db.query(UserSession).filter(UserSession.refresh_token_hash == hash_token(tokens["refresh_token"])).one()
+        assert session.revoked_at is None
+        assert tokens["refresh_token"] not in (session.id, session.refresh_token_hash)
+
+# 2. Rotation: yeni token çifti döner, eski refresh token tekrar kullanılırsa session iptal edilir
+def test_refresh_rotation_and_reuse_detection(tokens):
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    # Eski token tekrar kullanıldı -> reuse
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+    # Session iptal edildiği için yeni token da artık geçersiz
+    response = client.post("/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+    assert response.status_code == 401
+
+# 3. Refresh token access token yerine kullanılamaz
+def test_refresh_token_is_not_an_access_token(tokens):
+    response = client.post("/auth/enable-2fa", headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 401
+
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["access_token"]})
+    assert response.status_code == 401
+
+# 4. Logout session'ı iptal eder, access token artık kabul edilmez
+def test_logout_revokes_access_token(tokens):
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"].startswith("session-")
+
+    response = client.post("/auth/logout", headers=headers)
+    assert response.status_code == 204
+
+    response = client.post("/auth/enable-2fa", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Session revoked"
+
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 401
+
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
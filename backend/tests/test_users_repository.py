@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.users import repository
+from app.users.models import User
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(User(email="repo@example.com", hashed_password="old-hash", totp_secret="enc", is_2fa_enabled=True))
+        session.commit()
+        yield session
+    engine.dispose()
+
+# 1. Core lookup: sadece gereken kolonlar, ORM nesnesi değil düz kayıt döner
+def test_login_and_auth_records(db):
+    record = repository.get_login_record(db, "repo@example.com")
+    assert not isinstance(record, User)
+    assert (record.email, record.hashed_password, record.totp_secret) == ("repo@example.com", "old-hash", "enc")
+    assert record.is_active is True and record.is_2fa_enabled is True
+    assert not hasattr(record, "__dict__")
+
+    auth = repository.get_auth_record(db, "repo@example.com")
+    assert auth == (record.id, "repo@example.com", True, True)
+
+    assert repository.get_login_record(db, "missing@example.com") is None
+    assert repository.get_auth_record(db, "missing@example.com") is None
+
+# 2. Rehash UPDATE'i commit edilince kalıcı olur
+def test_update_password_hash(db):
+    record = repository.get_login_record(db, "repo@example.com")
+    repository.update_password_hash(db, record.id, "new-hash")
+    db.commit()
+    assert repository.get_login_record(db, "repo@example.com").hashed_password == "new-hash"
+
+# 3. Register: tek INSERT, tekrar eden email unique index ile yakalanır
+def test_create_user_on_conflict(db):
+    record = repository.create_user(db, "new@example.com", "hash")
+    db.commit()
+    assert record.email == "new@example.com"
+    assert record.is_active is True and record.is_2fa_enabled is False
+
+    assert repository.create_user(db, "new@example.com", "other-hash") is None
+    assert repository.get_login_record(db, "new@example.com").hashed_password == "hash"
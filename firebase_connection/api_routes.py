@@ -1,17 +1,25 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from auth_service import AuthService
-from secure_2fa_operations import Secure2FAOperations
+from async_auth_service import AsyncAuthService
+from async_2fa_operations import AsyncSecure2FAOperations
 from firebase_config import FirebaseConfig
+from document_store import FirestoreAsyncDocumentStore, get_async_document_store
+from cpu_executor import shutdown_cpu_executor
+from event_logger import EventLogger, get_event_logger
+
+log = get_event_logger("api")
 
 # FastAPI app
 app = FastAPI(
     title="AuthGuard API",
     description="2FA-Enabled Session Management Platform",
-    version="0.4.0"
+    version="0.4.0",
+    # Performans: orjson ile hızlı JSON yazımı (tüm route'lar)
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware (React frontend için)
@@ -26,9 +34,9 @@ app.add_middleware(
 # Security
 security = HTTPBearer()
 
-# Services
-auth_service = AuthService()
-twofa_service = Secure2FAOperations()
+# Services (async: Firestore RPC'leri await edilir, bcrypt/Fernet/QR CPU havuzunda)
+auth_service = AsyncAuthService()
+twofa_service = AsyncSecure2FAOperations()
 
 # ============================================================================
 # REQUEST/RESPONSE MODELS
@@ -42,6 +50,7 @@ class RegisterRequest(BaseModel):
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
+    totp_code: Optional[str] = None  # 6-digit code (tek adımda 2FA login)
 
 class Verify2FARequest(BaseModel):
     email: EmailStr
@@ -67,6 +76,30 @@ class Login2FARequiredResponse(BaseModel):
     email: str
     message: str
 
+# ============================================================================
+# FAST RESPONSES
+# ============================================================================
+
+def trusted_response(content: dict) -> ORJSONResponse:
+    """
+    Servisin kendi ürettiği veriyi doğrudan orjson ile döndür
+
+    Response nesnesi dönünce FastAPI response_model doğrulamasını ve
+    jsonable_encoder'ı atlar. Modeller OpenAPI dokümantasyonu için kalır.
+    Kullanıcıdan gelen veri bu yoldan döndürülmemeli.
+    """
+    return ORJSONResponse(content)
+
+def token_payload(result: dict) -> dict:
+    """
+    AuthService sonucundan TokenResponse alanlarını seç
+    """
+    return {
+        "access_token": result['access_token'],
+        "refresh_token": result['refresh_token'],
+        "token_type": result['token_type']
+    }
+
 # ============================================================================
 # DEPENDENCY: AUTH MIDDLEWARE
 # ============================================================================
@@ -108,7 +141,7 @@ async def register(request: RegisterRequest):
     - **email**: Email adresi
     - **password**: Şifre (min 8 karakter)
     """
-    result = auth_service.register_user(
+    result = await auth_service.register_user(
         username=request.username,
         email=request.email,
         password=request.password
@@ -120,7 +153,7 @@ async def register(request: RegisterRequest):
             detail=result['message']
         )
     
-    return MessageResponse(message=result['message'])
+    return trusted_response({"message": result['message']})
 
 @app.post("/auth/login")
 async def login(request: LoginRequest):
@@ -132,19 +165,20 @@ async def login(request: LoginRequest):
     - 202 + requires_2fa (2FA enabled)
     - 401 (invalid credentials)
     """
-    result = auth_service.login(
+    result = await auth_service.login(
         email=request.email,
-        password=request.password
+        password=request.password,
+        totp_code=request.totp_code
     )
     
     # Case 1: 2FA Required (HTTP 202 Accepted)
     if result.get('requires_2fa'):
-        return Login2FARequiredResponse(
-            requires_2fa=True,
-            user_id=result['user_id'],
-            email=result['email'],
-            message=result['message']
-        )
+        return trusted_response({
+            "requires_2fa": True,
+            "user_id": result['user_id'],
+            "email": result['email'],
+            "message": result['message']
+        })
     
     # Case 2: Invalid Credentials
     if not result['success']:
@@ -154,11 +188,7 @@ async def login(request: LoginRequest):
         )
     
     # Case 3: Success - Return JWT tokens
-    return TokenResponse(
-        access_token=result['access_token'],
-        refresh_token=result['refresh_token'],
-        token_type=result['token_type']
-    )
+    return trusted_response(token_payload(result))
 
 @app.post("/auth/verify-2fa", response_model=TokenResponse)
 async def verify_2fa(request: Verify2FARequest):
@@ -168,7 +198,7 @@ async def verify_2fa(request: Verify2FARequest):
     - **email**: User email
     - **token**: 6-digit TOTP code
     """
-    result = auth_service.verify_2fa_and_login(
+    result = await auth_service.verify_2fa_and_login(
         email=request.email,
         token=request.token
     )
@@ -179,11 +209,7 @@ async def verify_2fa(request: Verify2FARequest):
             detail=result['message']
         )
     
-    return TokenResponse(
-        access_token=result['access_token'],
-        refresh_token=result['refresh_token'],
-        token_type=result['token_type']
-    )
+    return trusted_response(token_payload(result))
 
 @app.post("/auth/refresh", response_model=dict)
 async def refresh_token(request: RefreshTokenRequest):
@@ -216,7 +242,7 @@ async def enable_2fa(
         - qr_code: Base64 PNG image
         - secret: TOTP secret (manual entry için)
     """
-    result = twofa_service.enable_2fa(request.email)
+    result = await twofa_service.enable_2fa(request.email)
     
     return {
         "qr_code": result['qr_code'],
@@ -232,7 +258,7 @@ async def disable_2fa(
     """
     2FA'yı devre dışı bırak (Protected)
     """
-    result = twofa_service.disable_2fa(email)
+    result = await twofa_service.disable_2fa(email)
     
     return MessageResponse(message="2FA disabled successfully")
 
@@ -244,7 +270,7 @@ async def get_2fa_status(
     """
     2FA durumunu kontrol et (Protected)
     """
-    status_data = twofa_service.get_2fa_status(email)
+    status_data = await twofa_service.get_2fa_status(email)
     
     return status_data
 
@@ -302,6 +328,13 @@ async def health_check():
         "2fa": "enabled"
     }
 
+@app.get("/health/logging")
+async def logging_stats():
+    """
+    Log kuyruğu doluluğu, düşürülen / örneklenen kayıtlar
+    """
+    return EventLogger.stats()
+
 # ============================================================================
 # STARTUP EVENT
 # ============================================================================
@@ -311,10 +344,17 @@ async def startup_event():
     """
     App başlatılırken Firebase'i initialize et
     """
-    FirebaseConfig.initialize()
-    print("✅ Firebase initialized")
-    print("✅ AuthGuard API ready!")
-    print("📝 Docs: http://localhost:8000/docs")
+    # DOCUMENT_STORE=memory ile Firebase'siz çalışır (lokal geliştirme / yük testi)
+    if isinstance(get_async_document_store(), FirestoreAsyncDocumentStore):
+        FirebaseConfig.initialize()
+    log.info("api.ready", docs="/docs")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    CPU havuzunu kapat (devam eden bcrypt işleri tamamlanır)
+    """
+    shutdown_cpu_executor()
 
 # ============================================================================
 # RUN SERVER
@@ -0,0 +1,215 @@
+from document_store import AsyncDocumentStore, get_async_document_store
+from data_schema import FirestoreSchema
+from encryption import EncryptionModule
+from md5_docid import MD5DocIDGenerator
+from totp_manager import TOTPManager
+from cpu_executor import run_cpu
+from event_logger import get_event_logger
+from datetime import datetime
+from typing import Dict, Optional
+
+log = get_event_logger("async_2fa_operations")
+
+class AsyncSecure2FAOperations:
+    """
+    2FA operasyonları - async (Firestore AsyncClient)
+    Secure2FAOperations ile aynı veri modeli ve sonuçlar
+
+    Performans:
+    - Firestore RPC'leri await edilir, event loop bloklanmaz
+    - QR render ve Fernet şifreleme/çözme CPU havuzunda (cpu_executor) çalışır,
+      istek başına tek executor geçişi olacak şekilde gruplanır
+    - Birden fazla doküman yazan işlemler tek batch commit'i (tek RPC)
+    """
+
+    def __init__(self, store: Optional[AsyncDocumentStore] = None, layout: Optional[str] = None):
+        """
+        Args:
+            store: Async doküman deposu (None ise get_async_document_store())
+            layout: 2FA yerleşimi (None ise FirestoreSchema.two_factor_layout())
+        """
+        self.db = store or get_async_document_store()
+        self.collections = FirestoreSchema.get_collections()
+        self.encryption = EncryptionModule()
+        self.id_gen = MD5DocIDGenerator()
+        self.totp = TOTPManager(issuer_name="AuthGuard")
+        self.layout = layout or FirestoreSchema.two_factor_layout()
+
+    @property
+    def embedded(self) -> bool:
+        return self.layout == FirestoreSchema.TWO_FACTOR_EMBEDDED
+
+    def _two_factor_ref(self, user_id: str):
+        # (doc_ref, alan öneki), bkz. Secure2FAOperations._two_factor_ref
+        if self.embedded:
+            return self.db.collection(self.collections['users']).document(user_id), f"{FirestoreSchema.TWO_FACTOR_FIELD}."
+        tfa_id = self.id_gen.generate_2fa_id(user_id)
+        return self.db.collection(self.collections['two_factor_auth']).document(tfa_id), ""
+
+    def _two_factor_data(self, doc) -> Optional[Dict]:
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        return data.get(FirestoreSchema.TWO_FACTOR_FIELD) if self.embedded else data
+
+    def _prepare_2fa(self, email: str, user_id: str, secret: str):
+        # CPU havuzunda: QR PNG render + secret şifreleme
+        qr_code = self.totp.generate_qr_code(email, secret)
+        encrypted_doc = self.encryption.encrypt_dict(
+            FirestoreSchema.two_factor_auth_document(user_id=user_id, secret_key=secret),
+            fields_to_encrypt=['secret_key']
+        )
+        return qr_code, encrypted_doc
+
+    def _check_token(self, encrypted_data: Dict, token: str) -> bool:
+        # CPU havuzunda: secret çözme + TOTP doğrulama (±30 saniye)
+        decrypted_data = self.encryption.decrypt_dict(
+            encrypted_data,
+            fields_to_decrypt=['secret_key']
+        )
+        return self.totp.verify_token(decrypted_data['secret_key'], token, window=1)
+
+    async def enable_2fa(self, email: str) -> Dict[str, str]:
+        """
+        Kullanıcı için 2FA aktif et
+
+        Args:
+            email: Kullanıcı email
+
+        Returns:
+            {
+                'user_id': str,
+                'secret': str,
+                'qr_code': str (base64 PNG),
+                'manual_entry_key': str (plain for display)
+            }
+        """
+        user_id = self.id_gen.generate_user_id(email)
+        totp_secret = self.totp.generate_secret()
+
+        qr_code, encrypted_doc = await run_cpu(self._prepare_2fa, email, user_id, totp_secret)
+
+        user_ref = self.db.collection(self.collections['users']).document(user_id)
+        flag = {
+            'is_2fa_enabled': True,
+            'updated_at': datetime.utcnow()
+        }
+        if self.embedded:
+            # Blok + flag aynı dokümanda: tek yazma
+            await user_ref.update({FirestoreSchema.TWO_FACTOR_FIELD: FirestoreSchema.embedded_two_factor(encrypted_doc), **flag})
+        else:
+            # 2FA dokümanı + user flag'i tek commit'te
+            batch = self.db.batch()
+            tfa_id = self.id_gen.generate_2fa_id(user_id)
+            batch.set(self.db.collection(self.collections['two_factor_auth']).document(tfa_id), encrypted_doc)
+            batch.update(user_ref, flag)
+            await batch.commit()
+
+        log.info("2fa.enabled", user_id=user_id, layout=self.layout)
+
+        return {
+            'user_id': user_id,
+            'secret': totp_secret,
+            'qr_code': qr_code,
+            'manual_entry_key': totp_secret
+        }
+
+    async def verify_2fa_token(self, email: str, token: str, batch=None, user_data: Optional[Dict] = None) -> bool:
+        """
+        6-digit TOTP kodunu doğrula
+
+        Args:
+            email: Kullanıcı email
+            token: 6-digit kod
+            batch: Async WriteBatch (opsiyonel). Verilirse last_used
+                   güncellemesi bu batch'e eklenir, commit çağıran tarafta
+            user_data: Çağıranın zaten okuduğu user dokümanı (opsiyonel).
+                       Embedded yerleşimde 2FA bloğu buradan alınır, okuma yapılmaz
+
+        Returns:
+            True eğer kod geçerliyse
+        """
+        user_id = self.id_gen.generate_user_id(email)
+        doc_ref, prefix = self._two_factor_ref(user_id)
+
+        if self.embedded and user_data is not None:
+            tfa_data = user_data.get(FirestoreSchema.TWO_FACTOR_FIELD)
+        else:
+            tfa_data = self._two_factor_data(await doc_ref.get())
+
+        if not tfa_data:
+            log.info("2fa.not_configured", user_id=user_id)
+            return False
+
+        is_valid = await run_cpu(self._check_token, tfa_data, token)
+
+        if is_valid:
+            update = {f'{prefix}last_used': datetime.utcnow()}
+            if batch is not None:
+                batch.update(doc_ref, update)
+            else:
+                await doc_ref.update(update)
+        log.debug("2fa.verified", user_id=user_id, valid=is_valid)
+        return is_valid
+
+    async def disable_2fa(self, email: str) -> bool:
+        """
+        2FA'yı devre dışı bırak
+
+        Args:
+            email: Kullanıcı email
+
+        Returns:
+            True eğer başarılıysa
+        """
+        user_id = self.id_gen.generate_user_id(email)
+        user_ref = self.db.collection(self.collections['users']).document(user_id)
+        flag = {
+            'is_2fa_enabled': False,
+            'updated_at': datetime.utcnow()
+        }
+
+        if self.embedded:
+            await user_ref.update({FirestoreSchema.TWO_FACTOR_FIELD: None, **flag})
+        else:
+            # 2FA dokümanı silme + user flag'i tek commit'te
+            batch = self.db.batch()
+            tfa_id = self.id_gen.generate_2fa_id(user_id)
+            batch.delete(self.db.collection(self.collections['two_factor_auth']).document(tfa_id))
+            batch.update(user_ref, flag)
+            await batch.commit()
+
+        log.info("2fa.disabled", user_id=user_id)
+
+        return True
+
+    async def get_2fa_status(self, email: str) -> Dict:
+        """
+        Kullanıcının 2FA durumunu getir
+
+        Args:
+            email: Kullanıcı email
+
+        Returns:
+            {
+                'is_enabled': bool,
+                'last_used': datetime or None,
+                'created_at': datetime or None
+            }
+        """
+        user_id = self.id_gen.generate_user_id(email)
+        doc_ref, _ = self._two_factor_ref(user_id)
+        data = self._two_factor_data(await doc_ref.get())
+
+        if not data:
+            return {
+                'is_enabled': False,
+                'last_used': None,
+                'created_at': None
+            }
+
+        return {
+            'is_enabled': data.get('is_enabled', False),
+            'last_used': data.get('last_used'),
+            'created_at': data.get('created_at')
+        }
@@ -0,0 +1,270 @@
+from document_store import DOCUMENT_EXISTS_ERRORS, AsyncDocumentStore, get_async_document_store
+from data_schema import FirestoreSchema
+from md5_docid import MD5DocIDGenerator
+from encryption import EncryptionModule
+from async_2fa_operations import AsyncSecure2FAOperations
+from jwt_manager import JWTManager
+from cpu_executor import run_cpu
+from event_logger import get_event_logger
+import bcrypt
+from typing import Dict, Optional
+from datetime import datetime
+
+log = get_event_logger("async_auth_service")
+
+class AsyncAuthService:
+    """
+    Authentication Service - async (Firestore AsyncClient)
+    AuthService ile aynı login akışı, aynı sonuç sözlükleri
+
+    FastAPI'nin async route'larında senkron AuthService her Firestore RPC'sinde
+    ve her bcrypt kontrolünde event loop'u bloklar; worker aynı anda tek login
+    işleyebilir. Burada:
+    - Firestore RPC'leri await edilir
+    - bcrypt ve Fernet CPU havuzunda (cpu_executor) çalışır, istek başına tek
+      executor geçişi olacak şekilde gruplanır
+    - JWT imzalama ve kısa token'ların şifrelenmesi mikro saniyeler sürer,
+      executor geçişinden ucuz olduğu için event loop'ta kalır
+    """
+
+    def __init__(self, store: Optional[AsyncDocumentStore] = None):
+        """
+        Args:
+            store: Async doküman deposu (None ise get_async_document_store())
+        """
+        self.db = store or get_async_document_store()
+        self.id_gen = MD5DocIDGenerator()
+        self.encryption = EncryptionModule()
+        self.twofa = AsyncSecure2FAOperations(store=self.db)
+        self.jwt = JWTManager()
+        self.collections = {
+            "users": "users",
+            "sessions": "sessions"
+        }
+
+    def _hash_user_document(self, username: str, email: str, password: str) -> Dict:
+        # CPU havuzunda: bcrypt hash + hassas alan şifreleme
+        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        user_doc = FirestoreSchema.user_document(username, email, hashed_password)
+        return self.encryption.encrypt_dict(user_doc, fields_to_encrypt=['hashed_password'])
+
+    def _check_password(self, user_data: Dict, password: str) -> bool:
+        # CPU havuzunda: hash çözme + bcrypt karşılaştırma
+        decrypted_data = self.encryption.decrypt_dict(
+            user_data,
+            fields_to_decrypt=['hashed_password']
+        )
+        return bcrypt.checkpw(password.encode('utf-8'), decrypted_data['hashed_password'].encode('utf-8'))
+
+    async def register_user(self, username: str, email: str, password: str) -> Dict:
+        """
+        Yeni kullanıcı kaydı (password hashing ile)
+
+        Args:
+            username: Kullanıcı adı
+            email: Email
+            password: Plain text password
+
+        Returns:
+            {
+                "success": bool,
+                "user_id": str,
+                "message": str
+            }
+        """
+        # Ucuz doğrulama bcrypt'ten önce, duplicate kontrolü create() ile tek RPC'de
+        error = FirestoreSchema.validate_user_input(username, email, password)
+        if error:
+            log.info("register.rejected", reason=error)
+            return {
+                "success": False,
+                "message": error
+            }
+
+        user_id = self.id_gen.generate_user_id(email)
+        user_ref = self.db.collection(self.collections['users']).document(user_id)
+
+        encrypted_doc = await run_cpu(self._hash_user_document, username, email, password)
+        try:
+            await user_ref.create(encrypted_doc)
+        except DOCUMENT_EXISTS_ERRORS:
+            log.info("register.duplicate", user_id=user_id)
+            return {
+                "success": False,
+                "message": "Email already registered"
+            }
+
+        log.info("register.succeeded", user_id=user_id)
+
+        return {
+            "success": True,
+            "user_id": user_id,
+            "message": "User registered successfully"
+        }
+
+    async def login(self, email: str, password: str, totp_code: Optional[str] = None) -> Dict:
+        """
+        Login Flow - Conditional Logic (bkz. AuthService.login)
+
+        Args:
+            email: User email
+            password: Plain password
+            totp_code: 6-digit TOTP kodu (opsiyonel, embedded yerleşimde ek okuma yok)
+
+        Returns:
+            AuthService.login ile aynı sözlük
+        """
+        user_id = self.id_gen.generate_user_id(email)
+
+        user_doc = await self.db.collection(self.collections['users']).document(user_id).get()
+
+        if not user_doc.exists:
+            log.info("login.failed", reason="unknown_user")
+            return {
+                "success": False,
+                "message": "Invalid credentials"
+            }
+
+        user_data = user_doc.to_dict()
+
+        if not await run_cpu(self._check_password, user_data, password):
+            log.info("login.failed", reason="bad_password", user_id=user_id)
+            return {
+                "success": False,
+                "message": "Invalid credentials"
+            }
+
+        is_2fa_enabled = user_data.get('is_2fa_enabled', False)
+        batch = self.db.batch()
+
+        if is_2fa_enabled:
+            if totp_code is None:
+                log.info("login.2fa_required", user_id=user_id)
+                return {
+                    "success": False,
+                    "requires_2fa": True,
+                    "user_id": user_id,
+                    "email": email,
+                    "message": "2FA verification required"
+                }
+
+            if not await self.twofa.verify_2fa_token(email, totp_code, batch=batch, user_data=user_data):
+                log.info("2fa.failed", user_id=user_id)
+                return {
+                    "success": False,
+                    "message": "Invalid 2FA code"
+                }
+
+        tokens = self.jwt.create_token_pair(user_id, email)
+        await self._commit_login(batch, user_id, tokens)
+
+        log.info("login.succeeded", user_id=user_id, method="password+2fa" if is_2fa_enabled else "password")
+
+        return {
+            "success": True,
+            "requires_2fa": False,
+            "access_token": tokens['access_token'],
+            "refresh_token": tokens['refresh_token'],
+            "token_type": tokens['token_type'],
+            "message": "Login successful"
+        }
+
+    async def verify_2fa_and_login(self, email: str, token: str) -> Dict:
+        """
+        2FA kod doğrulama ve JWT verme (bkz. AuthService.verify_2fa_and_login)
+
+        Args:
+            email: User email
+            token: 6-digit TOTP code
+
+        Returns:
+            AuthService.verify_2fa_and_login ile aynı sözlük
+        """
+        user_id = self.id_gen.generate_user_id(email)
+        batch = self.db.batch()
+
+        if not await self.twofa.verify_2fa_token(email, token, batch=batch):
+            log.info("2fa.failed", user_id=user_id)
+            return {
+                "success": False,
+                "message": "Invalid 2FA code"
+            }
+
+        tokens = self.jwt.create_token_pair(user_id, email)
+        await self._commit_login(batch, user_id, tokens)
+
+        log.info("login.succeeded", user_id=user_id, method="2fa")
+
+        return {
+            "success": True,
+            "access_token": tokens['access_token'],
+            "refresh_token": tokens['refresh_token'],
+            "token_type": tokens['token_type'],
+            "message": "Login successful with 2FA"
+        }
+
+    async def _commit_login(self, batch, user_id: str, tokens: Dict):
+        """
+        Kimlik doğrulama sonrası yazmaları tek RPC'de commit et
+        (last_login update + şifreli session, bkz. AuthService._commit_login)
+        """
+        user_ref = self.db.collection(self.collections['users']).document(user_id)
+        batch.update(user_ref, {
+            "last_login": datetime.utcnow()
+        })
+
+        session_id = self.id_gen.generate_session_id(user_id)
+        session_doc = self.encryption.encrypt_dict({
+            "user_id": user_id,
+            "access_token": tokens['access_token'],
+            "refresh_token": tokens['refresh_token'],
+            "created_at": datetime.utcnow(),
+            "expires_at": None,
+            "is_active": True
+        }, fields_to_encrypt=['access_token', 'refresh_token'])
+        batch.set(self.db.collection(self.collections['sessions']).document(session_id), session_doc)
+
+        await batch.commit()
+        log.debug("session.saved", user_id=user_id)
+
+    def verify_access_token(self, token: str) -> Optional[Dict]:
+        """
+        Access token doğrula (Protected route için)
+        RPC yok, HMAC doğrulaması: senkron kalır
+
+        Args:
+            token: JWT access token
+
+        Returns:
+            User payload veya None
+        """
+        payload = self.jwt.verify_token(token, expected_type="access")
+
+        if not payload:
+            return None
+
+        return {
+            "user_id": payload['sub'],
+            "email": payload['email']
+        }
+
+    def refresh_token(self, refresh_token: str) -> Optional[Dict]:
+        """
+        Refresh token ile yeni access token al
+        RPC yok: senkron kalır
+
+        Args:
+            refresh_token: JWT refresh token
+
+        Returns:
+            {"access_token": str} veya None
+        """
+        new_access = self.jwt.refresh_access_token(refresh_token)
+
+        if not new_access:
+            return None
+
+        return {
+            "access_token": new_access,
+            "token_type": "bearer"
+        }
@@ -1,12 +1,16 @@
-from firebase_config import FirebaseConfig
+from document_store import DOCUMENT_EXISTS_ERRORS, DocumentStore, get_document_store
+from data_schema import FirestoreSchema
 from md5_docid import MD5DocIDGenerator
 from encryption import EncryptionModule
 from secure_2fa_operations import Secure2FAOperations
 from jwt_manager import JWTManager
+from event_logger import get_event_logger
 import bcrypt
 from typing import Dict, Optional
 from datetime import datetime
 
+log = get_event_logger("auth_service")
+
 class AuthService:
     """
     Authentication Service - Login Flow Logic
@@ -19,11 +23,16 @@ class AuthService:
     4. FAILURE → Return error
     """
     
-    def __init__(self):
-        self.db = FirebaseConfig.get_db()
+    def __init__(self, store: Optional[DocumentStore] = None):
+        """
+        Args:
+            store: Doküman deposu (None ise get_document_store(): Firestore
+                   veya DOCUMENT_STORE=memory ile in-memory)
+        """
+        self.db = store or get_document_store()
         self.id_gen = MD5DocIDGenerator()
         self.encryption = EncryptionModule()
-        self.twofa = Secure2FAOperations()
+        self.twofa = Secure2FAOperations(store=self.db)
         self.jwt = JWTManager()
         self.collections = {
             "users": "users",
@@ -46,28 +55,24 @@ class AuthService:
                 "message": str
             }
         """
-        print(f"\n📝 Kullanıcı Kaydı: {email}")
-        print("="*60)
-        
-        # 1. Email kontrolü (duplicate check)
-        user_id = self.id_gen.generate_user_id(email)
-        user_ref = self.db.collection(self.collections['users']).document(user_id)
-        
-        if user_ref.get().exists:
-            print("❌ Email zaten kayıtlı!")
+        # 1. Ucuz doğrulama: geçersiz girdi için bcrypt maliyeti ödenmez
+        error = FirestoreSchema.validate_user_input(username, email, password)
+        if error:
+            log.info("register.rejected", reason=error)
             return {
                 "success": False,
-                "message": "Email already registered"
+                "message": error
             }
         
+        user_id = self.id_gen.generate_user_id(email)
+        user_ref = self.db.collection(self.collections['users']).document(user_id)
+        
         # 2. Password hash (bcrypt)
         password_bytes = password.encode('utf-8')
         salt = bcrypt.gensalt()
         hashed = bcrypt.hashpw(password_bytes, salt)
         hashed_password = hashed.decode('utf-8')
         
-        print(f"   ✅ Password hashed (bcrypt)")
-        
         # 3. User document oluştur
         user_doc = {
             "username": username,
@@ -86,11 +91,18 @@ class AuthService:
             fields_to_encrypt=['hashed_password']
         )
         
-        # 5. Firestore'a kaydet
-        user_ref.set(encrypted_doc)
+        # 5. Firestore'a kaydet: create() doküman varsa AlreadyExists verir.
+        # Ayrı get() + set() yerine tek RPC, eşzamanlı iki kayıt da birbirini ezemez
+        try:
+            user_ref.create(encrypted_doc)
+        except DOCUMENT_EXISTS_ERRORS:
+            log.info("register.duplicate", user_id=user_id)
+            return {
+                "success": False,
+                "message": "Email already registered"
+            }
         
-        print(f"   ✅ Kullanıcı kaydedildi: {user_id}")
-        print("="*60)
+        log.info("register.succeeded", user_id=user_id)
         
         return {
             "success": True,
@@ -98,18 +110,21 @@ class AuthService:
             "message": "User registered successfully"
         }
     
-    def login(self, email: str, password: str) -> Dict:
+    def login(self, email: str, password: str, totp_code: Optional[str] = None) -> Dict:
         """
         Login Flow - Conditional Logic
         
         States:
         - PASSWORD_SUCCESS + NO_2FA → JWT returned
         - PASSWORD_SUCCESS + 2FA_ENABLED → 2FA_REQUIRED (202)
+        - PASSWORD_SUCCESS + 2FA_ENABLED + totp_code → JWT returned
         - PASSWORD_FAILURE → 401 Unauthorized
         
         Args:
             email: User email
             password: Plain password
+            totp_code: 6-digit TOTP kodu (opsiyonel). Embedded 2FA yerleşiminde
+                       kod okunan user dokümanından doğrulanır: tek okuma + tek commit
             
         Returns:
             {
@@ -121,9 +136,6 @@ class AuthService:
                 "message": str
             }
         """
-        print(f"\n🔐 Login Attempt: {email}")
-        print("="*60)
-        
         # 1. User ID hesapla
         user_id = self.id_gen.generate_user_id(email)
         
@@ -132,7 +144,7 @@ class AuthService:
         user_doc = user_ref.get()
         
         if not user_doc.exists:
-            print("   ❌ Kullanıcı bulunamadı")
+            log.info("login.failed", reason="unknown_user")
             return {
                 "success": False,
                 "message": "Invalid credentials"
@@ -155,42 +167,42 @@ class AuthService:
         password_match = bcrypt.checkpw(password_bytes, stored_hash_bytes)
         
         if not password_match:
-            print("   ❌ Yanlış şifre")
+            log.info("login.failed", reason="bad_password", user_id=user_id)
             return {
                 "success": False,
                 "message": "Invalid credentials"
             }
         
-        print("   ✅ Password doğrulandı")
-        
         # 5. 2FA kontrolü
         is_2fa_enabled = user_data.get('is_2fa_enabled', False)
+        batch = self.db.batch()
         
         if is_2fa_enabled:
-            print("   🔐 2FA gerekli (202 Accepted)")
-            print("="*60)
-            return {
-                "success": False,
-                "requires_2fa": True,
-                "user_id": user_id,
-                "email": email,
-                "message": "2FA verification required"
-            }
-        
-        # 6. 2FA yok → JWT token oluştur
-        print("   ✅ 2FA yok, JWT oluşturuluyor...")
+            if totp_code is None:
+                log.info("login.2fa_required", user_id=user_id)
+                return {
+                    "success": False,
+                    "requires_2fa": True,
+                    "user_id": user_id,
+                    "email": email,
+                    "message": "2FA verification required"
+                }
+            
+            # Kod login ile geldi (last_used güncellemesi batch'e eklenir)
+            if not self.twofa.verify_2fa_token(email, totp_code, batch=batch, user_data=user_data):
+                log.info("2fa.failed", user_id=user_id)
+                return {
+                    "success": False,
+                    "message": "Invalid 2FA code"
+                }
+        
+        # 6. JWT token oluştur
         tokens = self.jwt.create_token_pair(user_id, email)
         
-        # 7. Last login güncelle
-        user_ref.update({
-            "last_login": datetime.utcnow()
-        })
-        
-        # 8. Session'ı Firestore'a kaydet
-        self._save_session(user_id, tokens['access_token'], tokens['refresh_token'])
+        # 7. (2FA last_used +) last login + session tek batch commit'inde (tek RPC)
+        self._commit_login(batch, user_id, tokens)
         
-        print("   ✅ Login başarılı!")
-        print("="*60)
+        log.info("login.succeeded", user_id=user_id, method="password+2fa" if is_2fa_enabled else "password")
         
         return {
             "success": True,
@@ -217,38 +229,27 @@ class AuthService:
                 "message": str
             }
         """
-        print(f"\n🔐 2FA Verification: {email}")
-        print("="*60)
-        
-        # 1. TOTP token doğrula
-        is_valid = self.twofa.verify_2fa_token(email, token)
+        # 1. TOTP token doğrula (last_used güncellemesi batch'e eklenir)
+        batch = self.db.batch()
+        is_valid = self.twofa.verify_2fa_token(email, token, batch=batch)
         
         if not is_valid:
-            print("   ❌ Geçersiz 2FA kodu")
+            log.info("2fa.failed", user_id=self.id_gen.generate_user_id(email))
             return {
                 "success": False,
                 "message": "Invalid 2FA code"
             }
         
-        print("   ✅ 2FA doğrulandı")
-        
         # 2. User ID al
         user_id = self.id_gen.generate_user_id(email)
         
         # 3. JWT token oluştur
         tokens = self.jwt.create_token_pair(user_id, email)
         
-        # 4. Last login güncelle
-        user_ref = self.db.collection(self.collections['users']).document(user_id)
-        user_ref.update({
-            "last_login": datetime.utcnow()
-        })
-        
-        # 5. Session kaydet
-        self._save_session(user_id, tokens['access_token'], tokens['refresh_token'])
+        # 4. 2FA last_used + last login + session tek batch commit'inde
+        self._commit_login(batch, user_id, tokens)
         
-        print("   ✅ Login başarılı (2FA ile)")
-        print("="*60)
+        log.info("login.succeeded", user_id=user_id, method="2fa")
         
         return {
             "success": True,
@@ -258,11 +259,32 @@ class AuthService:
             "message": "Login successful with 2FA"
         }
     
-    def _save_session(self, user_id: str, access_token: str, refresh_token: str):
+    def _commit_login(self, batch, user_id: str, tokens: Dict):
+        """
+        Kimlik doğrulama sonrası yazmaları tek RPC'de commit et
+        
+        Performans: last_login update'i ve session set'i ayrı ayrı gönderilince
+        login başına sıralı 2 ekstra round trip oluyordu. WriteBatch atomiktir:
+        session yazılamazsa last_login de güncellenmez.
+        
+        Args:
+            batch: Firestore WriteBatch (içinde önceden eklenmiş yazmalar olabilir)
+            user_id: User ID
+            tokens: JWTManager.create_token_pair sonucu
+        """
+        user_ref = self.db.collection(self.collections['users']).document(user_id)
+        batch.update(user_ref, {
+            "last_login": datetime.utcnow()
+        })
+        self._save_session(batch, user_id, tokens['access_token'], tokens['refresh_token'])
+        batch.commit()
+    
+    def _save_session(self, batch, user_id: str, access_token: str, refresh_token: str):
         """
-        Session'ı Firestore'a şifreli kaydet
+        Session'ı şifreli olarak batch'e ekle (commit çağıran tarafta)
         
         Args:
+            batch: Firestore WriteBatch
             user_id: User ID
             access_token: JWT access token
             refresh_token: JWT refresh token
@@ -286,11 +308,11 @@ class AuthService:
             fields_to_encrypt=['access_token', 'refresh_token']
         )
         
-        # Firestore'a kaydet
+        # Batch'e ekle
         session_ref = self.db.collection(self.collections['sessions']).document(session_id)
-        session_ref.set(encrypted_doc)
+        batch.set(session_ref, encrypted_doc)
         
-        print(f"   💾 Session kaydedildi: {session_id[:16]}...")
+        log.debug("session.saved", user_id=user_id)
     
     def verify_access_token(self, token: str) -> Optional[Dict]:
         """
@@ -335,6 +357,7 @@ class AuthService:
 
 # Test
 if __name__ == "__main__":
+    from firebase_config import FirebaseConfig
     print("🧪 Auth Service Test - Sprint 4\n")
     
     # Initialize
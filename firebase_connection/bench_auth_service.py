@@ -0,0 +1,147 @@
+"""
+AuthService offline benchmark'ı (Firebase projesi gerekmez)
+
+Kullanım (firebase_connection/ dizininden):
+    python bench_auth_service.py --users 50 --logins 2000 --threads 1,8,32 --read-ms 8 --write-ms 12
+    python bench_auth_service.py --mode sync,async --threads 1,32,128
+
+AuthService, gecikme modeli eklenmiş InMemoryDocumentStore ile çalıştırılır. Her thread
+sayısı için login throughput'u, gecikme yüzdelikleri ve login başına RPC sayısı yazılır.
+--mode async ile AsyncAuthService tek event loop'ta çalışır; --threads değeri o zaman
+aynı anda bekleyen login sayısıdır (api_routes.py'deki tek uvicorn worker'ına karşılık).
+bcrypt maliyeti --bcrypt-rounds ile düşürülebilir, böylece ölçülen kısım Firestore
+round trip'leri olur.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import threading
+import time
+
+import bcrypt
+from cryptography.fernet import Fernet
+
+from document_store import AsyncInMemoryDocumentStore, InMemoryDocumentStore, LatencyModel
+
+
+def seed_users(store, service, count: int, password: str, rounds: int) -> list:
+    emails = [f"bench-{i}@example.com" for i in range(count)]
+    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+    batch = store.batch()
+    for email in emails:
+        user_id = service.id_gen.generate_user_id(email)
+        batch.set(store.collection("users").document(user_id), service.encryption.encrypt_dict(
+            {"email": email, "hashed_password": hashed, "is_2fa_enabled": False, "last_login": None},
+            fields_to_encrypt=["hashed_password"],
+        ))
+    batch.commit()
+    return emails
+
+
+def run(service, emails: list, password: str, logins: int, threads: int) -> dict:
+    per_thread = max(1, logins // threads)
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(offset: int):
+        samples = []
+        for i in range(per_thread):
+            email = emails[(offset + i) % len(emails)]
+            started = time.perf_counter()
+            result = service.login(email, password)
+            samples.append(time.perf_counter() - started)
+            if not result["success"]:
+                raise RuntimeError(f"Login başarısız: {result}")
+        with lock:
+            latencies.extend(samples)
+
+    service.db.reset_stats()
+    workers = [threading.Thread(target=worker, args=(i * per_thread,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        "logins_per_sec": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(total - 1, int(total * 0.99))] * 1000,
+        "rpc_per_login": service.db.stats()["total"] / total,
+    }
+
+
+def run_async(service, emails: list, password: str, logins: int, concurrency: int) -> dict:
+    per_task = max(1, logins // concurrency)
+    latencies = []
+
+    async def worker(offset: int):
+        for i in range(per_task):
+            email = emails[(offset + i) % len(emails)]
+            started = time.perf_counter()
+            result = await service.login(email, password)
+            latencies.append(time.perf_counter() - started)
+            if not result["success"]:
+                raise RuntimeError(f"Login başarısız: {result}")
+
+    async def scenario():
+        await asyncio.gather(*(worker(i * per_task) for i in range(concurrency)))
+
+    service.db.reset_stats()
+    started = time.perf_counter()
+    asyncio.run(scenario())
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        "logins_per_sec": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(total - 1, int(total * 0.99))] * 1000,
+        "rpc_per_login": service.db.stats()["total"] / total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=2000)
+    parser.add_argument("--threads", default="1,8,32")
+    parser.add_argument("--mode", default="sync", help="sync, async veya sync,async")
+    parser.add_argument("--read-ms", type=float, default=8.0)
+    parser.add_argument("--write-ms", type=float, default=12.0)
+    parser.add_argument("--commit-ms", type=float, default=15.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    args = parser.parse_args()
+
+    os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+    modes = args.mode.split(",")
+
+    store = InMemoryDocumentStore(latency=LatencyModel(args.read_ms, args.write_ms, args.commit_ms, args.jitter))
+    password = "benchmark-password"
+    services = {}
+    if "sync" in modes:
+        from auth_service import AuthService
+        services["sync"] = AuthService(store=store)
+    if "async" in modes:
+        from async_auth_service import AsyncAuthService
+        services["async"] = AsyncAuthService(store=AsyncInMemoryDocumentStore(store))
+    # Kullanıcılar senkron depoya yazılır, async görünüm aynı veriyi okur
+    emails = seed_users(store, next(iter(services.values())), args.users, password, args.bcrypt_rounds)
+
+    print(f"{'mode':>6} {'threads':>8} {'logins/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'rpc/login':>10}")
+    for mode in modes:
+        runner = run_async if mode == "async" else run
+        for threads in (int(value) for value in args.threads.split(",")):
+            result = runner(services[mode], emails, password, args.logins, threads)
+            print(f"{mode:>6} {threads:>8} {result['logins_per_sec']:>10.0f} {result['p50_ms']:>8.1f} "
+                  f"{result['p99_ms']:>8.1f} {result['rpc_per_login']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
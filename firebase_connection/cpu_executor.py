@@ -0,0 +1,55 @@
+import asyncio
+import atexit
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    """
+    CPU-bound auth işleri için sınırlı thread havuzu (process başına tek)
+
+    bcrypt ve cryptography (Fernet) çalışırken GIL'i bırakır, bu yüzden thread
+    havuzu gerçek paralellik sağlar ve event loop bu sürede başka istekleri
+    (Firestore RPC'lerini) ilerletir. Havuz sınırlı olduğu için yük altında
+    bcrypt işleri kuyrukta bekler, event loop'u değil.
+
+    Ortam değişkeni:
+        AUTH_CPU_WORKERS: Thread sayısı (varsayılan: CPU sayısı)
+    """
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = int(os.getenv("AUTH_CPU_WORKERS", "0")) or os.cpu_count() or 4
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auth-cpu")
+                atexit.register(_executor.shutdown, wait=False)
+    return _executor
+
+
+async def run_cpu(func: Callable, *args, **kwargs):
+    """
+    func(*args, **kwargs)'ı CPU havuzunda çalıştır ve sonucunu bekle
+
+    Kullanım:
+        match = await run_cpu(bcrypt.checkpw, password_bytes, stored_hash_bytes)
+    """
+    loop = asyncio.get_running_loop()
+    if kwargs:
+        func = functools.partial(func, *args, **kwargs)
+        args = ()
+    return await loop.run_in_executor(get_cpu_executor(), func, *args)
+
+
+def shutdown_cpu_executor():
+    """Havuzu kapat (uygulama kapanırken)"""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
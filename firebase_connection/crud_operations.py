@@ -1,12 +1,21 @@
-from firebase_config import FirebaseConfig
+from document_store import DocumentStore, get_document_store
 from data_schema import FirestoreSchema
 from datetime import datetime
+from typing import Optional
+from event_logger import get_event_logger
+
+log = get_event_logger("crud_operations")
 
 class FirestoreOperations:
     """Basit Firestore CRUD işlemleri"""
     
-    def __init__(self):
-        self.db = FirebaseConfig.get_db()
+    def __init__(self, store: Optional[DocumentStore] = None):
+        """
+        Args:
+            store: Doküman deposu (None ise get_document_store(): Firestore
+                   veya DOCUMENT_STORE=memory ile in-memory)
+        """
+        self.db = store or get_document_store()
         self.collections = FirestoreSchema.get_collections()
     
     # CREATE
@@ -18,7 +27,7 @@ class FirestoreOperations:
         doc_ref = self.db.collection(self.collections['users']).document()
         doc_ref.set(user_doc)
         
-        print(f"✅ Kullanıcı oluşturuldu: {doc_ref.id}")
+        log.debug("user.created", user_id=doc_ref.id)
         return doc_ref.id
     
     # READ
@@ -28,10 +37,9 @@ class FirestoreOperations:
         doc = doc_ref.get()
         
         if doc.exists:
-            print(f"✅ Kullanıcı bulundu: {user_id}")
             return doc.to_dict()
         else:
-            print(f"❌ Kullanıcı bulunamadı: {user_id}")
+            log.debug("user.not_found", user_id=user_id)
             return None
     
     def get_user_by_email(self, email: str) -> dict:
@@ -41,10 +49,9 @@ class FirestoreOperations:
         
         docs = query.stream()
         for doc in docs:
-            print(f"✅ Email ile kullanıcı bulundu: {email}")
             return {'id': doc.id, **doc.to_dict()}
         
-        print(f"❌ Email bulunamadı: {email}")
+        log.debug("user.not_found_by_email")
         return None
     
     # UPDATE
@@ -56,7 +63,7 @@ class FirestoreOperations:
         data['updated_at'] = datetime.utcnow()
         
         doc_ref.update(data)
-        print(f"✅ Kullanıcı güncellendi: {user_id}")
+        log.debug("user.updated", user_id=user_id)
         return True
     
     # DELETE
@@ -64,7 +71,7 @@ class FirestoreOperations:
         """Kullanıcıyı sil"""
         doc_ref = self.db.collection(self.collections['users']).document(user_id)
         doc_ref.delete()
-        print(f"✅ Kullanıcı silindi: {user_id}")
+        log.info("user.deleted", user_id=user_id)
         return True
     
     # LIST
@@ -77,12 +84,12 @@ class FirestoreOperations:
         for doc in docs:
             users.append({'id': doc.id, **doc.to_dict()})
         
-        print(f"✅ {len(users)} kullanıcı bulundu")
         return users
 
 
 # Test
 if __name__ == "__main__":
+    from firebase_config import FirebaseConfig
     print("🧪 Firestore CRUD Test\n")
     
     # Initialize
@@ -1,12 +1,50 @@
+import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class FirestoreSchema:
     """
     Firestore veri şeması tanımları
     3 ana koleksiyon: users, sessions, two_factor_auth
+    
+    2FA yerleşimi (TWO_FACTOR_LAYOUT ortam değişkeni):
+    - collection (varsayılan): two_factor_auth/{user_id} ayrı doküman
+    - embedded: şifreli 2FA bloğu users/{user_id}.two_factor alanında.
+      Login zaten user dokümanını okuduğu için 2FA doğrulaması ikinci
+      bir okuma gerektirmez; last_used aynı dokümana yazılır.
+      Geçiş: migrate_2fa_layout.py
     """
     
+    MIN_PASSWORD_LENGTH = 8
+    
+    TWO_FACTOR_COLLECTION = "collection"
+    TWO_FACTOR_EMBEDDED = "embedded"
+    TWO_FACTOR_FIELD = "two_factor"
+    
+    @staticmethod
+    def two_factor_layout() -> str:
+        """Aktif 2FA yerleşimi (collection | embedded)"""
+        layout = os.getenv("TWO_FACTOR_LAYOUT", FirestoreSchema.TWO_FACTOR_COLLECTION)
+        if layout not in (FirestoreSchema.TWO_FACTOR_COLLECTION, FirestoreSchema.TWO_FACTOR_EMBEDDED):
+            raise ValueError(f"Unknown TWO_FACTOR_LAYOUT: {layout}")
+        return layout
+    
+    @staticmethod
+    def validate_user_input(username: str, email: str, password: str) -> Optional[str]:
+        """
+        Kayıt girdisinin ucuz kontrolü (bcrypt ve Firestore'dan önce)
+        
+        Returns:
+            Hata mesajı veya None (geçerli)
+        """
+        if not username or not username.strip():
+            return "Username is required"
+        if not email or "@" not in email:
+            return "Invalid email"
+        if not password or len(password) < FirestoreSchema.MIN_PASSWORD_LENGTH:
+            return f"Password must be at least {FirestoreSchema.MIN_PASSWORD_LENGTH} characters"
+        return None
+    
     @staticmethod
     def user_document(username: str, email: str, hashed_password: str) -> Dict[str, Any]:
         """
@@ -62,6 +100,16 @@ class FirestoreSchema:
             "is_enabled": False
         }
     
+    @staticmethod
+    def embedded_two_factor(tfa_doc: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        two_factor_auth dokümanını users/{user_id}.two_factor bloğuna çevir
+        
+        user_id dokümanın kendisi olduğu için çıkarılır; secret_key zaten
+        şifreliyse şifreli kalır (çözme gerekmez)
+        """
+        return {key: value for key, value in tfa_doc.items() if key != "user_id"}
+    
     @staticmethod
     def get_collections():
         """Tüm koleksiyon isimlerini döndür"""
@@ -0,0 +1,530 @@
+import asyncio
+import copy
+import os
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+
+class DocumentStore(ABC):
+    """
+    Doküman deposu arayüzü (Firestore client'ının kullandığımız alt kümesi)
+
+    Servisler (AuthService, Secure2FAOperations, FirestoreOperations,
+    SecureFirestoreOperations) sadece bu arayüzü kullanır:
+        store.collection(name).document(doc_id).get() / create() / set() / update() / delete()
+        store.collection(name).where(field, "==", value).limit(n).stream()
+        batch = store.batch(); batch.set(...); batch.update(...); batch.commit()
+
+    Uygulamalar:
+    - FirestoreDocumentStore: gerçek Firestore (firebase_admin)
+    - InMemoryDocumentStore: test ve benchmark için, gecikme modeli eklenebilir
+    """
+
+    @abstractmethod
+    def collection(self, name: str):
+        """Koleksiyon referansı"""
+
+    @abstractmethod
+    def batch(self):
+        """Atomik yazma batch'i (commit = tek RPC)"""
+
+    def stats(self) -> Dict:
+        """RPC sayaçları (destekleyen depolar için)"""
+        return {}
+
+
+class FirestoreDocumentStore(DocumentStore):
+    """
+    Gerçek Firestore deposu
+    firebase_admin sadece ilk kullanımda import edilir, böylece in-memory
+    depo ile çalışan test/benchmark'lar Firebase kurulumu gerektirmez
+    """
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from firebase_config import FirebaseConfig
+            self._client = FirebaseConfig.get_db()
+        return self._client
+
+    def collection(self, name: str):
+        return self.client.collection(name)
+
+    def batch(self):
+        return self.client.batch()
+
+
+# ============================================================================
+# IN-MEMORY DEPO
+# ============================================================================
+
+class DocumentNotFound(Exception):
+    """Olmayan dokümana update (Firestore: google.api_core.exceptions.NotFound)"""
+
+
+class DocumentAlreadyExists(Exception):
+    """Var olan dokümana create (Firestore: google.api_core.exceptions.AlreadyExists)"""
+
+
+try:
+    from google.api_core.exceptions import AlreadyExists as _FirestoreAlreadyExists
+    DOCUMENT_EXISTS_ERRORS = (DocumentAlreadyExists, _FirestoreAlreadyExists)
+except ImportError:
+    DOCUMENT_EXISTS_ERRORS = (DocumentAlreadyExists,)
+
+
+class LatencyModel:
+    """
+    RPC başına yapay gecikme
+
+    Args:
+        read_ms: get / stream başına gecikme
+        write_ms: tekil set / update / delete başına gecikme
+        commit_ms: batch commit başına gecikme
+        jitter: Oransal rastgele sapma (0.2 -> ±%20)
+
+    Örnek (aynı bölgedeki Firestore'a yakın değerler):
+        LatencyModel(read_ms=8, write_ms=12, commit_ms=15, jitter=0.2)
+    """
+
+    def __init__(self, read_ms: float = 0.0, write_ms: float = 0.0,
+                 commit_ms: float = 0.0, jitter: float = 0.0):
+        self.delays = {"read": read_ms / 1000, "write": write_ms / 1000, "commit": commit_ms / 1000}
+        self.jitter = jitter
+
+    def __call__(self, kind: str) -> float:
+        delay = self.delays[kind]
+        if delay and self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return delay
+
+
+def _update_fields(current: Dict, data: Dict) -> Dict:
+    # update() anahtarındaki nokta Firestore'daki gibi alan yoludur: "two_factor.last_used"
+    result = copy.deepcopy(current)
+    for key, value in data.items():
+        *parents, leaf = key.split(".")
+        target = result
+        for part in parents:
+            child = target.get(part)
+            if not isinstance(child, dict):
+                child = target[part] = {}
+            target = child
+        target[leaf] = copy.deepcopy(value)
+    return result
+
+
+class InMemoryDocumentSnapshot:
+    def __init__(self, doc_id: str, data: Optional[Dict]):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self) -> Optional[Dict]:
+        # Firestore gibi kopya döndürür: çağıranın değişiklikleri depoya yansımaz
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field: str) -> Any:
+        return (self._data or {}).get(field)
+
+
+class InMemoryDocumentReference:
+    def __init__(self, store: "InMemoryDocumentStore", collection: str, doc_id: str):
+        self._store = store
+        self.collection_name = collection
+        self.id = doc_id
+
+    @property
+    def key(self):
+        return (self.collection_name, self.id)
+
+    def get(self) -> InMemoryDocumentSnapshot:
+        self._store._rpc("read", "get")
+        return self._store._read(self)
+
+    def create(self, data: Dict):
+        self._store._rpc("write", "create")
+        self._store._apply([("create", self, data, False)])
+
+    def set(self, data: Dict, merge: bool = False):
+        self._store._rpc("write", "set")
+        self._store._apply([("set", self, data, merge)])
+
+    def update(self, data: Dict):
+        self._store._rpc("write", "update")
+        self._store._apply([("update", self, data, False)])
+
+    def delete(self):
+        self._store._rpc("write", "delete")
+        self._store._apply([("delete", self, None, False)])
+
+
+class InMemoryQuery:
+    _OPERATORS = {
+        "==": lambda a, b: a == b,
+        "!=": lambda a, b: a != b,
+        "<": lambda a, b: a is not None and a < b,
+        "<=": lambda a, b: a is not None and a <= b,
+        ">": lambda a, b: a is not None and a > b,
+        ">=": lambda a, b: a is not None and a >= b,
+        "in": lambda a, b: a in b,
+        "array_contains": lambda a, b: isinstance(a, list) and b in a,
+    }
+
+    def __init__(self, store: "InMemoryDocumentStore", collection: str,
+                 filters: Optional[List] = None, limit_count: Optional[int] = None):
+        self._store = store
+        self._collection = collection
+        self._filters = filters or []
+        self._limit = limit_count
+
+    def _derive(self, filters: List, limit_count: Optional[int]) -> "InMemoryQuery":
+        return InMemoryQuery(self._store, self._collection, filters, limit_count)
+
+    def where(self, field: str, op: str, value: Any) -> "InMemoryQuery":
+        if op not in self._OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        return self._derive(self._filters + [(field, op, value)], self._limit)
+
+    def limit(self, count: int) -> "InMemoryQuery":
+        return self._derive(self._filters, count)
+
+    def stream(self):
+        self._store._rpc("read", "query")
+        return iter(self._match())
+
+    def _match(self) -> List[InMemoryDocumentSnapshot]:
+        matches = []
+        for doc_id, data in self._store._snapshot_collection(self._collection):
+            if all(self._OPERATORS[op](data.get(field), value) for field, op, value in self._filters):
+                matches.append(InMemoryDocumentSnapshot(doc_id, data))
+                if self._limit is not None and len(matches) >= self._limit:
+                    break
+        return matches
+
+
+class InMemoryCollectionReference(InMemoryQuery):
+    def __init__(self, store: "InMemoryDocumentStore", name: str):
+        super().__init__(store, name)
+        self.id = name
+
+    def document(self, doc_id: Optional[str] = None) -> InMemoryDocumentReference:
+        # Firestore gibi: ID verilmezse 20 karakterlik rastgele ID
+        return InMemoryDocumentReference(self._store, self.id, doc_id or uuid.uuid4().hex[:20])
+
+
+class InMemoryWriteBatch:
+    def __init__(self, store: "InMemoryDocumentStore"):
+        self._store = store
+        self._writes = []
+
+    def create(self, ref: InMemoryDocumentReference, data: Dict):
+        self._writes.append(("create", ref, data, False))
+        return self
+
+    def set(self, ref: InMemoryDocumentReference, data: Dict, merge: bool = False):
+        self._writes.append(("set", ref, data, merge))
+        return self
+
+    def update(self, ref: InMemoryDocumentReference, data: Dict):
+        self._writes.append(("update", ref, data, False))
+        return self
+
+    def delete(self, ref: InMemoryDocumentReference):
+        self._writes.append(("delete", ref, None, False))
+        return self
+
+    def commit(self):
+        self._store._rpc("commit", "commit")
+        self._store._apply(self._writes)
+        self._writes = []
+
+
+class InMemoryDocumentStore(DocumentStore):
+    """
+    Thread-safe in-memory Firestore muadili (test ve offline benchmark için)
+
+    - Dokümanlar kopyalanarak saklanır/döndürülür (Firestore serileştirmesi gibi)
+    - Batch commit atomiktir: bir update olmayan dokümana ya da bir create var olan
+      dokümana giderse hiçbir yazma uygulanmaz
+    - Her RPC stats()'ta sayılır ve LatencyModel kadar bekletilir (lock dışında,
+      böylece eşzamanlı istekler gerçek istemcideki gibi paralel bekler)
+
+    Args:
+        latency: LatencyModel veya (kind -> saniye) çağrılabilir; None = gecikme yok
+    """
+
+    def __init__(self, latency: Optional[Callable[[str], float]] = None):
+        self.latency = latency
+        self._lock = threading.RLock()
+        self._collections: Dict[str, Dict[str, Dict]] = {}
+        self._rpc_counts: Dict[str, int] = {}
+
+    def collection(self, name: str) -> InMemoryCollectionReference:
+        return InMemoryCollectionReference(self, name)
+
+    def batch(self) -> InMemoryWriteBatch:
+        return InMemoryWriteBatch(self)
+
+    def _count(self, kind: str, name: str) -> float:
+        # RPC'yi say, beklenecek gecikmeyi döndür
+        with self._lock:
+            self._rpc_counts[name] = self._rpc_counts.get(name, 0) + 1
+        return self.latency(kind) if self.latency is not None else 0.0
+
+    def _rpc(self, kind: str, name: str):
+        delay = self._count(kind, name)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _read(self, ref: InMemoryDocumentReference) -> InMemoryDocumentSnapshot:
+        with self._lock:
+            data = self._collections.get(ref.collection_name, {}).get(ref.id)
+            return InMemoryDocumentSnapshot(ref.id, copy.deepcopy(data) if data is not None else None)
+
+    def _snapshot_collection(self, name: str):
+        with self._lock:
+            return [(doc_id, copy.deepcopy(data)) for doc_id, data in self._collections.get(name, {}).items()]
+
+    def _apply(self, writes: List):
+        with self._lock:
+            # Önce doğrula, sonra uygula (atomik)
+            pending = {}
+            for op, ref, data, merge in writes:
+                docs = self._collections.get(ref.collection_name, {})
+                current = pending.get(ref.key, docs.get(ref.id))
+                if op == "update":
+                    if current is None:
+                        raise DocumentNotFound(f"No document to update: {ref.collection_name}/{ref.id}")
+                    pending[ref.key] = _update_fields(current, data)
+                elif op == "create":
+                    if current is not None:
+                        raise DocumentAlreadyExists(f"Document already exists: {ref.collection_name}/{ref.id}")
+                    pending[ref.key] = copy.deepcopy(data)
+                elif op == "set":
+                    base = current if (merge and current is not None) else {}
+                    pending[ref.key] = {**base, **copy.deepcopy(data)}
+                else:
+                    pending[ref.key] = None
+            for (collection, doc_id), data in pending.items():
+                docs = self._collections.setdefault(collection, {})
+                if data is None:
+                    docs.pop(doc_id, None)
+                else:
+                    docs[doc_id] = data
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = dict(self._rpc_counts)
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def reset_stats(self):
+        with self._lock:
+            self._rpc_counts.clear()
+
+
+# ============================================================================
+# ASYNC DEPO
+# ============================================================================
+
+class AsyncDocumentStore(ABC):
+    """
+    Async doküman deposu arayüzü (Firestore AsyncClient'ın kullandığımız alt kümesi)
+
+    Referans/sorgu/batch oluşturma senkron, RPC'ler awaitable:
+        await store.collection(name).document(doc_id).get() / create() / set() / update() / delete()
+        async for doc in store.collection(name).where(field, "==", value).stream(): ...
+        batch = store.batch(); batch.set(...); await batch.commit()
+
+    Uygulamalar:
+    - FirestoreAsyncDocumentStore: gerçek Firestore (firestore_async)
+    - AsyncInMemoryDocumentStore: InMemoryDocumentStore'un async görünümü
+    """
+
+    @abstractmethod
+    def collection(self, name: str):
+        """Koleksiyon referansı"""
+
+    @abstractmethod
+    def batch(self):
+        """Atomik yazma batch'i (await commit() = tek RPC)"""
+
+    def stats(self) -> Dict:
+        """RPC sayaçları (destekleyen depolar için)"""
+        return {}
+
+
+class FirestoreAsyncDocumentStore(AsyncDocumentStore):
+    """
+    Gerçek Firestore deposu (google.cloud.firestore.AsyncClient)
+    RPC'ler gRPC aio üzerinden gider, event loop bloklanmaz
+    """
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from firebase_config import FirebaseConfig
+            self._client = FirebaseConfig.get_async_db()
+        return self._client
+
+    def collection(self, name: str):
+        return self.client.collection(name)
+
+    def batch(self):
+        return self.client.batch()
+
+
+async def _async_rpc(store: InMemoryDocumentStore, kind: str, name: str):
+    # Gecikme asyncio.sleep ile: bekleyen RPC'ler event loop'u bloklamaz
+    delay = store._count(kind, name)
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+class AsyncInMemoryDocumentReference(InMemoryDocumentReference):
+    async def get(self) -> InMemoryDocumentSnapshot:
+        await _async_rpc(self._store, "read", "get")
+        return self._store._read(self)
+
+    async def create(self, data: Dict):
+        await _async_rpc(self._store, "write", "create")
+        self._store._apply([("create", self, data, False)])
+
+    async def set(self, data: Dict, merge: bool = False):
+        await _async_rpc(self._store, "write", "set")
+        self._store._apply([("set", self, data, merge)])
+
+    async def update(self, data: Dict):
+        await _async_rpc(self._store, "write", "update")
+        self._store._apply([("update", self, data, False)])
+
+    async def delete(self):
+        await _async_rpc(self._store, "write", "delete")
+        self._store._apply([("delete", self, None, False)])
+
+
+class AsyncInMemoryQuery(InMemoryQuery):
+    def _derive(self, filters: List, limit_count: Optional[int]) -> "AsyncInMemoryQuery":
+        return AsyncInMemoryQuery(self._store, self._collection, filters, limit_count)
+
+    async def stream(self):
+        await _async_rpc(self._store, "read", "query")
+        for snapshot in self._match():
+            yield snapshot
+
+
+class AsyncInMemoryCollectionReference(AsyncInMemoryQuery):
+    def __init__(self, store: InMemoryDocumentStore, name: str):
+        super().__init__(store, name)
+        self.id = name
+
+    def document(self, doc_id: Optional[str] = None) -> AsyncInMemoryDocumentReference:
+        return AsyncInMemoryDocumentReference(self._store, self.id, doc_id or uuid.uuid4().hex[:20])
+
+
+class AsyncInMemoryWriteBatch(InMemoryWriteBatch):
+    async def commit(self):
+        await _async_rpc(self._store, "commit", "commit")
+        self._store._apply(self._writes)
+        self._writes = []
+
+
+class AsyncInMemoryDocumentStore(AsyncDocumentStore):
+    """
+    InMemoryDocumentStore'un async görünümü
+
+    Veri ve RPC sayaçları sarılan depo ile ortaktır: senkron ve async servisler
+    aynı process'te aynı dokümanları görür. Gecikme modeli asyncio.sleep ile
+    uygulanır, böylece tek event loop'ta çok sayıda istek aynı anda bekleyebilir.
+
+    Args:
+        store: Sarılacak InMemoryDocumentStore (None ise yeni, boş depo)
+    """
+
+    def __init__(self, store: Optional[InMemoryDocumentStore] = None):
+        self.store = store or InMemoryDocumentStore()
+
+    def collection(self, name: str) -> AsyncInMemoryCollectionReference:
+        return AsyncInMemoryCollectionReference(self.store, name)
+
+    def batch(self) -> AsyncInMemoryWriteBatch:
+        return AsyncInMemoryWriteBatch(self.store)
+
+    def stats(self) -> Dict:
+        return self.store.stats()
+
+    def reset_stats(self):
+        self.store.reset_stats()
+
+
+# ============================================================================
+# VARSAYILAN DEPO
+# ============================================================================
+
+_default_store = None
+_default_async_store = None
+_default_lock = threading.Lock()
+
+
+def get_document_store() -> DocumentStore:
+    """
+    Servislerin varsayılan deposu (process başına tek)
+
+    Ortam değişkeni:
+        DOCUMENT_STORE=firestore (varsayılan) | memory
+    """
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                if os.getenv("DOCUMENT_STORE", "firestore") == "memory":
+                    _default_store = InMemoryDocumentStore()
+                else:
+                    _default_store = FirestoreDocumentStore()
+    return _default_store
+
+
+def set_document_store(store: Optional[DocumentStore]):
+    """Varsayılan depoyu değiştir (test / benchmark kurulumları için)"""
+    global _default_store, _default_async_store
+    with _default_lock:
+        _default_store = store
+        # Async görünüm yeni depodan tekrar türetilsin
+        _default_async_store = None
+
+
+def get_async_document_store() -> AsyncDocumentStore:
+    """
+    Async servislerin varsayılan deposu (process başına tek)
+
+    Varsayılan senkron depo in-memory ise onun async görünümü döner (veri ortak),
+    aksi halde Firestore AsyncClient deposu.
+    """
+    global _default_async_store
+    if _default_async_store is None:
+        store = get_document_store()
+        with _default_lock:
+            if _default_async_store is None:
+                if isinstance(store, InMemoryDocumentStore):
+                    _default_async_store = AsyncInMemoryDocumentStore(store)
+                else:
+                    _default_async_store = FirestoreAsyncDocumentStore()
+    return _default_async_store
+
+
+def set_async_document_store(store: Optional[AsyncDocumentStore]):
+    """Varsayılan async depoyu değiştir (test / benchmark kurulumları için)"""
+    global _default_async_store
+    with _default_lock:
+        _default_async_store = store
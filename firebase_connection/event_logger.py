@@ -0,0 +1,199 @@
+"""
+Yapılandırılmış auth olay log'u (JSON, arka plan thread'inde yazılır)
+
+backend/app/core/eventlog.py'nin firebase_connection sürümü: aynı JSONFormatter,
+EventSampler ve kuyruk davranışı, ayarlar ortam değişkenlerinden okunur. Gerekçeler
+için oraya bakın; iki dosyadaki davranış birlikte değiştirilmeli.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None) or record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+class EventSampler(logging.Filter):
+    """
+    - sample_rates: {"login.succeeded": 0.75} -> 4 kayıttan 3'ü (WARNING ve üstü hariç)
+    - rate_cap_per_second: olay başına saniyede en fazla kayıt (0 = sınırsız)
+    """
+
+    def __init__(self, sample_rates: Dict[str, float], rate_cap_per_second: float):
+        super().__init__()
+        self.sample_rates = dict(sample_rates)
+        self.rate_cap = rate_cap_per_second
+        self._lock = threading.Lock()
+        self._credit = {}
+        self._windows = {}
+        self.sampled_out = {}
+        self.rate_limited = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None) or record.name
+        rate = self.sample_rates.get(event, 1.0)
+        second = int(time.monotonic())
+        with self._lock:
+            if rate < 1.0 and record.levelno < logging.WARNING:
+                credit = self._credit.get(event, 1.0 - rate) + rate
+                if rate <= 0 or credit < 1.0:
+                    self._credit[event] = credit
+                    self.sampled_out[event] = self.sampled_out.get(event, 0) + 1
+                    return False
+                self._credit[event] = credit - 1.0
+            if self.rate_cap > 0:
+                window = self._windows.get(event)
+                if window is None or window[0] != second:
+                    window = self._windows[event] = [second, 0]
+                if window[1] >= self.rate_cap:
+                    self.rate_limited[event] = self.rate_limited.get(event, 0) + 1
+                    return False
+                window[1] += 1
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Sınırlı kuyruğa beklemeden yazar, kuyruk doluysa kaydı düşürür"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class EventLogger:
+    """
+    HAFTA 4 - print() banner'larının yerine
+
+    Kullanım:
+        log = get_event_logger("auth_service")
+        log.info("login.failed", reason="bad_password", user_id=user_id)
+
+    Parola, TOTP kodu/secret ve token'lar asla log'a yazılmaz.
+    """
+
+    _queue = None
+    _handler = None
+    _sampler = None
+    _listener = None
+
+    def __init__(self, name: str):
+        self.configure()
+        self.logger = logging.getLogger(f"authguard.{name}")
+
+    @classmethod
+    def configure(cls):
+        """
+        Log kuyruğunu ve arka plan yazma thread'ini bir kez başlat
+
+        Ortam değişkenleri:
+            LOG_LEVEL: INFO (varsayılan)
+            LOG_QUEUE_SIZE: 10000
+            LOG_SAMPLE_RATES: '{"login.succeeded": 0.1}'
+            LOG_EVENT_RATE_CAP: 100 (olay başına saniyede)
+        """
+        if cls._listener is not None:
+            return
+        cls._queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+        cls._handler = NonBlockingQueueHandler(cls._queue)
+        cls._sampler = EventSampler(
+            json.loads(os.getenv("LOG_SAMPLE_RATES", "{}")),
+            float(os.getenv("LOG_EVENT_RATE_CAP", "100")),
+        )
+        cls._handler.addFilter(cls._sampler)
+
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(JSONFormatter())
+        cls._listener = logging.handlers.QueueListener(cls._queue, output)
+        cls._listener.start()
+        atexit.register(cls._listener.stop)
+
+        root = logging.getLogger("authguard")
+        root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        root.addHandler(cls._handler)
+        root.propagate = False
+
+    @classmethod
+    def stats(cls) -> Dict:
+        """
+        Log maliyeti gözlemi
+
+        Returns:
+            Kuyruk doluluğu, yazılan / düşürülen / örneklenen kayıt sayıları
+        """
+        if cls._listener is None:
+            return {}
+        with cls._sampler._lock:
+            sampled_out = dict(cls._sampler.sampled_out)
+            rate_limited = dict(cls._sampler.rate_limited)
+        return {
+            "queue_size": cls._queue.qsize(),
+            "queue_capacity": cls._queue.maxsize,
+            "enqueued": cls._handler.enqueued,
+            "dropped_queue_full": cls._handler.dropped,
+            "sampled_out": sampled_out,
+            "rate_limited": rate_limited,
+        }
+
+    def log(self, level: int, event: str, exc_info=None, **fields):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, event, exc_info=exc_info, extra={"event": event, "fields": fields})
+
+    def debug(self, event: str, **fields):
+        self.log(logging.DEBUG, event, **fields)
+
+    def info(self, event: str, **fields):
+        self.log(logging.INFO, event, **fields)
+
+    def warning(self, event: str, **fields):
+        self.log(logging.WARNING, event, **fields)
+
+    def error(self, event: str, **fields):
+        self.log(logging.ERROR, event, **fields)
+
+
+def get_event_logger(name: str, level: Optional[str] = None) -> EventLogger:
+    """
+    Modül için olay logger'ı al
+
+    Args:
+        name: Modül adı (ör. "auth_service")
+        level: Bu modül için ayrı seviye (opsiyonel)
+    """
+    log = EventLogger(name)
+    if level:
+        log.logger.setLevel(level.upper())
+    return log
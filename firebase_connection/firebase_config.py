@@ -1,14 +1,18 @@
 import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials, firestore, firestore_async
 import os
 from dotenv import load_dotenv
+from event_logger import get_event_logger
 
 load_dotenv()
 
+log = get_event_logger("firebase_config")
+
 class FirebaseConfig:
     """Firebase bağlantı konfigürasyonu"""
     
     _db = None
+    _async_db = None
     
     @classmethod
     def initialize(cls):
@@ -23,7 +27,7 @@ class FirebaseConfig:
             # Firebase uygulamasını başlat
             firebase_admin.initialize_app(cred)
             
-            print("✅ Firebase bağlantısı başarılı!")
+            log.info("firebase.initialized")
         
         # Firestore database referansı
         cls._db = firestore.client()
@@ -35,6 +39,14 @@ class FirebaseConfig:
         if cls._db is None:
             cls._db = cls.initialize()
         return cls._db
+    
+    @classmethod
+    def get_async_db(cls):
+        """Async database referansını al (google.cloud.firestore.AsyncClient)"""
+        if cls._async_db is None:
+            cls.get_db()
+            cls._async_db = firestore_async.client()
+        return cls._async_db
 
 # Test
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+"""
+2FA dokümanlarını user dokümanına taşıma (collection -> embedded yerleşim)
+
+Kullanım (firebase_connection/ dizininden):
+    python migrate_2fa_layout.py --dry-run
+    python migrate_2fa_layout.py --batch-size 200
+    python migrate_2fa_layout.py --delete-source   # two_factor_auth dokümanlarını da sil
+
+two_factor_auth/{user_id} dokümanları users/{user_id}.two_factor alanına, şifreli
+secret_key çözülmeden kopyalanır. İki sorgu (two_factor_auth ve 2FA'sı açık user'lar)
+ve batch başına tek commit yapılır. Embedded bloğu kaynak dokümanla aynı olan user'lar
+atlanır; geçiş sırasında 2FA'yı yeniden kuran (yeni secret) user'ın bloğu bir sonraki
+çalıştırmada güncellenir, araç tekrar çalıştırılabilir. Geçiş sırasında servisler collection yerleşiminde kalmalı;
+bitince TWO_FACTOR_LAYOUT=embedded ile yeniden başlatılır.
+"""
+import argparse
+from typing import Dict
+
+from data_schema import FirestoreSchema
+from document_store import DocumentStore, FirestoreDocumentStore, get_document_store
+from event_logger import get_event_logger
+
+log = get_event_logger("migrate_2fa_layout")
+
+# Firestore batch sınırı 500 yazma; doküman başına en fazla 2 yazma (update + delete)
+MAX_BATCH_SIZE = 250
+
+
+def migrate_two_factor_to_embedded(store: DocumentStore, batch_size: int = 200,
+                                   delete_source: bool = False, dry_run: bool = False) -> Dict[str, int]:
+    """
+    two_factor_auth dokümanlarını users/{user_id}.two_factor alanına taşı
+
+    Args:
+        store: Doküman deposu
+        batch_size: Commit başına taşınan doküman (en fazla MAX_BATCH_SIZE)
+        delete_source: Taşınan two_factor_auth dokümanlarını aynı batch'te sil
+        dry_run: Yazma yapmadan sadece say
+
+    Returns:
+        {'migrated', 'already_embedded', 'orphaned', 'batches'}
+    """
+    if not 0 < batch_size <= MAX_BATCH_SIZE:
+        raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+
+    collections = FirestoreSchema.get_collections()
+    users = store.collection(collections['users'])
+    two_factor = store.collection(collections['two_factor_auth'])
+
+    # 2FA'sı açık user'lar -> mevcut embedded blok (yoksa None)
+    enabled = {
+        doc.id: doc.get(FirestoreSchema.TWO_FACTOR_FIELD)
+        for doc in users.where('is_2fa_enabled', '==', True).stream()
+    }
+
+    stats = {'migrated': 0, 'already_embedded': 0, 'orphaned': 0, 'batches': 0}
+    batch, pending = store.batch(), 0
+
+    for doc in two_factor.stream():
+        # two_factor_auth doc_id = user_id (MD5DocIDGenerator.generate_2fa_id)
+        user_id = doc.id
+        if user_id not in enabled:
+            # User silinmiş ya da 2FA kapalı: update başarısız olur, atla
+            stats['orphaned'] += 1
+            continue
+        block = FirestoreSchema.embedded_two_factor(doc.to_dict())
+        if enabled[user_id] == block:
+            stats['already_embedded'] += 1
+            continue
+
+        # Blok yoksa ya da eskiyse (yeniden kurulum, last_used) kaynaktan yeniden yazılır
+        batch.update(users.document(user_id), {FirestoreSchema.TWO_FACTOR_FIELD: block})
+        if delete_source:
+            batch.delete(two_factor.document(doc.id))
+        stats['migrated'] += 1
+        pending += 1
+
+        if pending >= batch_size:
+            if not dry_run:
+                batch.commit()
+            stats['batches'] += 1
+            log.info("migrate_2fa.batch_committed", migrated=stats['migrated'], dry_run=dry_run)
+            batch, pending = store.batch(), 0
+
+    if pending:
+        if not dry_run:
+            batch.commit()
+        stats['batches'] += 1
+
+    log.info("migrate_2fa.done", dry_run=dry_run, **stats)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--delete-source", action="store_true")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    store = get_document_store()
+    if isinstance(store, FirestoreDocumentStore):
+        from firebase_config import FirebaseConfig
+        FirebaseConfig.initialize()
+
+    stats = migrate_two_factor_to_embedded(store, args.batch_size, args.delete_source, args.dry_run)
+    print(f"migrated={stats['migrated']} already_embedded={stats['already_embedded']} "
+          f"orphaned={stats['orphaned']} batches={stats['batches']}{' (dry run)' if args.dry_run else ''}")
+
+
+if __name__ == "__main__":
+    main()
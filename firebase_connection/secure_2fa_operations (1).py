@@ -1,11 +1,14 @@
-from firebase_config import FirebaseConfig
+from document_store import DocumentStore, get_document_store
 from data_schema import FirestoreSchema
 from encryption import EncryptionModule
 from md5_docid import MD5DocIDGenerator
 from totp_manager import TOTPManager
+from event_logger import get_event_logger
 from datetime import datetime
 from typing import Dict, Optional
 
+log = get_event_logger("secure_2fa_operations")
+
 class Secure2FAOperations:
     """
     2FA operasyonları - TOTP entegreli
@@ -18,12 +21,43 @@ class Secure2FAOperations:
     - Clock drift toleransı (±30 saniye)
     """
     
-    def __init__(self):
-        self.db = FirebaseConfig.get_db()
+    def __init__(self, store: Optional[DocumentStore] = None, layout: Optional[str] = None):
+        """
+        Args:
+            store: Doküman deposu (None ise get_document_store(): Firestore
+                   veya DOCUMENT_STORE=memory ile in-memory)
+            layout: 2FA yerleşimi (None ise FirestoreSchema.two_factor_layout())
+        """
+        self.db = store or get_document_store()
         self.collections = FirestoreSchema.get_collections()
         self.encryption = EncryptionModule()
         self.id_gen = MD5DocIDGenerator()
         self.totp = TOTPManager(issuer_name="AuthGuard")
+        self.layout = layout or FirestoreSchema.two_factor_layout()
+    
+    @property
+    def embedded(self) -> bool:
+        return self.layout == FirestoreSchema.TWO_FACTOR_EMBEDDED
+    
+    def _two_factor_ref(self, user_id: str):
+        """
+        2FA verisini tutan doküman ve alan öneki
+        
+        Returns:
+            (doc_ref, prefix): embedded'da users/{user_id} ve "two_factor.",
+            collection'da two_factor_auth/{user_id} ve ""
+        """
+        if self.embedded:
+            return self.db.collection(self.collections['users']).document(user_id), f"{FirestoreSchema.TWO_FACTOR_FIELD}."
+        tfa_id = self.id_gen.generate_2fa_id(user_id)
+        return self.db.collection(self.collections['two_factor_auth']).document(tfa_id), ""
+    
+    def _two_factor_data(self, doc) -> Optional[Dict]:
+        """Dokümandan (şifreli) 2FA verisi; yoksa None"""
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        return data.get(FirestoreSchema.TWO_FACTOR_FIELD) if self.embedded else data
     
     def enable_2fa(self, email: str) -> Dict[str, str]:
         """
@@ -40,19 +74,14 @@ class Secure2FAOperations:
                 'manual_entry_key': str (plain for display)
             }
         """
-        print(f"\n🔐 2FA Aktifleştirme Başlatıldı: {email}")
-        print("="*60)
-        
         # 1. User ID al
         user_id = self.id_gen.generate_user_id(email)
         
         # 2. TOTP secret üret
         totp_secret = self.totp.generate_secret()
-        print(f"   ✅ Secret oluşturuldu: {totp_secret[:8]}...")
         
         # 3. QR kod oluştur
         qr_code = self.totp.generate_qr_code(email, totp_secret)
-        print(f"   ✅ QR kod oluşturuldu")
         
         # 4. 2FA document hazırla
         tfa_doc = FirestoreSchema.two_factor_auth_document(
@@ -66,23 +95,27 @@ class Secure2FAOperations:
             fields_to_encrypt=['secret_key']
         )
         
-        # 6. Firestore'a kaydet
-        tfa_id = self.id_gen.generate_2fa_id(user_id)
-        doc_ref = self.db.collection(self.collections['two_factor_auth']).document(tfa_id)
-        doc_ref.set(encrypted_doc)
-        
-        print(f"   ✅ Şifreli secret Firestore'a kaydedildi")
-        print(f"   📍 Document ID: {tfa_id}")
-        
-        # 7. User'ın is_2fa_enabled flag'ini güncelle
         user_ref = self.db.collection(self.collections['users']).document(user_id)
-        user_ref.update({
-            'is_2fa_enabled': True,
-            'updated_at': datetime.utcnow()
-        })
+        if self.embedded:
+            # 6. Blok + flag aynı dokümanda: tek yazma
+            user_ref.update({
+                FirestoreSchema.TWO_FACTOR_FIELD: FirestoreSchema.embedded_two_factor(encrypted_doc),
+                'is_2fa_enabled': True,
+                'updated_at': datetime.utcnow()
+            })
+        else:
+            # 6. Firestore'a kaydet
+            tfa_id = self.id_gen.generate_2fa_id(user_id)
+            doc_ref = self.db.collection(self.collections['two_factor_auth']).document(tfa_id)
+            doc_ref.set(encrypted_doc)
+            
+            # 7. User'ın is_2fa_enabled flag'ini güncelle
+            user_ref.update({
+                'is_2fa_enabled': True,
+                'updated_at': datetime.utcnow()
+            })
         
-        print(f"\n✅ 2FA başarıyla aktifleştirildi!")
-        print("="*60)
+        log.info("2fa.enabled", user_id=user_id, layout=self.layout)
         
         return {
             'user_id': user_id,
@@ -91,56 +124,55 @@ class Secure2FAOperations:
             'manual_entry_key': totp_secret  # Manuel giriş için
         }
     
-    def verify_2fa_token(self, email: str, token: str) -> bool:
+    def verify_2fa_token(self, email: str, token: str, batch=None, user_data: Optional[Dict] = None) -> bool:
         """
         6-digit TOTP kodunu doğrula
         
         Args:
             email: Kullanıcı email
             token: 6-digit kod
+            batch: Firestore WriteBatch (opsiyonel). Verilirse last_used
+                   güncellemesi ayrı RPC yerine bu batch'e eklenir,
+                   commit çağıran tarafta (bkz. AuthService.verify_2fa_and_login)
+            user_data: Çağıranın zaten okuduğu user dokümanı (opsiyonel).
+                       Embedded yerleşimde 2FA bloğu buradan alınır, okuma yapılmaz
             
         Returns:
             True eğer kod geçerliyse
         """
-        print(f"\n🔍 2FA Token Doğrulama: {email}")
-        print("="*60)
-        
         # 1. User ID al
         user_id = self.id_gen.generate_user_id(email)
-        tfa_id = self.id_gen.generate_2fa_id(user_id)
+        doc_ref, prefix = self._two_factor_ref(user_id)
         
         # 2. 2FA secret'ını getir
-        doc_ref = self.db.collection(self.collections['two_factor_auth']).document(tfa_id)
-        doc = doc_ref.get()
+        if self.embedded and user_data is not None:
+            tfa_data = user_data.get(FirestoreSchema.TWO_FACTOR_FIELD)
+        else:
+            tfa_data = self._two_factor_data(doc_ref.get())
         
-        if not doc.exists:
-            print("   ❌ 2FA kaydı bulunamadı")
+        if not tfa_data:
+            log.info("2fa.not_configured", user_id=user_id)
             return False
         
         # 3. Secret'ı çöz
-        encrypted_data = doc.to_dict()
         decrypted_data = self.encryption.decrypt_dict(
-            encrypted_data,
+            tfa_data,
             fields_to_decrypt=['secret_key']
         )
         
         secret = decrypted_data['secret_key']
-        print(f"   ✅ Secret çözüldü: {secret[:8]}...")
         
         # 4. Token'ı doğrula (±30 saniye tolerans)
         is_valid = self.totp.verify_token(secret, token, window=1)
         
         if is_valid:
             # 5. last_used timestamp'i güncelle
-            doc_ref.update({
-                'last_used': datetime.utcnow()
-            })
-            print(f"   ✅ Token geçerli!")
-            print(f"   ⏰ Kalan süre: {self.totp.get_time_remaining()}s")
-        else:
-            print(f"   ❌ Token geçersiz!")
-        
-        print("="*60)
+            update = {f'{prefix}last_used': datetime.utcnow()}
+            if batch is not None:
+                batch.update(doc_ref, update)
+            else:
+                doc_ref.update(update)
+        log.debug("2fa.verified", user_id=user_id, valid=is_valid)
         return is_valid
     
     def disable_2fa(self, email: str) -> bool:
@@ -153,28 +185,30 @@ class Secure2FAOperations:
         Returns:
             True eğer başarılıysa
         """
-        print(f"\n🚫 2FA Devre Dışı Bırakılıyor: {email}")
-        print("="*60)
-        
         # 1. User ID al
         user_id = self.id_gen.generate_user_id(email)
-        
-        # 2. 2FA document'i sil
-        tfa_id = self.id_gen.generate_2fa_id(user_id)
-        doc_ref = self.db.collection(self.collections['two_factor_auth']).document(tfa_id)
-        doc_ref.delete()
-        
-        print(f"   ✅ 2FA kaydı silindi")
-        
-        # 3. User'ın flag'ini güncelle
         user_ref = self.db.collection(self.collections['users']).document(user_id)
-        user_ref.update({
-            'is_2fa_enabled': False,
-            'updated_at': datetime.utcnow()
-        })
         
-        print(f"   ✅ User flag'i güncellendi")
-        print("="*60)
+        if self.embedded:
+            # 2. Blok ve flag aynı dokümanda: tek yazma
+            user_ref.update({
+                FirestoreSchema.TWO_FACTOR_FIELD: None,
+                'is_2fa_enabled': False,
+                'updated_at': datetime.utcnow()
+            })
+        else:
+            # 2. 2FA document'i sil
+            tfa_id = self.id_gen.generate_2fa_id(user_id)
+            doc_ref = self.db.collection(self.collections['two_factor_auth']).document(tfa_id)
+            doc_ref.delete()
+            
+            # 3. User'ın flag'ini güncelle
+            user_ref.update({
+                'is_2fa_enabled': False,
+                'updated_at': datetime.utcnow()
+            })
+        
+        log.info("2fa.disabled", user_id=user_id)
         
         return True
     
@@ -193,19 +227,16 @@ class Secure2FAOperations:
             }
         """
         user_id = self.id_gen.generate_user_id(email)
-        tfa_id = self.id_gen.generate_2fa_id(user_id)
-        
-        doc_ref = self.db.collection(self.collections['two_factor_auth']).document(tfa_id)
-        doc = doc_ref.get()
+        doc_ref, _ = self._two_factor_ref(user_id)
+        data = self._two_factor_data(doc_ref.get())
         
-        if not doc.exists:
+        if not data:
             return {
                 'is_enabled': False,
                 'last_used': None,
                 'created_at': None
             }
         
-        data = doc.to_dict()
         return {
             'is_enabled': data.get('is_enabled', False),
             'last_used': data.get('last_used'),
@@ -215,6 +246,7 @@ class Secure2FAOperations:
 
 # Test
 if __name__ == "__main__":
+    from firebase_config import FirebaseConfig
     print("🧪 Secure 2FA Operations Test - Sprint 3\n")
     
     # Initialize
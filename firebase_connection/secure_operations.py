@@ -1,8 +1,12 @@
-from firebase_config import FirebaseConfig
+from document_store import DocumentStore, get_document_store
 from data_schema import FirestoreSchema
 from encryption import EncryptionModule
 from md5_docid import MD5DocIDGenerator
 from datetime import datetime
+from typing import Optional
+from event_logger import get_event_logger
+
+log = get_event_logger("secure_operations")
 
 class SecureFirestoreOperations:
     """
@@ -10,8 +14,13 @@ class SecureFirestoreOperations:
     HAFTA 2 İÇİN
     """
     
-    def __init__(self):
-        self.db = FirebaseConfig.get_db()
+    def __init__(self, store: Optional[DocumentStore] = None):
+        """
+        Args:
+            store: Doküman deposu (None ise get_document_store(): Firestore
+                   veya DOCUMENT_STORE=memory ile in-memory)
+        """
+        self.db = store or get_document_store()
         self.collections = FirestoreSchema.get_collections()
         self.encryption = EncryptionModule()
         self.id_gen = MD5DocIDGenerator()
@@ -48,9 +57,7 @@ class SecureFirestoreOperations:
         doc_ref = self.db.collection(self.collections['users']).document(user_id)
         doc_ref.set(encrypted_doc)
         
-        print(f"✅ Şifreli kullanıcı oluşturuldu")
-        print(f"   Email: {email}")
-        print(f"   Doc ID: {user_id}")
+        log.debug("secure_user.created", user_id=user_id)
         
         return user_id
     
@@ -72,7 +79,7 @@ class SecureFirestoreOperations:
         doc = doc_ref.get()
         
         if not doc.exists:
-            print(f"❌ Kullanıcı bulunamadı: {email}")
+            log.debug("secure_user.not_found", user_id=user_id)
             return None
         
         # 3. Şifreyi çöz
@@ -82,8 +89,6 @@ class SecureFirestoreOperations:
             fields_to_decrypt=['hashed_password']
         )
         
-        print(f"✅ Kullanıcı bulundu ve şifresi çözüldü: {email}")
-        
         return {'id': user_id, **decrypted_data}
     
     def create_secure_session(self, email: str, access_token: str, refresh_token: str) -> str:
@@ -122,9 +127,7 @@ class SecureFirestoreOperations:
         doc_ref = self.db.collection(self.collections['sessions']).document(session_id)
         doc_ref.set(encrypted_doc)
         
-        print(f"✅ Şifreli session oluşturuldu")
-        print(f"   User ID: {user_id}")
-        print(f"   Session ID: {session_id}")
+        log.debug("secure_session.created", user_id=user_id)
         
         return session_id
     
@@ -159,9 +162,7 @@ class SecureFirestoreOperations:
         doc_ref = self.db.collection(self.collections['two_factor_auth']).document(tfa_id)
         doc_ref.set(encrypted_doc)
         
-        print(f"✅ Şifreli 2FA secret kaydedildi")
-        print(f"   User ID: {user_id}")
-        print(f"   2FA Doc ID: {tfa_id}")
+        log.debug("secure_2fa.created", user_id=user_id)
         
         return tfa_id
     
@@ -184,7 +185,7 @@ class SecureFirestoreOperations:
         doc = doc_ref.get()
         
         if not doc.exists:
-            print(f"❌ 2FA bulunamadı: {email}")
+            log.debug("secure_2fa.not_found", user_id=user_id)
             return None
         
         # 3. Secret'ı çöz
@@ -194,13 +195,12 @@ class SecureFirestoreOperations:
             fields_to_decrypt=['secret_key']
         )
         
-        print(f"✅ 2FA secret bulundu ve çözüldü: {email}")
-        
         return {'id': tfa_id, **decrypted_data}
 
 
 # Test
 if __name__ == "__main__":
+    from firebase_config import FirebaseConfig
     print("🔐 Secure Firestore Operations Test\n")
     
     # Initialize
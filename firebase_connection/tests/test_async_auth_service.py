@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+
+# Kullanım (firebase_connection/ dizininden):
+#     python -m pytest tests
+bcrypt = pytest.importorskip("bcrypt")
+pyotp = pytest.importorskip("pyotp")
+
+from conftest import EMAIL, PASSWORD, SECRET
+from document_store import LatencyModel
+
+# 1. Async login senkron AuthService ile aynı sonuç ve RPC sayısı (okuma + tek commit)
+def test_async_login_matches_sync_flow(make_auth_service):
+    service = make_auth_service(asynchronous=True)
+
+    result = asyncio.run(service.login(EMAIL, PASSWORD))
+
+    assert result["success"] is True
+    assert result["access_token"] == f"access-{service.id_gen.generate_user_id(EMAIL)}"
+    assert service.db.stats() == {"get": 1, "commit": 1, "total": 2}
+    assert asyncio.run(service.login(EMAIL, "wrong-password"))["success"] is False
+
+# 2. 2FA: doğru kod tek commit, yanlış kod yazma yok
+def test_async_2fa_login(make_auth_service):
+    service = make_auth_service(asynchronous=True, is_2fa_enabled=True)
+
+    assert asyncio.run(service.login(EMAIL, PASSWORD))["requires_2fa"] is True
+    assert asyncio.run(service.verify_2fa_and_login(EMAIL, "000000"))["success"] is False
+    service.db.reset_stats()
+
+    result = asyncio.run(service.verify_2fa_and_login(EMAIL, pyotp.TOTP(SECRET).now()))
+
+    assert result["success"] is True
+    assert service.db.stats() == {"get": 1, "commit": 1, "total": 2}
+
+# 3. Tek event loop'ta eşzamanlı login'ler RPC beklemelerini paralel geçirir
+def test_concurrent_logins_overlap_rpc_latency(make_auth_service):
+    service = make_auth_service(asynchronous=True, latency=LatencyModel(read_ms=50, commit_ms=50))
+
+    async def scenario():
+        return await asyncio.gather(*(service.login(EMAIL, PASSWORD) for _ in range(10)))
+
+    started = time.perf_counter()
+    results = asyncio.run(scenario())
+
+    # Sıralı çalışsaydı 10 x 100 ms
+    assert time.perf_counter() - started < 0.5
+    assert all(result["success"] for result in results)
+
+# 4. Async kayıt: tek create RPC'si, duplicate "already registered"
+def test_async_register_is_single_create_rpc(make_auth_service):
+    service = make_auth_service(asynchronous=True)
+
+    result = asyncio.run(service.register_user("newuser", "new@example.com", PASSWORD))
+    duplicate = asyncio.run(service.register_user("other", EMAIL, PASSWORD))
+
+    assert result["success"] is True
+    assert duplicate["message"] == "Email already registered"
+    assert service.db.stats() == {"create": 2, "total": 2}
+
+# 5. Embedded 2FA yerleşimi: kodlu login tek okuma + tek commit
+def test_async_embedded_layout_login_with_code(make_auth_service, monkeypatch):
+    from data_schema import FirestoreSchema
+
+    monkeypatch.setenv("TWO_FACTOR_LAYOUT", FirestoreSchema.TWO_FACTOR_EMBEDDED)
+    service = make_auth_service(asynchronous=True, is_2fa_enabled=True)
+    store = service.db.store
+    user_id = service.id_gen.generate_user_id(EMAIL)
+    tfa = store.collection("two_factor_auth").document(user_id).get().to_dict()
+    store.collection("users").document(user_id).update({
+        FirestoreSchema.TWO_FACTOR_FIELD: FirestoreSchema.embedded_two_factor(tfa),
+    })
+    store.reset_stats()
+
+    result = asyncio.run(service.login(EMAIL, PASSWORD, totp_code=pyotp.TOTP(SECRET).now()))
+
+    assert result["success"] is True
+    assert service.db.stats() == {"get": 1, "commit": 1, "total": 2}
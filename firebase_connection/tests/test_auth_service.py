@@ -0,0 +1,78 @@
+import pytest
+
+# Kullanım (firebase_connection/ dizininden):
+#     python -m pytest tests
+bcrypt = pytest.importorskip("bcrypt")
+pyotp = pytest.importorskip("pyotp")
+
+from conftest import EMAIL, PASSWORD, SECRET
+
+
+@pytest.fixture
+def service(make_auth_service):
+    return make_auth_service()
+
+# 1. Başarılı login: kullanıcı okuma + tek batch commit (2 RPC)
+def test_login_uses_one_read_and_one_commit(service):
+    result = service.login(EMAIL, PASSWORD)
+
+    assert result["success"] is True
+    assert service.db.stats() == {"get": 1, "commit": 1, "total": 2}
+    user = service.db.collection("users").document(service.id_gen.generate_user_id(EMAIL)).get()
+    assert user.to_dict()["last_login"] is not None
+    assert len(list(service.db.collection("sessions").stream())) == 1
+
+# 2. 2FA sonrası yazmalar (last_used dahil) tek commit'te
+def test_verify_2fa_commits_once(service):
+    result = service.verify_2fa_and_login(EMAIL, pyotp.TOTP(SECRET).now())
+
+    assert result["success"] is True
+    assert service.db.stats() == {"get": 1, "commit": 1, "total": 2}
+
+# 3. Yanlış kod: hiçbir yazma gönderilmez
+def test_invalid_2fa_code_writes_nothing(service):
+    result = service.verify_2fa_and_login(EMAIL, "000000")
+
+    assert result["success"] is False
+    assert service.db.stats() == {"get": 1, "total": 1}
+
+# 4. Kayıt tek RPC (create); duplicate aynı RPC'de yakalanır
+def test_register_is_single_create_rpc(service):
+    result = service.register_user("newuser", "new@example.com", PASSWORD)
+    duplicate = service.register_user("other", EMAIL, PASSWORD)
+
+    assert result["success"] is True
+    assert duplicate == {"success": False, "message": "Email already registered"}
+    assert service.db.stats() == {"create": 2, "total": 2}
+
+# 5. Geçersiz girdi: bcrypt ve RPC yok
+def test_register_rejects_short_password_without_rpc(service, monkeypatch):
+    monkeypatch.setattr(bcrypt, "hashpw", lambda *args: pytest.fail("hashpw called"))
+
+    result = service.register_user("newuser", "new@example.com", "short")
+
+    assert result["success"] is False
+    assert service.db.stats() == {"total": 0}
+
+# 6. Embedded 2FA yerleşimi: kod login ile gelince tek okuma + tek commit
+def test_embedded_layout_login_with_code_reads_once(service):
+    from data_schema import FirestoreSchema
+
+    user_id = service.id_gen.generate_user_id(EMAIL)
+    users = service.db.collection("users")
+    tfa = service.db.collection("two_factor_auth").document(user_id).get().to_dict()
+    users.document(user_id).update({
+        "is_2fa_enabled": True,
+        FirestoreSchema.TWO_FACTOR_FIELD: FirestoreSchema.embedded_two_factor(tfa),
+    })
+    service.twofa.layout = FirestoreSchema.TWO_FACTOR_EMBEDDED
+    service.db.reset_stats()
+
+    assert service.login(EMAIL, PASSWORD, totp_code="000000")["success"] is False
+    result = service.login(EMAIL, PASSWORD, totp_code=pyotp.TOTP(SECRET).now())
+
+    assert result["success"] is True
+    assert service.db.stats() == {"get": 2, "commit": 1, "total": 3}
+    user = users.document(user_id).get().to_dict()
+    assert user[FirestoreSchema.TWO_FACTOR_FIELD]["last_used"] is not None
+    assert user["last_login"] is not None
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from document_store import (
+    AsyncInMemoryDocumentStore, DocumentAlreadyExists, DocumentNotFound, InMemoryDocumentStore, LatencyModel,
+)
+
+# 1. Doküman okuma/yazma Firestore semantiğiyle (kopya döner, update olmayan dokümanda hata)
+def test_document_roundtrip_and_update_semantics():
+    store = InMemoryDocumentStore()
+    ref = store.collection("users").document("u1")
+    assert ref.get().exists is False
+
+    ref.set({"email": "a@example.com", "tags": ["x"]})
+    data = ref.get().to_dict()
+    data["tags"].append("mutated")
+    ref.update({"status": "active"})
+
+    assert ref.get().to_dict() == {"email": "a@example.com", "tags": ["x"], "status": "active"}
+    with pytest.raises(DocumentNotFound):
+        store.collection("users").document("missing").update({"status": "x"})
+
+# 2. Batch atomik: bir yazma başarısızsa hiçbiri uygulanmaz
+def test_batch_commit_is_atomic():
+    store = InMemoryDocumentStore()
+    users = store.collection("users")
+    batch = store.batch()
+    batch.set(users.document("u1"), {"email": "a@example.com"})
+    batch.update(users.document("missing"), {"status": "x"})
+
+    with pytest.raises(DocumentNotFound):
+        batch.commit()
+    assert users.document("u1").get().exists is False
+    assert store.stats()["commit"] == 1
+
+# 3. Sorgular: where + limit
+def test_query_where_and_limit():
+    store = InMemoryDocumentStore()
+    users = store.collection("users")
+    for i in range(5):
+        users.document(f"u{i}").set({"email": f"{i}@example.com", "active": i % 2 == 0})
+
+    active = [doc.id for doc in users.where("active", "==", True).stream()]
+    assert active == ["u0", "u2", "u4"]
+    assert len(list(users.where("active", "==", True).limit(2).stream())) == 2
+
+# 4. Gecikme lock dışında beklenir: eşzamanlı RPC'ler paralel ilerler
+def test_latency_model_sleeps_outside_lock():
+    store = InMemoryDocumentStore(latency=LatencyModel(read_ms=50))
+    ref = store.collection("users").document("u1")
+
+    threads = [threading.Thread(target=ref.get) for _ in range(8)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.perf_counter() - started < 0.3
+    assert store.stats()["get"] == 8
+
+# 5. Async görünüm: veri ve sayaçlar senkron depoyla ortak, batch commit tek RPC
+def test_async_view_shares_data_with_sync_store():
+    store = InMemoryDocumentStore()
+    async_store = AsyncInMemoryDocumentStore(store)
+    store.collection("users").document("u1").set({"email": "a@example.com", "active": True})
+
+    async def scenario():
+        users = async_store.collection("users")
+        batch = async_store.batch()
+        batch.update(users.document("u1"), {"status": "active"})
+        batch.set(users.document("u2"), {"email": "b@example.com", "active": False})
+        await batch.commit()
+        snapshot = await users.document("u1").get()
+        active = [doc.id async for doc in users.where("active", "==", True).stream()]
+        return snapshot.to_dict(), active
+
+    data, active = asyncio.run(scenario())
+    assert data == {"email": "a@example.com", "active": True, "status": "active"}
+    assert active == ["u1"]
+    assert store.collection("users").document("u2").get().exists is True
+    assert async_store.stats() == {"set": 1, "commit": 1, "get": 2, "query": 1, "total": 5}
+
+# 6. Async gecikme event loop'u bloklamaz: tek thread'de eşzamanlı RPC'ler paralel bekler
+def test_async_latency_does_not_block_event_loop():
+    async_store = AsyncInMemoryDocumentStore(InMemoryDocumentStore(latency=LatencyModel(read_ms=50)))
+    ref = async_store.collection("users").document("u1")
+
+    async def scenario():
+        await asyncio.gather(*(ref.get() for _ in range(20)))
+
+    started = time.perf_counter()
+    asyncio.run(scenario())
+
+    assert time.perf_counter() - started < 0.3
+    assert async_store.stats()["get"] == 20
+
+# 7. create(): sadece doküman yoksa yazar, varsa DocumentAlreadyExists (tek RPC)
+def test_create_fails_if_document_exists():
+    store = InMemoryDocumentStore()
+    ref = store.collection("users").document("u1")
+    ref.create({"email": "a@example.com"})
+
+    with pytest.raises(DocumentAlreadyExists):
+        ref.create({"email": "b@example.com"})
+    assert ref.get().to_dict() == {"email": "a@example.com"}
+    assert store.stats()["create"] == 2
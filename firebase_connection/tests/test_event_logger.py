@@ -0,0 +1,27 @@
+import logging
+
+from event_logger import EventSampler
+
+# Kullanım (firebase_connection/ dizininden):
+#     python -m pytest tests
+
+
+def kept(sampler, event, count, level=logging.INFO):
+    record = logging.LogRecord("authguard.test", level, __file__, 0, event, None, None)
+    record.event = event
+    return sum(sampler.filter(record) for _ in range(count))
+
+# 1. Kesirli örnekleme oranı korunur (eski sayaç 0.75'te her kaydı yazıyordu)
+def test_sampler_keeps_fractional_rate():
+    sampler = EventSampler({"login.succeeded": 0.75, "login.failed": 0.1}, rate_cap_per_second=0)
+
+    assert kept(sampler, "login.succeeded", 100) == 75
+    assert kept(sampler, "login.failed", 100) == 10
+    assert sampler.sampled_out == {"login.succeeded": 25, "login.failed": 90}
+
+# 2. WARNING ve üstü örneklenmez, oran 0 olayı kapatır
+def test_sampler_skips_warnings_and_disables_zero_rate():
+    sampler = EventSampler({"2fa.failed": 0.5, "debug.noise": 0.0}, rate_cap_per_second=0)
+
+    assert kept(sampler, "2fa.failed", 10, level=logging.WARNING) == 10
+    assert kept(sampler, "debug.noise", 10) == 0
@@ -0,0 +1,60 @@
+from data_schema import FirestoreSchema
+from document_store import InMemoryDocumentStore
+from migrate_2fa_layout import migrate_two_factor_to_embedded
+
+
+def seed(store, count):
+    for i in range(count):
+        user_id = f"user{i}"
+        store.collection("users").document(user_id).set({"email": f"{i}@example.com", "is_2fa_enabled": True})
+        store.collection("two_factor_auth").document(user_id).set(
+            {"user_id": user_id, "secret_key": f"encrypted-{i}", "last_used": None, "is_enabled": False}
+        )
+    # Silinmiş user'ın 2FA dokümanı
+    store.collection("two_factor_auth").document("ghost").set({"user_id": "ghost", "secret_key": "x"})
+    store.reset_stats()
+
+# 1. Şifreli blok kopyalanır, batch başına tek commit, 2 sorgu
+def test_migration_embeds_blocks_in_batches():
+    store = InMemoryDocumentStore()
+    seed(store, 5)
+
+    stats = migrate_two_factor_to_embedded(store, batch_size=2)
+
+    assert stats == {"migrated": 5, "already_embedded": 0, "orphaned": 1, "batches": 3}
+    assert store.stats() == {"query": 2, "commit": 3, "total": 5}
+    user = store.collection("users").document("user3").get().to_dict()
+    assert user[FirestoreSchema.TWO_FACTOR_FIELD] == {"secret_key": "encrypted-3", "last_used": None, "is_enabled": False}
+    assert store.collection("two_factor_auth").document("user3").get().exists is True
+
+# 2. Tekrar çalıştırılabilir; delete_source kaynak dokümanları siler, dry_run yazmaz
+def test_migration_is_idempotent_and_supports_dry_run():
+    store = InMemoryDocumentStore()
+    seed(store, 3)
+
+    assert migrate_two_factor_to_embedded(store, dry_run=True)["migrated"] == 3
+    assert store.stats().get("commit") is None
+
+    migrate_two_factor_to_embedded(store, delete_source=True)
+    again = migrate_two_factor_to_embedded(store)
+
+    assert again == {"migrated": 0, "already_embedded": 0, "orphaned": 1, "batches": 0}
+    assert [doc.id for doc in store.collection("two_factor_auth").stream()] == ["ghost"]
+
+# 3. Geçiş sırasında 2FA yeniden kurulursa bir sonraki çalıştırma bloğu günceller
+def test_rerun_refreshes_block_after_reenrollment():
+    store = InMemoryDocumentStore()
+    seed(store, 2)
+
+    migrate_two_factor_to_embedded(store)
+    assert migrate_two_factor_to_embedded(store)["already_embedded"] == 2
+
+    # Servisler hâlâ collection yerleşiminde: yeni secret sadece two_factor_auth'a yazılır
+    store.collection("two_factor_auth").document("user1").set(
+        {"user_id": "user1", "secret_key": "encrypted-new", "last_used": None, "is_enabled": True}
+    )
+    stats = migrate_two_factor_to_embedded(store)
+
+    assert stats == {"migrated": 1, "already_embedded": 1, "orphaned": 1, "batches": 1}
+    user = store.collection("users").document("user1").get().to_dict()
+    assert user[FirestoreSchema.TWO_FACTOR_FIELD]["secret_key"] == "encrypted-new"
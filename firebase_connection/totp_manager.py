@@ -4,6 +4,9 @@ import io
 import base64
 from datetime import datetime
 from typing import Tuple, Optional, Dict
+from event_logger import get_event_logger
+
+log = get_event_logger("totp_manager")
 
 class TOTPManager:
     """
@@ -28,8 +31,6 @@ class TOTPManager:
         """
         # pyotp otomatik olarak güvenli random secret üretir
         secret = pyotp.random_base32()
-        
-        print(f"✅ TOTP secret oluşturuldu: {secret[:8]}...")
         return secret
     
     def generate_provisioning_uri(self, email: str, secret: str) -> str:
@@ -50,8 +51,6 @@ class TOTPManager:
             name=email,
             issuer_name=self.issuer_name
         )
-        
-        print(f"✅ Provisioning URI oluşturuldu")
         return uri
     
     def generate_qr_code(self, email: str, secret: str) -> str:
@@ -88,8 +87,6 @@ class TOTPManager:
         
         # Base64'e encode et
         img_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        
-        print(f"✅ QR kod oluşturuldu ({len(img_base64)} bytes)")
         return f"data:image/png;base64,{img_base64}"
     
     def verify_token(self, secret: str, token: str, window: int = 1) -> bool:
@@ -108,17 +105,11 @@ class TOTPManager:
             totp = pyotp.TOTP(secret)
             
             # Token'ı doğrula (30 saniye window ile)
-            is_valid = totp.verify(token, valid_window=window)
-            
-            if is_valid:
-                print(f"✅ TOTP token doğrulandı")
-            else:
-                print(f"❌ Geçersiz TOTP token")
-            
-            return is_valid
+            return totp.verify(token, valid_window=window)
             
         except Exception as e:
-            print(f"❌ TOTP doğrulama hatası: {e}")
+            # Sadece hata tipi: mesaj secret parçası içerebilir
+            log.warning("totp.verify_error", error=type(e).__name__)
             return False
     
     def get_current_token(self, secret: str) -> str: